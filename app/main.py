@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import json
 import logging
 import uuid
 from typing import Any
 
-from fastapi import FastAPI, Request
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from gados_common.analytics import track_event
+from gados_common.analytics import shutdown_pipeline, start_pipeline, track_event, track_events
+from gados_common.env import env_int
 from gados_common.observability import instrument_fastapi, request_id_ctx, setup_observability
 
 setup_observability(service_name="example-api")
@@ -17,6 +20,18 @@ app = FastAPI(title="Example API (Analytics + Observability)")
 instrument_fastapi(app)
 
 
+@app.on_event("startup")
+async def _startup() -> None:
+    # Buffered analytics: /track only samples + enqueues; export happens in batches off the request path.
+    start_pipeline()
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    # Flush buffered analytics events before the process exits.
+    shutdown_pipeline()
+
+
 @app.middleware("http")
 async def request_id_middleware(request: Request, call_next):
     rid = request.headers.get("x-request-id") or str(uuid.uuid4())
@@ -51,3 +66,89 @@ def track(body: TrackRequest) -> dict[str, bool]:
     track_event(body.event, user_id=body.user_id, properties=body.properties)
     return {"accepted": True}
 
+
+_track_batch_adapter = TypeAdapter(list[TrackRequest])
+
+
+async def _read_capped_body(request: Request, max_bytes: int) -> bytes:
+    """
+    Read the request body, failing with 413 as soon as it exceeds `max_bytes`: early on a declared
+    Content-Length, otherwise while streaming (chunked bodies), so oversized payloads are never buffered.
+    """
+    too_large = HTTPException(status_code=413, detail=f"Batch too large (max {max_bytes} bytes)")
+    try:
+        declared = int(request.headers.get("content-length", ""))
+    except ValueError:
+        declared = None
+    if declared is not None and declared > max_bytes:
+        raise too_large
+    raw = bytearray()
+    async for chunk in request.stream():
+        raw += chunk
+        if len(raw) > max_bytes:
+            raise too_large
+    return bytes(raw)
+
+
+def _parse_batch_body(raw: bytes, content_type: str) -> tuple[list[Any], dict[int, str]]:
+    """
+    Parse a JSON array or NDJSON (one event per line). Returns (items, parse_errors_by_index).
+    """
+    text = raw.decode("utf-8", errors="replace")
+    if "ndjson" not in content_type and text.lstrip().startswith("["):
+        try:
+            items = json.loads(text)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}") from e
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        return items, {}
+
+    items: list[Any] = []
+    errors: dict[int, str] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            errors[len(items)] = "Invalid JSON line"
+            items.append(None)
+    return items, errors
+
+
+def _track_batch(raw: bytes, content_type: str) -> dict[str, Any]:
+    """
+    Parse, validate and track one batch body (CPU-bound; runs on the threadpool).
+    """
+    items, errors = _parse_batch_body(raw, content_type)
+    max_events = env_int("GADOS_TRACK_BATCH_MAX_EVENTS", 1000)
+    if len(items) > max_events:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {max_events} events)")
+
+    # One validation pass over the whole batch; on failure, keep the valid items and report the rest.
+    candidates = [(i, it) for i, it in enumerate(items) if i not in errors]
+    try:
+        valid = _track_batch_adapter.validate_python([it for _i, it in candidates])
+    except ValidationError as e:
+        bad: set[int] = set()
+        for err in e.errors():
+            loc = err.get("loc") or ()
+            if loc and isinstance(loc[0], int):
+                bad.add(loc[0])
+                errors.setdefault(candidates[loc[0]][0], str(err.get("msg", "invalid")))
+        valid = [TrackRequest.model_validate(it) for j, (_i, it) in enumerate(candidates) if j not in bad]
+
+    track_events({"event": b.event, "user_id": b.user_id, "properties": b.properties} for b in valid)
+    return {
+        "accepted": len(valid),
+        "rejected": len(errors),
+        "errors": [{"index": i, "error": msg} for i, msg in sorted(errors.items())[:20]],
+    }
+
+
+@app.post("/track/batch")
+async def track_batch(request: Request) -> dict[str, Any]:
+    raw = await _read_capped_body(request, env_int("GADOS_TRACK_BATCH_MAX_BYTES", 1048576))
+    # Parsing and validating up to GADOS_TRACK_BATCH_MAX_EVENTS items must not stall the event loop.
+    return await run_in_threadpool(_track_batch, raw, request.headers.get("content-type", ""))
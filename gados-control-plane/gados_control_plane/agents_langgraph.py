@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, TypedDict
 
 from langgraph.graph import END, StateGraph
+from opentelemetry import trace
+
+from gados_common.metrics import registry
 
 from .artifacts import write_text
+from .metrics_history import record_metrics
 from .paths import get_paths
-from .reporting import compute_metrics, render_daily_report_md
-from .validator import validate
+from .reporting import ProjectSnapshot, load_snapshot, render_daily_report_md
+
+_node_seconds = registry.histogram(
+    "gados_digest_node_duration_seconds",
+    "Wall-clock duration of each daily digest graph node",
+)
 
 
 def _utc_now_iso() -> str:
@@ -18,6 +28,7 @@ def _utc_now_iso() -> str:
 
 class ReportState(TypedDict, total=False):
     now_utc_iso: str
+    snapshot: ProjectSnapshot  # loaded once per run, shared by the collect/QA nodes
     metrics: dict[str, Any]
     validations: list[dict[str, Any]]
     report_md: str
@@ -30,9 +41,16 @@ def _strategic_brain_plan(state: ReportState) -> ReportState:
     return state
 
 
+def _snapshot(state: ReportState) -> ProjectSnapshot:
+    snapshot = state.get("snapshot")
+    if snapshot is None:
+        snapshot = load_snapshot(get_paths())
+        state["snapshot"] = snapshot
+    return snapshot
+
+
 def _coordination_agent_collect(state: ReportState) -> ReportState:
-    paths = get_paths()
-    m = compute_metrics(paths)
+    m = _snapshot(state).metrics
     state["metrics"] = {
         "epic_count": m.epic_count,
         "story_count": m.story_count,
@@ -41,14 +59,15 @@ def _coordination_agent_collect(state: ReportState) -> ReportState:
         "avg_time_to_verified_hours": m.avg_time_to_verified_hours,
         "validation_errors": m.validation_errors,
         "validation_warnings": m.validation_warnings,
+        "p50_time_to_verified_hours": m.p50_time_to_verified_hours,
+        "p90_time_to_verified_hours": m.p90_time_to_verified_hours,
     }
     return state
 
 
 def _qa_agent_evidence(state: ReportState) -> ReportState:
     # QA agent in this context = evidence of governance compliance (validator output).
-    paths = get_paths()
-    msgs = validate(paths)
+    msgs = _snapshot(state).validations
     state["validations"] = [
         {"level": m.level, "code": m.code, "message": m.message, "artifact": m.artifact} for m in msgs
     ]
@@ -87,6 +106,8 @@ def _coordination_agent_write(state: ReportState) -> ReportState:
     rel = f"log/reports/REPORT-{stamp}.md"
     write_text(paths, rel, state.get("report_md", ""))
     state["report_rel_path"] = rel
+    # Structured row for /reports/trends (no need to re-parse historical markdown).
+    record_metrics(paths, state.get("metrics") or {}, at=now, report_rel=rel)
     return state
 
 
@@ -121,14 +142,26 @@ class _ValidationShim:
     artifact: str | None = None
 
 
+def _traced_node(name: str, fn: Callable[[ReportState], ReportState]) -> Callable[[ReportState], ReportState]:
+    tracer = trace.get_tracer("gados-control-plane")
+
+    @functools.wraps(fn)
+    def wrapper(state: ReportState) -> ReportState:
+        with tracer.start_as_current_span(f"digest.{name}") as span, _node_seconds.time({"node": name}):
+            span.set_attribute("langgraph.node", name)
+            return fn(state)
+
+    return wrapper
+
+
 def build_daily_digest_graph():
     g = StateGraph(ReportState)
-    g.add_node("StrategicBrain", _strategic_brain_plan)
-    g.add_node("CoordinationAgentCollect", _coordination_agent_collect)
-    g.add_node("QAAgent", _qa_agent_evidence)
-    g.add_node("PeerReviewer", _peer_reviewer_assess)
-    g.add_node("DeliveryGovernor", _delivery_governor_render)
-    g.add_node("CoordinationAgentWrite", _coordination_agent_write)
+    g.add_node("StrategicBrain", _traced_node("StrategicBrain", _strategic_brain_plan))
+    g.add_node("CoordinationAgentCollect", _traced_node("CoordinationAgentCollect", _coordination_agent_collect))
+    g.add_node("QAAgent", _traced_node("QAAgent", _qa_agent_evidence))
+    g.add_node("PeerReviewer", _traced_node("PeerReviewer", _peer_reviewer_assess))
+    g.add_node("DeliveryGovernor", _traced_node("DeliveryGovernor", _delivery_governor_render))
+    g.add_node("CoordinationAgentWrite", _traced_node("CoordinationAgentWrite", _coordination_agent_write))
 
     g.set_entry_point("StrategicBrain")
     g.add_edge("StrategicBrain", "CoordinationAgentCollect")
@@ -140,12 +173,19 @@ def build_daily_digest_graph():
     return g.compile()
 
 
+@functools.lru_cache(maxsize=1)
+def _daily_digest_graph():
+    # Compiling the graph is pure setup; the compiled graph is stateless across invocations.
+    return build_daily_digest_graph()
+
+
 def run_daily_digest() -> dict[str, Any]:
     """
     Run the LangGraph daily digest and return the resulting state.
     """
-    graph = build_daily_digest_graph()
-    state: ReportState = {"now_utc_iso": _utc_now_iso()}
-    out = graph.invoke(state)
-    return dict(out)
-
+    tracer = trace.get_tracer("gados-control-plane")
+    with tracer.start_as_current_span("agents.daily_digest"):
+        state: ReportState = {"now_utc_iso": _utc_now_iso()}
+        out = dict(_daily_digest_graph().invoke(state))
+    out.pop("snapshot", None)
+    return out
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from gados_common.env import env_float, env_workers
+
+from .artifacts import ArtifactInfo, list_artifacts, parse_story_status
+from .paths import ProjectPaths, persist_indexes, runtime_dir, safe_resolve_under
+
+_log = logging.getLogger(__name__)
+
+EPIC_LINE_RE = re.compile(r"^\*\*Epic\*\*:\s*`?(EPIC-[A-Za-z0-9]+)", re.IGNORECASE)
+EPIC_NAME_RE = re.compile(r"^(EPIC-[A-Za-z0-9]+)")
+STORY_REF_RE = re.compile(r"^(STORY-[A-Za-z0-9]+)")
+
+# Bump when `_extract` output changes so persisted records are re-derived.
+_INDEX_VERSION = 4
+
+# libyaml-backed loader when PyYAML was built with it (same safe semantics, ~10x faster).
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Below this many changed files a scan parses inline; a process pool only pays off for bulk (re)loads.
+_PARALLEL_MIN_FILES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+  rel_path TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  sha256 TEXT NOT NULL,
+  status TEXT,
+  story_id TEXT,
+  epic_id TEXT,
+  facts_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind ON artifacts(kind);
+CREATE INDEX IF NOT EXISTS idx_artifacts_story ON artifacts(story_id);
+"""
+
+
+@dataclass(frozen=True)
+class ArtifactRecord:
+    rel_path: str
+    kind: str  # story | change | epic | decision | report | story_log | verification
+    mtime_ns: int
+    size: int
+    sha256: str
+    status: str | None = None
+    story_id: str | None = None  # the story itself, or the story an artifact refers to
+    epic_id: str | None = None
+    facts: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return self.rel_path.rsplit("/", 1)[-1]
+
+    @property
+    def stem(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+@dataclass(frozen=True)
+class _Scope:
+    rel_dir: str
+    kind: str
+    accept: Callable[[str], bool]
+
+
+# Flat directories tracked by the index (kind is decided by the directory + filename).
+_SCOPES: tuple[_Scope, ...] = (
+    _Scope("plan/stories", "story", lambda n: n.startswith("STORY-") and n.endswith(".md")),
+    _Scope("plan/changes", "change", lambda n: n.endswith((".yaml", ".yml"))),
+    _Scope("strategy", "epic", lambda n: n.startswith("EPIC-") and n.endswith(".md")),
+    _Scope("decision", "decision", lambda n: n != "README.md"),
+    _Scope("log/reports", "report", lambda n: n.startswith("REPORT-") and n.endswith(".md")),
+    _Scope("log", "story_log", lambda n: n.startswith("STORY-") and n.endswith(".log.yaml")),
+    _Scope("verification", "verification", lambda n: n.startswith("STORY-") and n.endswith(".md")),
+)
+
+
+def _extract(kind: str, name: str, raw: bytes) -> tuple[str | None, str | None, str | None, dict[str, Any]]:
+    """
+    Per-kind metadata: (status, story_id, epic_id, facts).
+    """
+    if kind == "story":
+        text = raw.decode("utf-8", errors="replace")
+        epic_id = None
+        for line in text.splitlines():
+            m = EPIC_LINE_RE.match(line.strip())
+            if m:
+                epic_id = m.group(1)
+                break
+        return parse_story_status(text), name.removesuffix(".md"), epic_id, {}
+    if kind == "change":
+        try:
+            doc = _load_yaml(raw)
+        except Exception:
+            return None, None, None, {"parse_error": True}
+        if not isinstance(doc, dict):
+            return None, None, None, {"parse_error": True}
+        story_id = str(doc.get("story_id", "")).strip() or None
+        approvals = doc.get("approvals") or {}
+        vda = approvals.get("vda") if isinstance(approvals, dict) else {}
+        approved = isinstance(vda, dict) and bool(vda.get("approved")) is True
+        return None, story_id, None, {"vda_approved": approved}
+    if kind == "epic":
+        m = EPIC_NAME_RE.match(name)
+        return None, None, m.group(1) if m else None, {}
+    if kind == "story_log":
+        return None, name.removesuffix(".log.yaml"), None, _story_log_facts(raw)
+    if kind == "verification":
+        m = STORY_REF_RE.match(name)
+        return None, m.group(1) if m else None, None, {}
+    return None, None, None, {}
+
+
+def _load_yaml(raw: bytes) -> Any:
+    return yaml.load(raw.decode("utf-8"), Loader=_YamlLoader)
+
+
+def _story_log_facts(raw: bytes) -> dict[str, Any]:
+    """
+    Verification facts from a story log: the first VERIFICATION_DECISION(decision: VERIFIED) and
+    whether it was made by the DeliveryGovernor. (Event timestamps live in `story_events`.)
+    """
+    try:
+        data = _load_yaml(raw)
+    except Exception:
+        return {"parse_error": True, "verified": False, "verified_by_governor": False}
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list):
+        return {"verified": False, "verified_by_governor": False}
+    for ev in events:
+        if isinstance(ev, dict) and ev.get("type") == "VERIFICATION_DECISION" and ev.get("decision") == "VERIFIED":
+            return {"verified": True, "verified_by_governor": ev.get("actor_role") == "DeliveryGovernor"}
+    return {"verified": False, "verified_by_governor": False}
+
+
+def _extract_item(item: tuple[str, str, bytes]) -> tuple[str | None, str | None, str | None, dict[str, Any]]:
+    return _extract(*item)
+
+
+def _mp_context():
+    import multiprocessing
+
+    # The control plane is multi-threaded (server, log listener); avoid plain fork.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _extract_many(items: list[tuple[str, str, bytes]]) -> list[tuple[str | None, str | None, str | None, dict[str, Any]]]:
+    """
+    `_extract` over (kind, name, raw) items, results in input order. Large batches are spread over a
+    process pool of GADOS_PARSE_WORKERS (YAML parsing is CPU-bound and holds the GIL).
+    """
+    workers = min(env_workers("GADOS_PARSE_WORKERS"), max(1, len(items) // 64))
+    if workers > 1 and len(items) >= _PARALLEL_MIN_FILES:
+        from concurrent.futures import ProcessPoolExecutor
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+                return list(pool.map(_extract_item, items, chunksize=max(16, len(items) // (workers * 4))))
+        except Exception:
+            _log.warning("artifact_index_parallel_parse_failed", exc_info=True)
+    return [_extract(*item) for item in items]
+
+
+def _ttl_s() -> float:
+    return max(0.0, env_float("GADOS_ARTIFACT_INDEX_TTL_MS", 1000.0) / 1000.0)
+
+
+class ArtifactIndex:
+    """
+    Metadata index over `gados-project/` artifacts (stories, change plans, epics, decisions,
+    reports, story logs, verification docs).
+
+    Refresh is incremental: files are re-read and re-parsed only when (mtime_ns, size) changed.
+    A full stat pass runs at most every GADOS_ARTIFACT_INDEX_TTL_MS, or sooner when a tracked
+    directory's mtime changes (file added/removed) or `invalidate()` is called (control-plane
+    writes). Records persist to SQLite under the runtime dir so a restart only re-reads what
+    changed on disk.
+
+    Refreshes are serialized by `_scan_lock`; files are read and parsed without holding `_lock`,
+    so queries that need no refresh are not blocked by a large re-parse.
+    """
+
+    def __init__(self, paths: ProjectPaths, *, db_path: Path | None = None, persist: bool = True) -> None:
+        self.paths = paths
+        self._lock = threading.RLock()
+        self._scan_lock = threading.Lock()
+        self._records: dict[str, ArtifactRecord] = {}
+        self._dir_mtimes: dict[str, int] = {}
+        self._listing_cache: dict[str, tuple[int, list[ArtifactInfo]]] = {}
+        self._last_refresh = 0.0
+        self._dirty = True
+        self._db: sqlite3.Connection | None = None
+        if persist:
+            root_key = hashlib.sha1(str(paths.gados_root.resolve()).encode("utf-8")).hexdigest()[:12]
+            self._open_db(db_path or runtime_dir(paths) / f"artifact-index-{root_key}.sqlite3")
+
+    # --- persistence ---
+
+    def _open_db(self, db_path: Path) -> None:
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(str(db_path), check_same_thread=False)
+            if con.execute("PRAGMA user_version").fetchone()[0] != _INDEX_VERSION:
+                con.executescript(f"DROP TABLE IF EXISTS artifacts; PRAGMA user_version = {_INDEX_VERSION};")
+            con.executescript(_SCHEMA)
+            for row in con.execute(
+                "SELECT rel_path, kind, mtime_ns, size, sha256, status, story_id, epic_id, facts_json FROM artifacts"
+            ):
+                rec = ArtifactRecord(*row[:8], facts=json.loads(row[8] or "{}"))
+                self._records[rec.rel_path] = rec
+            self._db = con
+        except Exception:
+            _log.warning("artifact_index_persistence_disabled", extra={"db_path": str(db_path)}, exc_info=True)
+            self._db = None
+
+    def _persist(self, upserts: list[ArtifactRecord], deletes: list[str]) -> None:
+        if self._db is None or not (upserts or deletes):
+            return
+        try:
+            with self._db:
+                if deletes:
+                    self._db.executemany("DELETE FROM artifacts WHERE rel_path = ?", [(d,) for d in deletes])
+                if upserts:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                r.rel_path,
+                                r.kind,
+                                r.mtime_ns,
+                                r.size,
+                                r.sha256,
+                                r.status,
+                                r.story_id,
+                                r.epic_id,
+                                json.dumps(dict(r.facts)),
+                            )
+                            for r in upserts
+                        ],
+                    )
+        except Exception:
+            _log.warning("artifact_index_persist_failed", exc_info=True)
+
+    # --- refresh ---
+
+    def invalidate(self) -> None:
+        """
+        Force the next query to re-stat tracked directories (call after writing artifacts).
+        """
+        with self._lock:
+            self._dirty = True
+
+    def _dirs_changed(self) -> bool:
+        for scope in _SCOPES:
+            try:
+                mtime = (self.paths.gados_root / scope.rel_dir).stat().st_mtime_ns
+            except OSError:
+                mtime = -1
+            if self._dir_mtimes.get(scope.rel_dir) != mtime:
+                return True
+        return False
+
+    def _stale(self) -> bool:
+        with self._lock:
+            return self._dirty or time.monotonic() - self._last_refresh >= _ttl_s() or self._dirs_changed()
+
+    def refresh(self, *, force: bool = False) -> None:
+        if not (force or self._stale()):
+            return
+        with self._scan_lock:
+            # Another thread may have refreshed while this one waited.
+            if force or self._stale():
+                self._scan()
+
+    def _scan(self) -> None:
+        root = self.paths.gados_root
+        with self._lock:
+            # Cleared before the stat pass: an invalidate() during the scan triggers another one.
+            self._dirty = False
+            known = {rel: (r.mtime_ns, r.size) for rel, r in self._records.items()}
+        seen: set[str] = set()
+        dir_mtimes: dict[str, int] = {}
+        upserts: list[ArtifactRecord] = []
+        pending: list[tuple[str, str, str, os.stat_result, bytes]] = []
+        for scope in _SCOPES:
+            base = root / scope.rel_dir
+            try:
+                dir_mtimes[scope.rel_dir] = base.stat().st_mtime_ns
+                entries = list(os.scandir(base))
+            except OSError:
+                dir_mtimes[scope.rel_dir] = -1
+                continue
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or not scope.accept(name):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                rel = f"{scope.rel_dir}/{name}"
+                seen.add(rel)
+                if known.get(rel) == (st.st_mtime_ns, st.st_size):
+                    continue
+                try:
+                    with open(entry.path, "rb") as fh:
+                        raw = fh.read()
+                except OSError:
+                    continue
+                pending.append((scope.kind, name, rel, st, raw))
+        parsed = _extract_many([(kind, name, raw) for kind, name, _, _, raw in pending])
+        for (kind, _, rel, st, raw), (status, story_id, epic_id, facts) in zip(pending, parsed, strict=True):
+            upserts.append(
+                ArtifactRecord(
+                    rel_path=rel,
+                    kind=kind,
+                    mtime_ns=st.st_mtime_ns,
+                    size=st.st_size,
+                    sha256=hashlib.sha256(raw).hexdigest(),
+                    status=status,
+                    story_id=story_id,
+                    epic_id=epic_id,
+                    facts=facts,
+                )
+            )
+        with self._lock:
+            for rec in upserts:
+                self._records[rec.rel_path] = rec
+            deletes = [rel for rel in self._records if rel not in seen]
+            for rel in deletes:
+                del self._records[rel]
+            self._dir_mtimes.update(dir_mtimes)
+            self._last_refresh = time.monotonic()
+        # Only the scanning thread (under _scan_lock) touches the database.
+        self._persist(upserts, deletes)
+
+    # --- queries ---
+
+    def records(self, kind: str) -> list[ArtifactRecord]:
+        """
+        All records of `kind`, sorted by filename.
+        """
+        self.refresh()
+        with self._lock:
+            return sorted((r for r in self._records.values() if r.kind == kind), key=lambda r: r.name)
+
+    def get(self, rel_path: str) -> ArtifactRecord | None:
+        self.refresh()
+        with self._lock:
+            return self._records.get(rel_path)
+
+    def stories(self) -> list[ArtifactRecord]:
+        return self.records("story")
+
+    def epics(self) -> list[ArtifactRecord]:
+        return self.records("epic")
+
+    def list_dir(self, rel_dir: str = "") -> list[ArtifactInfo]:
+        """
+        `artifacts.list_artifacts`, cached per directory until its mtime changes.
+        """
+        base = self.paths.gados_root
+        target = base if rel_dir == "" else safe_resolve_under(base, rel_dir)
+        try:
+            mtime = target.stat().st_mtime_ns
+        except OSError:
+            return []
+        if target.is_file():
+            return list_artifacts(self.paths, rel_dir)
+        with self._lock:
+            hit = self._listing_cache.get(rel_dir)
+            if hit is not None and hit[0] == mtime:
+                return list(hit[1])
+        items = list_artifacts(self.paths, rel_dir)
+        with self._lock:
+            self._listing_cache[rel_dir] = (mtime, items)
+        return list(items)
+
+
+_indexes: dict[Path, ArtifactIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(paths: ProjectPaths) -> ArtifactIndex:
+    """
+    Process-wide index per `gados_root` (GADOS_ARTIFACT_INDEX_PERSIST=0 keeps it in memory only).
+    """
+    key = paths.gados_root.resolve()
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            persist = persist_indexes()
+            idx = ArtifactIndex(paths, persist=persist)
+            _indexes[key] = idx
+        return idx
+
+
+def invalidate(paths: ProjectPaths) -> None:
+    key = paths.gados_root.resolve()
+    with _indexes_lock:
+        idx = _indexes.get(key)
+    if idx is not None:
+        idx.invalidate()
@@ -48,11 +48,20 @@ def write_text(paths: ProjectPaths, rel_path: str, content: str) -> None:
     p = safe_resolve_under(paths.gados_root, rel_path)
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(content, encoding="utf-8")
+    _invalidate_index(paths)
 
 
 def append_text(paths: ProjectPaths, rel_path: str, content: str) -> None:
     p = safe_resolve_under(paths.gados_root, rel_path)
     append_text_locked(p, content)
+    _invalidate_index(paths)
+
+
+def _invalidate_index(paths: ProjectPaths) -> None:
+    # Imported lazily: artifact_index builds on this module.
+    from .artifact_index import invalidate
+
+    invalidate(paths)
 
 
 def load_yaml(paths: ProjectPaths, rel_path: str) -> dict:
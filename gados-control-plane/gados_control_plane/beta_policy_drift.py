@@ -10,6 +10,7 @@ import yaml
 from opentelemetry import trace
 
 from app.notifications import Notification, dispatch_notification
+from gados_common.observability import mark_breached_correlation
 
 from .bus import send_message
 from .beta_run_store import BetaRunMeta, write_beta_run
@@ -155,6 +156,7 @@ def run_policy_drift_watchdog(
         span.set_attribute("gados.baseline", baseline_rel_path)
 
         if drifts:
+            mark_breached_correlation(corr)
             reports_dir = paths.gados_root / "log" / "reports"
             reports_dir.mkdir(parents=True, exist_ok=True)
             stamp = _utc_now_iso().split("+", 1)[0].replace(":", "").replace("-", "").replace("T", "-")
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import hashlib
 import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from gados_common.hashing import RUN_METADATA_FILES, hash_tree, merkle_root, write_sha256sums
+from gados_common.sequence import next_in_sequence
+
 from .paths import ProjectPaths
+from .run_registry import get_run_registry
 
 
 def _utc_now_iso() -> str:
@@ -22,39 +25,26 @@ def _stamp_compact() -> str:
 def _allocate_beta_run_dir(paths: ProjectPaths, *, scenario: str) -> tuple[str, Path]:
     """
     Create: gados-project/log/reports/beta-runs/BETA-<scenario>-<stamp>-NNN/
+
+    NNN comes from a per-scenario counter file (one count per stamp), so allocation does not
+    enumerate the runs directory. The folder is created while the counter is locked, so concurrent
+    writers never get the same id.
     """
     root = paths.gados_root / "log" / "reports" / "beta-runs"
     root.mkdir(parents=True, exist_ok=True)
 
     base = f"BETA-{scenario}-{_stamp_compact()}"
-    n = 1
-    for p in root.iterdir():
-        if not p.is_dir():
-            continue
-        name = p.name
-        if not name.startswith(base + "-"):
-            continue
-        tail = name.split("-")[-1]
-        if tail.isdigit():
-            n = max(n, int(tail) + 1)
-
-    run_id = f"{base}-{n:03d}"
-    run_dir = root / run_id
-    run_dir.mkdir(parents=True, exist_ok=False)
-    return run_id, run_dir
 
+    def claim(i: int) -> bool:
+        try:
+            (root / f"{base}-{i:03d}").mkdir()
+        except FileExistsError:
+            return False
+        return True
 
-def _write_sha256sums(dir_path: Path) -> None:
-    sums: list[str] = []
-    for p in sorted(dir_path.rglob("*")):
-        if p.is_dir():
-            continue
-        if p.name == "SHA256SUMS.txt":
-            continue
-        h = hashlib.sha256(p.read_bytes()).hexdigest()
-        rel = p.relative_to(dir_path)
-        sums.append(f"{h}  {rel}")
-    (dir_path / "SHA256SUMS.txt").write_text("\n".join(sums) + "\n", encoding="utf-8")
+    n = next_in_sequence(root / f".BETA-{scenario}.seq", scope=base, claim=claim)
+    run_id = f"{base}-{n:03d}"
+    return run_id, root / run_id
 
 
 def _check_status(exit_code: int) -> str:
@@ -126,10 +116,12 @@ def write_beta_run(paths: ProjectPaths, *, meta: BetaRunMeta) -> dict[str, str]:
         "evidence_paths": meta.evidence_paths,
         "checks": meta.checks,
         "correlation_id": meta.correlation_id,
+        "evidence_merkle_root": merkle_root(hash_tree(run_dir, exclude=RUN_METADATA_FILES)),
     }
     (run_dir / "run.json").write_text(json.dumps(run_json, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     (run_dir / ".finalized").write_text("finalized\n", encoding="utf-8")
-    _write_sha256sums(run_dir)
+    write_sha256sums(run_dir)
+    get_run_registry(paths).register(run_dir, run_json)
 
     # Decision artifact (PM-facing, versioned)
     decision_rel = f"decision/{run_id}.md"
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from opentelemetry import trace
 
 from app.notifications import Notification, dispatch_notification
+from gados_common.observability import mark_breached_correlation
 
 from .bus import get_last_heartbeat, record_heartbeat, send_message
 from .beta_run_store import BetaRunMeta, write_beta_run
@@ -106,6 +107,7 @@ def run_sla_breach_sentinel(
         span.set_attribute("breached", bool(breached))
 
         if breached:
+            mark_breached_correlation(corr)
             reports_dir = paths.gados_root / "log" / "reports"
             reports_dir.mkdir(parents=True, exist_ok=True)
             stamp = _utc_now_iso().split("+", 1)[0].replace(":", "").replace("-", "").replace("T", "-")
@@ -10,6 +10,8 @@ from opentelemetry import trace
 
 from app.economics import LedgerEntry, append_ledger_entry, build_budget_trigger_event
 from app.notifications import Notification, dispatch_notification
+from gados_common.observability import mark_breached_correlation
+from gados_common.sequence import next_in_sequence
 
 from .bus import send_message
 from .beta_run_store import BetaRunMeta, write_beta_run
@@ -46,16 +48,19 @@ def _severity_from_threshold(threshold: str) -> str:
 _ESC_RE = re.compile(r"^ESCALATION-(\d{3})\.md$")
 
 
+def _last_escalation_number(decision_dir: Path) -> int:
+    # One-time bootstrap when the counter file does not exist yet.
+    nums = [int(m.group(1)) for p in decision_dir.iterdir() if (m := _ESC_RE.match(p.name)) and p.is_file()]
+    return max(nums, default=0)
+
+
 def _next_escalation_id(decision_dir: Path) -> str:
     decision_dir.mkdir(parents=True, exist_ok=True)
-    nums: list[int] = []
-    for p in decision_dir.iterdir():
-        if not p.is_file():
-            continue
-        m = _ESC_RE.match(p.name)
-        if m:
-            nums.append(int(m.group(1)))
-    n = (max(nums) + 1) if nums else 1
+    n = next_in_sequence(
+        decision_dir / ".ESCALATION.seq",
+        seed=lambda: _last_escalation_number(decision_dir),
+        taken=lambda i: (decision_dir / f"ESCALATION-{i:03d}.md").exists(),
+    )
     return f"ESCALATION-{n:03d}"
 
 
@@ -141,6 +146,7 @@ def run_daily_spend_guardrail(
                     threshold = str(trig.get("facts", {}).get("threshold", "CRITICAL"))
                     severity = _severity_from_threshold(threshold)
                     span.set_attribute("gados.threshold", threshold)
+                    mark_breached_correlation(corr)
 
                     # Create escalation decision artifact (audit-ready)
                     esc_id = _next_escalation_id(paths.gados_root / "decision")
@@ -9,24 +9,26 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Literal
 
-from .paths import get_paths
+from .paths import get_paths, runtime_dir
 from gados_common.fileio import append_text_locked
+from gados_common.metrics import registry, timed
 
 
 Severity = Literal["INFO", "WARN", "ERROR", "CRITICAL"]
 AckStatus = Literal["ACKED", "NACKED"]
 
+_bus_op_seconds = registry.histogram(
+    "gados_bus_operation_duration_seconds",
+    "Latency of message bus operations",
+)
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
 def _runtime_db_path() -> Path:
-    paths = get_paths()
-    runtime_dir = os.getenv("GADOS_RUNTIME_DIR", "").strip()
-    if runtime_dir:
-        return Path(runtime_dir) / "bus.sqlite3"
-    return paths.repo_root / ".gados-runtime" / "bus.sqlite3"
+    return runtime_dir(get_paths()) / "bus.sqlite3"
 
 
 def _audit_log_path() -> Path:
@@ -121,6 +123,7 @@ class Message:
     last_error: str | None
 
 
+@timed(_bus_op_seconds, operation="send_message")
 def send_message(
     *,
     from_role: str,
@@ -213,6 +216,7 @@ def send_message(
     return msg_id
 
 
+@timed(_bus_op_seconds, operation="list_inbox")
 def list_inbox(*, to_role: str, to_agent_id: str, limit: int = 50) -> list[Message]:
     _init_db()
     with _connect() as con:
@@ -254,6 +258,7 @@ def list_inbox(*, to_role: str, to_agent_id: str, limit: int = 50) -> list[Messa
     return out
 
 
+@timed(_bus_op_seconds, operation="ack_message")
 def ack_message(*, message_id: str, status: AckStatus, actor_role: str, actor_id: str, notes: str = "") -> None:
     _init_db()
     now = _utc_now_iso()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from gados_common.hashing import (
+    RUN_METADATA_FILES,
+    SUMS_FILENAME,
+    DigestCache,
+    hash_files,
+    list_files,
+    merkle_root,
+    parse_sums,
+)
+
+from .paths import ProjectPaths, persist_indexes, runtime_dir
+from .run_registry import RunRow, get_run_registry
+
+_log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+  path TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  sha256 TEXT NOT NULL
+);
+"""
+
+
+class PersistentDigestCache(DigestCache):
+    """
+    DigestCache backed by SQLite, so a nightly verification only re-reads files whose
+    (mtime_ns, size) changed since the previous run. New digests are written by `flush()`.
+    """
+
+    def __init__(self, db_path: Path | str) -> None:
+        super().__init__()
+        self._pending: dict[str, tuple[int, int, str]] = {}
+        try:
+            if str(db_path) != ":memory:":
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+            self._entries = {p: (m, s, d) for p, m, s, d in self._db.execute("SELECT * FROM digests")}
+        except Exception:
+            _log.warning("digest_cache_persistence_disabled", extra={"db_path": str(db_path)}, exc_info=True)
+            self._db = None
+
+    def put(self, path: str, mtime_ns: int, size: int, digest: str) -> None:
+        super().put(path, mtime_ns, size, digest)
+        with self._lock:
+            self._pending[path] = (mtime_ns, size, digest)
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if self._db is None or not pending:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)", [(p, *v) for p, v in pending.items()]
+            )
+
+
+_caches: dict[Path, PersistentDigestCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_digest_cache(paths: ProjectPaths) -> PersistentDigestCache:
+    """
+    Process-wide digest cache per `gados_root` (persistence follows GADOS_ARTIFACT_INDEX_PERSIST).
+    """
+    key = paths.gados_root.resolve()
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            persist = persist_indexes()
+            root_key = hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:12]
+            db_path = runtime_dir(paths) / f"evidence-digests-{root_key}.sqlite3" if persist else ":memory:"
+            cache = PersistentDigestCache(db_path)
+            _caches[key] = cache
+        return cache
+
+
+@dataclass(frozen=True)
+class RunVerification:
+    run_id: str
+    rel_dir: str
+    status: str  # OK | TAMPERED | NO_MANIFEST
+    files_checked: int = 0
+    tampered: list[str] = field(default_factory=list)  # digest differs from SHA256SUMS.txt
+    missing: list[str] = field(default_factory=list)  # listed in SHA256SUMS.txt, not on disk
+    unexpected: list[str] = field(default_factory=list)  # on disk, not listed
+    merkle_ok: bool | None = None  # None: run.json records no evidence_merkle_root (older runs)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "OK"
+
+
+@dataclass
+class _Plan:
+    run: RunRow
+    run_dir: Path
+    expected: dict[str, str] | None
+    on_disk: set[str]
+    present: list[str]
+    recorded_root: str | None
+
+
+def _plan(paths: ProjectPaths, run: RunRow) -> _Plan:
+    run_dir = paths.gados_root / run.rel_dir
+    try:
+        expected = parse_sums((run_dir / SUMS_FILENAME).read_text(encoding="utf-8"))
+    except OSError:
+        return _Plan(run, run_dir, None, set(), [], None)
+    on_disk = set(list_files(run_dir))
+    try:
+        recorded_root = json.loads((run_dir / "run.json").read_text(encoding="utf-8")).get("evidence_merkle_root")
+    except (OSError, ValueError, AttributeError):
+        recorded_root = None
+    return _Plan(run, run_dir, expected, on_disk, sorted(on_disk & expected.keys()), recorded_root)
+
+
+def verify_runs(
+    paths: ProjectPaths, runs: Iterable[RunRow], *, full: bool = False, workers: int | None = None
+) -> list[RunVerification]:
+    """
+    Check run folders against their SHA256SUMS.txt (and the Merkle root in run.json when recorded).
+
+    Files of all runs are hashed together on one thread pool. Unless `full`, digests come from the
+    persistent digest cache for files whose (mtime_ns, size) is unchanged since they were last hashed;
+    `full=True` re-reads every file (catches edits that preserve size and mtime).
+    """
+    plans = [_plan(paths, run) for run in runs]
+    cache = DigestCache() if full else get_digest_cache(paths)
+    files = [plan.run_dir / rel for plan in plans for rel in plan.present]
+    digests = iter(hash_files(files, cache=cache, workers=workers))
+    if isinstance(cache, PersistentDigestCache):
+        cache.flush()
+
+    results: list[RunVerification] = []
+    for plan in plans:
+        if plan.expected is None:
+            results.append(RunVerification(plan.run.run_id, plan.run.rel_dir, "NO_MANIFEST"))
+            continue
+        actual = {rel: next(digests) for rel in plan.present}
+        missing = sorted(plan.expected.keys() - actual.keys())
+        tampered = [rel for rel, digest in actual.items() if digest != plan.expected[rel]]
+        # Metadata written after the manifest (review packs) is not expected to be listed.
+        unexpected = sorted(rel for rel in plan.on_disk - plan.expected.keys() if rel not in RUN_METADATA_FILES)
+        merkle_ok = None
+        if plan.recorded_root:
+            evidence = {rel: d for rel, d in actual.items() if rel not in RUN_METADATA_FILES}
+            merkle_ok = not missing and merkle_root(evidence) == plan.recorded_root
+        clean = not (missing or tampered or unexpected) and merkle_ok is not False
+        results.append(
+            RunVerification(
+                run_id=plan.run.run_id,
+                rel_dir=plan.run.rel_dir,
+                status="OK" if clean else "TAMPERED",
+                files_checked=len(actual),
+                tampered=tampered,
+                missing=missing,
+                unexpected=unexpected,
+                merkle_ok=merkle_ok,
+            )
+        )
+    return results
+
+
+def verify_run(paths: ProjectPaths, run_id: str, *, full: bool = False) -> RunVerification | None:
+    """
+    Verify one registered run; None when the run is unknown.
+    """
+    run = get_run_registry(paths).get(run_id)
+    return verify_runs(paths, [run], full=full)[0] if run else None
+
+
+def verify_all_runs(paths: ProjectPaths, *, full: bool = False, workers: int | None = None) -> list[RunVerification]:
+    return verify_runs(paths, get_run_registry(paths).all_runs(), full=full, workers=workers)
@@ -1,51 +1,61 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import os
 import secrets
 import uuid
 import time
 import threading
-from datetime import datetime, timezone
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
 
 from fastapi import Depends, FastAPI, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from starlette.middleware.cors import CORSMiddleware
 
-from .agents_langgraph import run_daily_digest
-from .beta_spend_guardrail import run_daily_spend_guardrail
-from .beta_spend_guardrail import write_guardrail_beta_run
-from .beta_policy_drift import run_policy_drift_watchdog
-from .beta_policy_drift import write_policy_drift_beta_run
-from .beta_sla_sentinel import beat as record_beta_heartbeat
-from .beta_sla_sentinel import run_sla_breach_sentinel
-from .beta_sla_sentinel import write_sla_beta_run
+# Cold start: langgraph (`agents_langgraph`) and the beta scenario modules are imported on first
+# use inside the handlers below; only the modules every request needs are loaded here.
 from .bus import ack_message, list_inbox, send_message
+from .artifact_index import get_index
 from .artifacts import (
     append_text,
-    list_artifacts,
-    parse_story_status,
     read_text,
     write_text,
 )
+from .metrics_history import compute_trends, load_history
 from .paths import get_paths
+from .run_registry import get_run_registry
+from .story_events import get_event_index, percentile
 from .validator import format_text_report, validate
 
+from gados_common.metrics import PROMETHEUS_CONTENT_TYPE, registry as metrics_registry
 from gados_common.observability import instrument_fastapi, request_id_ctx, setup_observability
-from opentelemetry import metrics, trace
+from opentelemetry import trace
 
+if TYPE_CHECKING:
+    from fastapi.templating import Jinja2Templates
 
 app = FastAPI(title="GADOS Control Plane (CA GUI)", version="0.1.0")
 basic_auth = HTTPBasic(auto_error=False)
 _ready = False
 
 PKG_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(PKG_DIR / "templates"))
+
+
+@functools.lru_cache(maxsize=1)
+def _templates() -> Jinja2Templates:
+    # Jinja2 is imported and its loader built on the first HTML render, not at import.
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory=str(PKG_DIR / "templates"))
+
 
 static_dir = PKG_DIR / "static"
 if static_dir.exists():
@@ -56,11 +66,27 @@ instrument_fastapi(app)
 
 _log = __import__("logging").getLogger(__name__)
 _tracer = trace.get_tracer("gados-control-plane")
-_meter = metrics.get_meter("gados-control-plane")
-_debug_counter = _meter.create_counter(
-    name="gados_debug_trace_total",
-    description="Count of /debug/trace calls",
-    unit="1",
+_debug_counter = metrics_registry.counter(
+    "gados_debug_trace_total",
+    "Count of /debug/trace calls",
+)
+
+# RED metrics per route template (bounded cardinality: unmatched paths share one label).
+_http_requests = metrics_registry.counter(
+    "gados_http_server_requests_total",
+    "HTTP requests handled, by route template and status code",
+)
+_http_errors = metrics_registry.counter(
+    "gados_http_server_errors_total",
+    "HTTP requests that failed (5xx or unhandled exception), by route template",
+)
+_http_duration = metrics_registry.histogram(
+    "gados_http_server_duration_seconds",
+    "HTTP request latency by route template",
+)
+_http_in_flight = metrics_registry.gauge(
+    "gados_http_server_in_flight_requests",
+    "HTTP requests currently being handled",
 )
 
 
@@ -97,62 +123,6 @@ def _strip_gados_prefix(rel: str) -> str:
     return rel.removeprefix("gados-project/") if rel.startswith("gados-project/") else rel
 
 
-def _list_review_runs(paths) -> list[dict]:
-    """
-    Scenario 4: code review factory runs.
-    Run folders live at: gados-project/log/reports/review-runs/REVIEW-*/run.json
-    """
-    root = paths.gados_root / "log" / "reports" / "review-runs"
-    runs: list[dict] = []
-    if not root.exists():
-        return runs
-    for run_dir in sorted([p for p in root.iterdir() if p.is_dir()], reverse=True):
-        meta_path = run_dir / "run.json"
-        if not meta_path.exists():
-            continue
-        meta = _safe_read_json(meta_path)
-        run_id = str(meta.get("run_id") or run_dir.name)
-        scenario = str(meta.get("scenario") or "code-review-factory")
-        decision = str(meta.get("recommendation") or "UNKNOWN")
-        ts = str(meta.get("generated_at_utc") or "")
-        runs.append(
-            {
-                "run_id": run_id,
-                "scenario": scenario,
-                "decision": decision,
-                "generated_at_utc": ts,
-                "detail_url": f"/beta/runs/{run_id}",
-            }
-        )
-    return runs
-
-
-def _list_beta_runs(paths) -> list[dict]:
-    root = paths.gados_root / "log" / "reports" / "beta-runs"
-    runs: list[dict] = []
-    if not root.exists():
-        return runs
-    for run_dir in sorted([p for p in root.iterdir() if p.is_dir()], reverse=True):
-        meta_path = run_dir / "run.json"
-        if not meta_path.exists():
-            continue
-        meta = _safe_read_json(meta_path)
-        run_id = str(meta.get("run_id") or run_dir.name)
-        scenario = str(meta.get("scenario") or "beta-scenario")
-        decision = str(meta.get("recommendation") or "UNKNOWN")
-        ts = str(meta.get("generated_at_utc") or "")
-        runs.append(
-            {
-                "run_id": run_id,
-                "scenario": scenario,
-                "decision": decision,
-                "generated_at_utc": ts,
-                "detail_url": f"/beta/runs/{run_id}",
-            }
-        )
-    return runs
-
-
 def _run_key_from_run_id(run_id: str) -> str:
     # run_id format: REVIEW-<run_key>-NNN
     rid = (run_id or "").strip()
@@ -277,6 +247,8 @@ async def _autorun_reports_loop() -> None:
         return
     interval_min = int(os.getenv("GADOS_AUTORUN_REPORTS_INTERVAL_MINUTES", "360"))
     interval_sec = max(60, interval_min * 60)
+    from .agents_langgraph import run_daily_digest
+
     while True:
         try:
             run_daily_digest()
@@ -311,30 +283,46 @@ async def request_id_middleware(request: Request, call_next):
         request_id_ctx.reset(token)
 
 
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return str(getattr(route, "path", None) or "__unmatched__")
+
+
+# Registered last => outermost: measures the full middleware stack.
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    method = request.method
+    _http_in_flight.add(1)
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - t0
+        _http_in_flight.add(-1)
+        route = _route_template(request)
+        _http_duration.record(elapsed, {"method": method, "route": route})
+        _http_requests.add(1, {"method": method, "route": route, "status_code": status})
+        if status >= 500:
+            _http_errors.add(1, {"method": method, "route": route, "status_code": status})
+
+
 @app.get("/", response_class=HTMLResponse)
 def dashboard(request: Request) -> HTMLResponse:
-    paths = get_paths()
+    index = get_index(get_paths())
 
     # Compute basic counts and story status distribution
-    story_dir = paths.gados_root / "plan" / "stories"
     stories: list[dict] = []
     by_status: dict[str, int] = {}
-    if story_dir.exists():
-        for p in sorted(story_dir.iterdir()):
-            if not (p.is_file() and p.name.startswith("STORY-") and p.suffix == ".md"):
-                continue
-            rel = str(p.relative_to(paths.gados_root))
-            md = p.read_text(encoding="utf-8")
-            status = parse_story_status(md) or "UNKNOWN"
-            by_status[status] = by_status.get(status, 0) + 1
-            stories.append({"id": p.stem, "rel": rel, "status": status})
-
-    epic_dir = paths.gados_root / "strategy"
-    epic_count = 0
-    if epic_dir.exists():
-        epic_count = len([p for p in epic_dir.iterdir() if p.is_file() and p.name.startswith("EPIC-") and p.suffix == ".md"])
-
-    return templates.TemplateResponse(
+    for rec in index.stories():
+        status = rec.status or "UNKNOWN"
+        by_status[status] = by_status.get(status, 0) + 1
+        stories.append({"id": rec.stem, "rel": rec.rel_path, "status": status})
+    epic_count = len(index.epics())
+
+    return _templates().TemplateResponse(
         "dashboard.html",
         {
             "request": request,
@@ -356,6 +344,73 @@ def health() -> dict[str, str | bool]:
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_text() -> PlainTextResponse:
+    # Local Prometheus-text view of the same metrics exported via OTLP (works with OTEL_SDK_DISABLED=1).
+    return PlainTextResponse(metrics_registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _profiler_enabled() -> bool:
+    return os.getenv("GADOS_PROFILER_ENABLED", "0").strip().lower() in {"1", "true", "yes"}
+
+
+_profile_lock = threading.Lock()
+
+
+@app.get("/debug/profile")
+async def debug_profile(
+    seconds: float = 10.0,
+    _user: str = Depends(require_write_auth),
+) -> dict:
+    """
+    Opt-in sampling profile of the whole process for `seconds` (GADOS_PROFILER_ENABLED=1).
+
+    Writes collapsed stacks (flamegraph input) under `.gados-runtime/profiles/`; the first frame of
+    each stack is the route template the sample was attributed to.
+    """
+    if not _profiler_enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        max_s = float(os.getenv("GADOS_PROFILER_MAX_SECONDS", "60"))
+    except Exception:
+        max_s = 60.0
+    try:
+        interval_ms = float(os.getenv("GADOS_PROFILER_INTERVAL_MS", "10"))
+    except Exception:
+        interval_ms = 10.0
+    if not (0 < seconds <= max_s):
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {max_s:g}]")
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    from .profiler import SamplingProfiler, profiles_dir
+
+    try:
+        route_codes = {
+            r.endpoint.__code__: r.path for r in app.routes if hasattr(getattr(r, "endpoint", None), "__code__")
+        }
+        profiler = SamplingProfiler(interval_s=interval_ms / 1000.0, route_codes=route_codes)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = profiler.stop()
+    finally:
+        _profile_lock.release()
+
+    stamp = result.started_at.split("+", 1)[0].replace(":", "").replace("-", "")
+    out = result.write_collapsed(profiles_dir() / f"profile-{stamp}-{uuid.uuid4().hex[:6]}.folded")
+    _log.info("profile_written", extra={"path": str(out), "samples": result.samples})
+    return {
+        "path": str(out),
+        "started_at": result.started_at,
+        "duration_s": result.duration_s,
+        "interval_ms": interval_ms,
+        "samples": result.samples,
+        "routes": result.route_totals(),
+    }
+
+
 @app.get("/debug/trace")
 def debug_trace() -> dict[str, bool]:
     with _tracer.start_as_current_span("debug.trace") as span:
@@ -367,13 +422,12 @@ def debug_trace() -> dict[str, bool]:
 
 @app.get("/artifacts", response_class=HTMLResponse)
 def artifacts(request: Request, dir: str = "") -> HTMLResponse:
-    paths = get_paths()
     try:
-        items = list_artifacts(paths, dir)
+        items = get_index(get_paths()).list_dir(dir)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
-    return templates.TemplateResponse(
+    return _templates().TemplateResponse(
         "artifacts.html",
         {"request": request, "dir": dir, "items": items},
     )
@@ -387,7 +441,7 @@ def view(request: Request, path: str) -> HTMLResponse:
     except (ValueError, FileNotFoundError) as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
 
-    return templates.TemplateResponse(
+    return _templates().TemplateResponse(
         "view.html",
         {"request": request, "path": path, "content": content},
     )
@@ -395,7 +449,7 @@ def view(request: Request, path: str) -> HTMLResponse:
 
 @app.get("/create", response_class=HTMLResponse)
 def create_forms(request: Request) -> HTMLResponse:
-    return templates.TemplateResponse("create.html", {"request": request})
+    return _templates().TemplateResponse("create.html", {"request": request})
 
 
 @app.post("/create/epic")
@@ -466,17 +520,8 @@ def create_change(
 
 @app.get("/decisions", response_class=HTMLResponse)
 def decisions(request: Request) -> HTMLResponse:
-    paths = get_paths()
-    decision_dir = paths.gados_root / "decision"
-    items: list[str] = []
-    if decision_dir.exists():
-        for p in sorted(decision_dir.iterdir(), reverse=True):
-            if not p.is_file():
-                continue
-            if p.name == "README.md":
-                continue
-            items.append(str(p.relative_to(paths.gados_root)))
-    return templates.TemplateResponse("decisions.html", {"request": request, "items": items})
+    items = [rec.rel_path for rec in reversed(get_index(get_paths()).records("decision"))]
+    return _templates().TemplateResponse("decisions.html", {"request": request, "items": items})
 
 
 @app.post("/create/adr")
@@ -516,9 +561,10 @@ def append_story_log(
     paths = get_paths()
     log_rel = f"log/{story_id}.log.yaml"
     notes_safe = notes.replace('"', "'")
+    at = _utc_now()
     entry = (
         "\n"
-        "  - at: \"" + _utc_now() + "\"\n"
+        "  - at: \"" + at + "\"\n"
         "    actor_role: \"" + actor_role + "\"\n"
         "    actor: \"" + actor + "\"\n"
         "    type: \"" + event_type + "\"\n"
@@ -526,6 +572,11 @@ def append_story_log(
         "    submitted_by: \"" + user.replace('"', "'") + "\"\n"
     )
     append_text(paths, log_rel, entry)
+    get_event_index(paths).record_append(
+        story_id,
+        {"at": at, "actor_role": actor_role, "actor": actor, "type": event_type},
+        appended_bytes=len(entry.encode("utf-8")),
+    )
     return RedirectResponse(url=f"/view?path={log_rel}", status_code=303)
 
 
@@ -533,7 +584,7 @@ def append_story_log(
 def validate_ui(request: Request) -> HTMLResponse:
     paths = get_paths()
     msgs = validate(paths)
-    return templates.TemplateResponse("validate.html", {"request": request, "messages": msgs})
+    return _templates().TemplateResponse("validate.html", {"request": request, "messages": msgs})
 
 
 @app.get("/validate.txt", response_class=PlainTextResponse)
@@ -545,32 +596,79 @@ def validate_txt() -> PlainTextResponse:
 
 @app.get("/reports", response_class=HTMLResponse)
 def reports(request: Request) -> HTMLResponse:
-    paths = get_paths()
-    reports_dir = paths.gados_root / "log" / "reports"
-    reports_list: list[dict] = []
-    if reports_dir.exists():
-        for p in sorted(reports_dir.iterdir(), reverse=True):
-            if not (p.is_file() and p.suffix == ".md" and p.name.startswith("REPORT-")):
-                continue
-            reports_list.append(
-                {
-                    "name": p.name,
-                    "rel": str(p.relative_to(paths.gados_root)),
-                }
-            )
-    return templates.TemplateResponse("reports.html", {"request": request, "reports": reports_list})
+    reports_list = [
+        {"name": rec.name, "rel": rec.rel_path} for rec in reversed(get_index(get_paths()).records("report"))
+    ]
+    return _templates().TemplateResponse("reports.html", {"request": request, "reports": reports_list})
+
+
+@app.get("/reports/trends.json")
+def reports_trends_json(days: int = 90) -> dict[str, Any]:
+    return compute_trends(load_history(get_paths()), days=days)
+
+
+@app.get("/reports/story-events.json")
+def reports_story_events_json(days: int | None = None) -> dict[str, Any]:
+    """
+    Cycle times and per-actor throughput from the story event index.
+    """
+    events = get_event_index(get_paths())
+    ttv = list(events.time_to_verified_hours().values())
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    return {
+        "time_to_verified": {"count": len(ttv), "p50_hours": percentile(ttv, 0.5), "p90_hours": percentile(ttv, 0.9)},
+        "status_durations": events.status_durations(),
+        "actor_throughput": events.actor_throughput(since=since),
+    }
+
+
+@app.get("/reports/trends", response_class=HTMLResponse)
+def reports_trends(request: Request, days: int = 90) -> HTMLResponse:
+    trends = compute_trends(load_history(get_paths()), days=days)
+    return _templates().TemplateResponse("reports_trends.html", {"request": request, "trends": trends, "days": days})
 
 
 @app.get("/beta/runs", response_class=HTMLResponse)
-def beta_runs(request: Request) -> HTMLResponse:
+def beta_runs(
+    request: Request,
+    scenario: str = "",
+    recommendation: str = "",
+    confidence: str = "",
+    since: str = "",
+    until: str = "",
+    page: int = 1,
+    per_page: int = 50,
+) -> HTMLResponse:
     """
     Read-only decision UI for beta scenarios (PM-friendly).
     """
-    paths = get_paths()
-    runs = _list_review_runs(paths) + _list_beta_runs(paths)
-    # Sort newest first when timestamps are comparable; fall back to id.
-    runs = sorted(runs, key=lambda r: (str(r.get("generated_at_utc") or ""), str(r.get("run_id") or "")), reverse=True)
-    return templates.TemplateResponse("beta_runs.html", {"request": request, "runs": runs})
+    registry = get_run_registry(get_paths())
+    per_page = max(1, min(per_page, 200))
+    page = max(1, page)
+    filters = {
+        "scenario": scenario,
+        "recommendation": recommendation,
+        "confidence": confidence,
+        "since": since,
+        "until": until,
+    }
+    # One directory sync per request; the page and facet queries then read the same snapshot.
+    registry.sync()
+    result = registry.query(**filters, limit=per_page, offset=(page - 1) * per_page, sync=False)
+    return _templates().TemplateResponse(
+        "beta_runs.html",
+        {
+            "request": request,
+            "runs": result.runs,
+            "total": result.total,
+            "page": page,
+            "per_page": per_page,
+            "pages": max(1, -(-result.total // per_page)),
+            "filters": filters,
+            "filter_query": urlencode({k: v for k, v in filters.items() if v} | {"per_page": per_page}),
+            "facets": registry.facets(sync=False),
+        },
+    )
 
 
 @app.get("/beta/runs/{run_id}", response_class=HTMLResponse)
@@ -609,7 +707,7 @@ def beta_run_detail(request: Request, run_id: str) -> HTMLResponse:
         override_required = False
         run_key = ""
 
-    return templates.TemplateResponse(
+    return _templates().TemplateResponse(
         "beta_run_detail.html",
         {
             "request": request,
@@ -625,6 +723,20 @@ def beta_run_detail(request: Request, run_id: str) -> HTMLResponse:
     )
 
 
+@app.get("/beta/runs/{run_id}/verify")
+def beta_run_verify(run_id: str, full: bool = False) -> dict[str, Any]:
+    """
+    Check a run folder against its SHA256SUMS.txt and recorded Merkle root.
+    Unchanged files (same mtime/size) reuse cached digests unless `full=true`.
+    """
+    from .evidence_verify import verify_run
+
+    result = verify_run(get_paths(), run_id, full=full)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {"ok": result.ok, **asdict(result)}
+
+
 @app.post("/beta/override")
 def create_beta_override(
     run_key: str = Form(...),
@@ -670,6 +782,8 @@ def create_beta_override(
 
 @app.post("/agents/run/daily-digest")
 def run_agents_daily_digest(_user: str = Depends(require_write_auth)) -> RedirectResponse:
+    from .agents_langgraph import run_daily_digest
+
     out = run_daily_digest()
     rel = out.get("report_rel_path", "log/reports")
     return RedirectResponse(url=f"/view?path={rel}", status_code=303)
@@ -694,6 +808,8 @@ def run_agents_daily_spend_guardrail(
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid spend_steps")
 
+    from .beta_spend_guardrail import run_daily_spend_guardrail, write_guardrail_beta_run
+
     out = run_daily_spend_guardrail(paths=paths, budget_usd=budget, spend_steps_usd=steps)
     write_guardrail_beta_run(paths=paths, result=out)
     # Prefer showing the created escalation decision if any.
@@ -707,6 +823,8 @@ def run_agents_policy_drift_watchdog(
     baseline_rel_path: str = Form("memory/BETA_POLICY_BASELINE.yaml"),
     _user: str = Depends(require_write_auth),
 ) -> RedirectResponse:
+    from .beta_policy_drift import run_policy_drift_watchdog, write_policy_drift_beta_run
+
     paths = get_paths()
     out = run_policy_drift_watchdog(paths=paths, baseline_rel_path=baseline_rel_path.strip() or "memory/BETA_POLICY_BASELINE.yaml")
     write_policy_drift_beta_run(paths=paths, result=out)
@@ -721,6 +839,8 @@ def agents_heartbeat(
     agent_id: str = Form("CA-1"),
     _user: str = Depends(require_write_auth),
 ) -> RedirectResponse:
+    from .beta_sla_sentinel import beat as record_beta_heartbeat
+
     record_beta_heartbeat(role=role, agent_id=agent_id)
     return RedirectResponse(url=f"/inbox?role={role}&agent_id={agent_id}", status_code=303)
 
@@ -740,6 +860,8 @@ def run_agents_sla_sentinel(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid SLA values")
 
+    from .beta_sla_sentinel import run_sla_breach_sentinel, write_sla_beta_run
+
     out = run_sla_breach_sentinel(paths=paths, role=role, agent_id=agent_id, heartbeat_sla_seconds=hb, latency_sla_ms=lat)
     write_sla_beta_run(paths=paths, result=out)
     if out.report_rel_path:
@@ -750,7 +872,7 @@ def run_agents_sla_sentinel(
 @app.get("/inbox", response_class=HTMLResponse)
 def inbox(request: Request, role: str = "CoordinationAgent", agent_id: str = "CA-1") -> HTMLResponse:
     msgs = list_inbox(to_role=role, to_agent_id=agent_id, limit=100)
-    return templates.TemplateResponse(
+    return _templates().TemplateResponse(
         "inbox.html",
         {"request": request, "role": role, "agent_id": agent_id, "messages": msgs},
     )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from gados_common.fileio import append_text_locked
+
+from .paths import ProjectPaths
+from .reporting import Metrics
+
+# Append-only time series: one compact JSON row per digest run.
+METRICS_HISTORY_REL = "log/metrics/governance-metrics.jsonl"
+
+# Numeric fields compared week over week.
+TREND_FIELDS = (
+    "epic_count",
+    "story_count",
+    "verified_story_count",
+    "avg_time_to_verified_hours",
+    "p50_time_to_verified_hours",
+    "p90_time_to_verified_hours",
+    "validation_errors",
+    "validation_warnings",
+)
+
+
+def _history_path(paths: ProjectPaths) -> Path:
+    return paths.gados_root / METRICS_HISTORY_REL
+
+
+def _parse_at(value: Any) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
+
+
+def record_metrics(
+    paths: ProjectPaths, metrics: Metrics | dict[str, Any], *, at: str, report_rel: str | None = None
+) -> dict[str, Any]:
+    """
+    Append one row for a digest run (`at` is the run's UTC isoformat timestamp).
+    """
+    row: dict[str, Any] = {"at": at, **(asdict(metrics) if isinstance(metrics, Metrics) else dict(metrics))}
+    if report_rel:
+        row["report"] = report_rel
+    line = json.dumps(row, separators=(",", ":"), sort_keys=True, allow_nan=False) + "\n"
+    append_text_locked(_history_path(paths), line)
+    return row
+
+
+class _HistoryCache:
+    """
+    Rows parsed so far plus the byte offset they cover. The file is append-only, so a grown file
+    only needs its new tail parsed; a shrunk or replaced file is re-read.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ino = -1
+        self.offset = 0
+        self.rows: list[dict[str, Any]] = []
+
+
+_caches: dict[Path, _HistoryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def load_history(paths: ProjectPaths) -> list[dict[str, Any]]:
+    """
+    All recorded rows, oldest first (rows without a parseable `at` are skipped).
+    """
+    path = _history_path(paths)
+    with _caches_lock:
+        cache = _caches.setdefault(path, _HistoryCache())
+    with cache.lock:
+        try:
+            st = os.stat(path)
+        except OSError:
+            cache.ino, cache.offset, cache.rows = -1, 0, []
+            return []
+        if st.st_ino != cache.ino or st.st_size < cache.offset:
+            cache.ino, cache.offset, cache.rows = st.st_ino, 0, []
+        if st.st_size > cache.offset:
+            with open(path, "rb") as fh:
+                fh.seek(cache.offset)
+                chunk = fh.read(st.st_size - cache.offset)
+            # Only consume complete lines; a concurrent append may be mid-write.
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            cache.offset += len(complete)
+            for line in complete.splitlines():
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(row, dict) and _parse_at(row.get("at")) is not None:
+                    cache.rows.append(row)
+        return sorted(cache.rows, key=lambda r: _parse_at(r["at"]))
+
+
+def _delta(current: Any, previous: Any) -> float | None:
+    if isinstance(current, int | float) and isinstance(previous, int | float):
+        return current - previous
+    return None
+
+
+def compute_trends(rows: list[dict[str, Any]], *, days: int = 90) -> dict[str, Any]:
+    """
+    Week-over-week deltas (latest row vs the newest row at least 7 days older), time-to-verified
+    percentiles and a validation/verification series for the last `days` days.
+    """
+    if not rows:
+        return {"points": 0, "latest": None, "previous": None, "week_over_week": {}, "series": []}
+    latest = rows[-1]
+    latest_at = _parse_at(latest["at"])
+    week_ago = latest_at - timedelta(days=7)
+    previous = None
+    for row in reversed(rows):
+        if _parse_at(row["at"]) <= week_ago:
+            previous = row
+            break
+
+    wow = {
+        field: {
+            "current": latest.get(field),
+            "previous": previous.get(field) if previous else None,
+            "delta": _delta(latest.get(field), previous.get(field)) if previous else None,
+        }
+        for field in TREND_FIELDS
+    }
+
+    since = latest_at - timedelta(days=max(1, days))
+    series = [
+        {
+            "at": row["at"],
+            "validation_errors": row.get("validation_errors"),
+            "validation_warnings": row.get("validation_warnings"),
+            "verified_story_count": row.get("verified_story_count"),
+            "p50_time_to_verified_hours": row.get("p50_time_to_verified_hours"),
+            "p90_time_to_verified_hours": row.get("p90_time_to_verified_hours"),
+        }
+        for row in rows
+        if _parse_at(row["at"]) >= since
+    ]
+    return {
+        "points": len(rows),
+        "latest": latest,
+        "previous": previous,
+        "week_over_week": wow,
+        "series": series,
+    }
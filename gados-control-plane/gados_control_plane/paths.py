@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from gados_common.env import env_flag
+
 
 @dataclass(frozen=True)
 class ProjectPaths:
@@ -23,6 +26,23 @@ def get_paths() -> ProjectPaths:
     return ProjectPaths(repo_root=repo_root, gados_root=gados_root, templates_dir=templates_dir)
 
 
+def runtime_dir(paths: ProjectPaths) -> Path:
+    """
+    Directory for local runtime state (SQLite indexes, bus, profiles): GADOS_RUNTIME_DIR, else
+    `<repo>/.gados-runtime`.
+    """
+    runtime = os.getenv("GADOS_RUNTIME_DIR", "").strip()
+    return Path(runtime) if runtime else paths.repo_root / ".gados-runtime"
+
+
+def persist_indexes() -> bool:
+    """
+    Whether the SQLite indexes under `runtime_dir` are kept on disk (GADOS_ARTIFACT_INDEX_PERSIST=0:
+    in memory only, rebuilt per process).
+    """
+    return env_flag("GADOS_ARTIFACT_INDEX_PERSIST", True)
+
+
 def safe_resolve_under(base: Path, user_path: str) -> Path:
     """
     Resolve a user-provided relative path under base, preventing path traversal.
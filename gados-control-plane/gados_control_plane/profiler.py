@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import CodeType, FrameType
+
+from .paths import get_paths, runtime_dir
+
+# Leaf frames of threads parked waiting for work (threadpool workers, the event loop's selector).
+_IDLE_LEAVES = frozenset(
+    {
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("selectors.py", "select"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+    }
+)
+
+UNATTRIBUTED = "<no-route>"
+
+
+def profiles_dir() -> Path:
+    return runtime_dir(get_paths()) / "profiles"
+
+
+@dataclass(frozen=True)
+class ProfileResult:
+    started_at: str
+    duration_s: float
+    interval_s: float
+    samples: int
+    stacks: Counter[str]
+
+    def route_totals(self) -> dict[str, int]:
+        totals: Counter[str] = Counter()
+        for stack, n in self.stacks.items():
+            totals[stack.split(";", 1)[0]] += n
+        return dict(totals.most_common())
+
+    def write_collapsed(self, path: Path) -> Path:
+        """
+        Write Brendan Gregg collapsed-stack format (`frame;frame;... count`), ready for
+        flamegraph.pl / speedscope. The first frame is the route template.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {n}" for stack, n in self.stacks.most_common()]
+        path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+        return path
+
+
+class SamplingProfiler:
+    """
+    Low-overhead wall-clock stack sampler.
+
+    A daemon thread snapshots every thread's stack via `sys._current_frames()` each `interval_s`.
+    Samples are attributed to a route when a frame on the stack is one of `route_codes` (endpoint
+    code object -> route template); this works for both sync endpoints (threadpool threads) and
+    async ones (event loop thread). Idle threads are skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = 0.01,
+        max_depth: int = 64,
+        route_codes: Mapping[CodeType, str] | None = None,
+    ) -> None:
+        self.interval_s = max(0.001, interval_s)
+        self.max_depth = max(1, max_depth)
+        self._route_codes = dict(route_codes or {})
+        self._labels: dict[CodeType, str] = {}
+        self._stacks: Counter[str] = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at = ""
+        self._t0 = 0.0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("profiler already started")
+        self._started_at = datetime.now(UTC).replace(microsecond=0).isoformat()
+        self._t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="gados-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return ProfileResult(
+            started_at=self._started_at,
+            duration_s=round(time.perf_counter() - self._t0, 3),
+            interval_s=self.interval_s,
+            samples=self._samples,
+            stacks=Counter(self._stacks),
+        )
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            self.sample(skip_thread=own)
+
+    def sample(self, *, skip_thread: int | None = None) -> None:
+        self._samples += 1
+        for tid, frame in sys._current_frames().items():
+            if tid == skip_thread:
+                continue
+            stack = self._collapse(frame)
+            if stack is not None:
+                self._stacks[stack] += 1
+
+    def _label(self, code: CodeType, frame: FrameType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+            self._labels[code] = label
+        return label
+
+    def _collapse(self, leaf: FrameType) -> str | None:
+        code = leaf.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+            return None
+        frames: list[str] = []
+        route = UNATTRIBUTED
+        f: FrameType | None = leaf
+        while f is not None:
+            code = f.f_code
+            hit = self._route_codes.get(code)
+            if hit is not None:
+                route = hit  # keep walking: the outermost endpoint frame wins
+            if len(frames) < self.max_depth:
+                frames.append(self._label(code, f))
+            f = f.f_back
+        frames.append(route)
+        return ";".join(reversed(frames))
@@ -1,34 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
-from pathlib import Path
-from typing import Any
 
-import yaml
-
-from .artifacts import iter_story_specs, parse_story_status
+from .artifact_index import get_index
 from .paths import ProjectPaths
+from .story_events import get_event_index, percentile
 from .validator import ValidationMessage, validate
 
 
-def _parse_dt(value: str) -> datetime | None:
-    # Supports "2025-01-01T00:00:00+00:00" (isoformat) and "Z" suffix.
-    try:
-        if value.endswith("Z"):
-            value = value[:-1] + "+00:00"
-        return datetime.fromisoformat(value)
-    except Exception:
-        return None
-
-
-def _read_yaml_file(path: Path) -> Any:
-    try:
-        return yaml.safe_load(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-
-
 @dataclass(frozen=True)
 class Metrics:
     epic_count: int
@@ -38,67 +17,53 @@ class Metrics:
     avg_time_to_verified_hours: float | None
     validation_errors: int
     validation_warnings: int
+    p50_time_to_verified_hours: float | None = None
+    p90_time_to_verified_hours: float | None = None
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    """
+    One validation pass plus the metrics derived from it (shared by daily digest nodes).
+    """
 
+    metrics: Metrics
+    validations: list[ValidationMessage]
+
+
+def load_snapshot(paths: ProjectPaths) -> ProjectSnapshot:
+    msgs = validate(paths)
+    return ProjectSnapshot(metrics=compute_metrics(paths, validations=msgs), validations=msgs)
+
+
+def compute_metrics(paths: ProjectPaths, *, validations: list[ValidationMessage] | None = None) -> Metrics:
+    """
+    Project metrics; pass `validations` to reuse an existing `validate()` result.
+    """
+    index = get_index(paths)
 
-def compute_metrics(paths: ProjectPaths) -> Metrics:
     # Epics
-    epic_dir = paths.gados_root / "strategy"
-    epic_count = 0
-    if epic_dir.exists():
-        epic_count = len([p for p in epic_dir.iterdir() if p.is_file() and p.name.startswith("EPIC-") and p.suffix == ".md"])
+    epic_count = len(index.epics())
 
     # Stories and statuses
     stories_by_status: dict[str, int] = {}
     story_count = 0
     verified_story_ids: list[str] = []
-    for story_path in iter_story_specs(paths):
+    for rec in index.stories():
         story_count += 1
-        md = story_path.read_text(encoding="utf-8")
-        status = parse_story_status(md) or "UNKNOWN"
+        status = rec.status or "UNKNOWN"
         stories_by_status[status] = stories_by_status.get(status, 0) + 1
         if "VERIFIED" in status or "RELEASED" in status:
-            verified_story_ids.append(story_path.stem)
-
-    # Time to verified (best-effort, from story log events)
-    durations_hours: list[float] = []
-    for story_id in verified_story_ids:
-        log_path = paths.gados_root / "log" / f"{story_id}.log.yaml"
-        if not log_path.exists():
-            continue
-        data = _read_yaml_file(log_path)
-        if not isinstance(data, dict):
-            continue
-        events = data.get("events")
-        if not isinstance(events, list):
-            continue
-
-        t_in_progress: datetime | None = None
-        t_verified: datetime | None = None
-        for ev in events:
-            if not isinstance(ev, dict):
-                continue
-            at = ev.get("at")
-            if not isinstance(at, str):
-                continue
-            dt = _parse_dt(at)
-            if dt is None:
-                continue
-
-            if ev.get("type") == "STATUS_CHANGED" and ev.get("to") == "IN_PROGRESS":
-                if t_in_progress is None or dt < t_in_progress:
-                    t_in_progress = dt
-            if ev.get("type") == "VERIFICATION_DECISION" and ev.get("decision") == "VERIFIED":
-                if t_verified is None or dt < t_verified:
-                    t_verified = dt
-
-        if t_in_progress and t_verified and t_verified >= t_in_progress:
-            durations_hours.append((t_verified - t_in_progress).total_seconds() / 3600.0)
+            verified_story_ids.append(rec.stem)
+
+    # Time to verified (best-effort, from the story event index)
+    durations_hours = list(get_event_index(paths).time_to_verified_hours(verified_story_ids).values())
 
     avg_time = None
     if durations_hours:
         avg_time = sum(durations_hours) / len(durations_hours)
 
-    msgs = validate(paths)
+    msgs = validations if validations is not None else validate(paths)
     validation_errors = sum(1 for m in msgs if m.level == "ERROR")
     validation_warnings = sum(1 for m in msgs if m.level == "WARN")
 
@@ -110,6 +75,8 @@ def compute_metrics(paths: ProjectPaths) -> Metrics:
         avg_time_to_verified_hours=avg_time,
         validation_errors=validation_errors,
         validation_warnings=validation_warnings,
+        p50_time_to_verified_hours=percentile(durations_hours, 0.5),
+        p90_time_to_verified_hours=percentile(durations_hours, 0.9),
     )
 
 
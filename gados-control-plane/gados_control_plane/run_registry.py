@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from .paths import ProjectPaths, persist_indexes, runtime_dir
+
+_log = logging.getLogger(__name__)
+
+# Run containers tracked by the registry: (kind, directory under gados-project, default scenario).
+_RUN_ROOTS: tuple[tuple[str, str, str], ...] = (
+    ("review", "log/reports/review-runs", "code-review-factory"),
+    ("beta", "log/reports/beta-runs", "beta-scenario"),
+)
+
+_REGISTRY_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+  run_id TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  scenario TEXT NOT NULL,
+  recommendation TEXT NOT NULL,
+  confidence TEXT,
+  generated_at_utc TEXT NOT NULL,
+  rel_dir TEXT NOT NULL,
+  correlation_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_recent ON runs(generated_at_utc DESC, run_id DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_scenario ON runs(scenario, generated_at_utc DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_recommendation ON runs(recommendation, generated_at_utc DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_confidence ON runs(confidence, generated_at_utc DESC);
+CREATE TABLE IF NOT EXISTS run_roots (
+  rel_dir TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class RunRow:
+    run_id: str
+    kind: str  # review | beta
+    scenario: str
+    recommendation: str
+    confidence: str | None
+    generated_at_utc: str
+    rel_dir: str
+    correlation_id: str | None = None
+
+    @property
+    def detail_url(self) -> str:
+        return f"/beta/runs/{self.run_id}"
+
+
+@dataclass(frozen=True)
+class RunPage:
+    runs: list[RunRow]
+    total: int
+    limit: int
+    offset: int
+
+
+def _row_from_meta(meta: dict[str, Any], *, kind: str, run_id: str, rel_dir: str, default_scenario: str) -> RunRow:
+    confidence = meta.get("confidence")
+    correlation_id = meta.get("correlation_id")
+    return RunRow(
+        run_id=str(meta.get("run_id") or run_id),
+        kind=kind,
+        scenario=str(meta.get("scenario") or default_scenario),
+        recommendation=str(meta.get("recommendation") or "UNKNOWN"),
+        confidence=str(confidence) if confidence else None,
+        generated_at_utc=str(meta.get("generated_at_utc") or ""),
+        rel_dir=rel_dir,
+        correlation_id=str(correlation_id) if correlation_id else None,
+    )
+
+
+def _day_after(day: str) -> str:
+    try:
+        return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+    except ValueError:
+        return day
+
+
+def _read_run_json(run_dir: Path) -> dict[str, Any] | None:
+    try:
+        meta = json.loads((run_dir / "run.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+class RunRegistry:
+    """
+    SQLite index of beta/review run containers (`run.json` metadata) for filtered, paginated listing.
+
+    Writers (`write_beta_run`, `scripts/generate_review_pack.py`) register runs as they finalize them.
+    Run folders that appear any other way (copied in, older runs) are picked up when a run root's
+    directory mtime changes; only their `run.json` files are read. `rebuild()` re-derives everything
+    from disk (`scripts/rebuild_run_registry.py`).
+    """
+
+    def __init__(self, paths: ProjectPaths, *, db_path: Path | str | None = None, persist: bool = True) -> None:
+        self.paths = paths
+        self._lock = threading.RLock()
+        if not persist:
+            target = ":memory:"
+        else:
+            root_key = hashlib.sha1(str(paths.gados_root.resolve()).encode("utf-8")).hexdigest()[:12]
+            target = str(db_path or runtime_dir(paths) / f"run-registry-{root_key}.sqlite3")
+        self._db = self._open_db(target)
+
+    @staticmethod
+    def _open_db(target: str) -> sqlite3.Connection:
+        try:
+            if target != ":memory:":
+                Path(target).parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(target, check_same_thread=False)
+            if con.execute("PRAGMA user_version").fetchone()[0] != _REGISTRY_VERSION:
+                con.executescript(
+                    "DROP TABLE IF EXISTS runs; DROP TABLE IF EXISTS run_roots; "
+                    f"PRAGMA user_version = {_REGISTRY_VERSION};"
+                )
+            con.executescript(_SCHEMA)
+            return con
+        except Exception:
+            _log.warning("run_registry_persistence_disabled", extra={"db_path": target}, exc_info=True)
+            con = sqlite3.connect(":memory:", check_same_thread=False)
+            con.executescript(_SCHEMA)
+            return con
+
+    def _upsert(self, row: RunRow) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                row.run_id,
+                row.kind,
+                row.scenario,
+                row.recommendation,
+                row.confidence,
+                row.generated_at_utc,
+                row.rel_dir,
+                row.correlation_id,
+            ),
+        )
+
+    def register(self, run_dir: Path, meta: dict[str, Any] | None = None) -> RunRow | None:
+        """
+        Record (or refresh) one finalized run folder; `meta` defaults to its run.json.
+        """
+        run_dir = Path(run_dir)
+        for kind, rel_root, default_scenario in _RUN_ROOTS:
+            root = self.paths.gados_root / rel_root
+            if run_dir.parent.resolve() != root.resolve():
+                continue
+            meta = meta if meta is not None else _read_run_json(run_dir)
+            if meta is None:
+                return None
+            row = _row_from_meta(
+                meta, kind=kind, run_id=run_dir.name, rel_dir=f"{rel_root}/{run_dir.name}", default_scenario=default_scenario
+            )
+            with self._lock, self._db:
+                self._upsert(row)
+            return row
+        return None
+
+    def _sync_root(self, kind: str, rel_root: str, default_scenario: str, *, full: bool) -> None:
+        root = self.paths.gados_root / rel_root
+        try:
+            mtime_ns = root.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        stored = self._db.execute("SELECT mtime_ns FROM run_roots WHERE rel_dir = ?", (rel_root,)).fetchone()
+        if not full and stored is not None and stored[0] == mtime_ns:
+            return
+
+        known = {r[0].rsplit("/", 1)[-1] for r in self._db.execute("SELECT rel_dir FROM runs WHERE kind = ?", (kind,))}
+        on_disk: set[str] = set()
+        complete = True
+        if mtime_ns != -1:
+            with os.scandir(root) as it:
+                on_disk = {e.name for e in it if e.is_dir()}
+        for name in sorted(on_disk if full else on_disk - known):
+            meta = _read_run_json(root / name)
+            if meta is None:
+                complete = False  # still being written; look again next time
+                continue
+            self._upsert(
+                _row_from_meta(meta, kind=kind, run_id=name, rel_dir=f"{rel_root}/{name}", default_scenario=default_scenario)
+            )
+        gone = known - on_disk
+        if gone:
+            self._db.executemany("DELETE FROM runs WHERE rel_dir = ?", [(f"{rel_root}/{n}",) for n in gone])
+        if complete:
+            self._db.execute("INSERT OR REPLACE INTO run_roots VALUES (?, ?)", (rel_root, mtime_ns))
+
+    def sync(self, *, full: bool = False) -> None:
+        """
+        Pick up run folders added or removed on disk. Queries sync by default; callers running several
+        queries for one request can sync once and pass `sync=False`.
+        """
+        with self._lock, self._db:
+            for kind, rel_root, default_scenario in _RUN_ROOTS:
+                self._sync_root(kind, rel_root, default_scenario, full=full)
+
+    def rebuild(self) -> int:
+        """
+        Drop and re-derive all rows from the run folders on disk; returns the number of runs.
+        One transaction: readers never see an empty registry, and a failure keeps the old rows.
+        """
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM runs")
+                self._db.execute("DELETE FROM run_roots")
+                for kind, rel_root, default_scenario in _RUN_ROOTS:
+                    self._sync_root(kind, rel_root, default_scenario, full=True)
+            return int(self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+
+    def query(
+        self,
+        *,
+        scenario: str | None = None,
+        recommendation: str | None = None,
+        confidence: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        sync: bool = True,
+    ) -> RunPage:
+        """
+        Newest first. `since`/`until` compare against `generated_at_utc` (ISO dates or timestamps;
+        `until` is inclusive of the whole day when given as YYYY-MM-DD).
+        """
+        if sync:
+            self.sync()
+        clauses: list[str] = []
+        args: list[Any] = []
+        for column, value in (("scenario", scenario), ("recommendation", recommendation), ("confidence", confidence)):
+            if value:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if since:
+            clauses.append("generated_at_utc >= ?")
+            args.append(since)
+        if until:
+            clauses.append("generated_at_utc < ?")
+            args.append(_day_after(until) if len(until) == 10 else until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(int(limit), 500))
+        offset = max(0, int(offset))
+        with self._lock:
+            total = int(self._db.execute(f"SELECT COUNT(*) FROM runs {where}", args).fetchone()[0])
+            rows = self._db.execute(
+                f"SELECT * FROM runs {where} ORDER BY generated_at_utc DESC, run_id DESC LIMIT ? OFFSET ?",
+                [*args, limit, offset],
+            ).fetchall()
+        return RunPage(runs=[RunRow(*r) for r in rows], total=total, limit=limit, offset=offset)
+
+    def get(self, run_id: str) -> RunRow | None:
+        self.sync()
+        with self._lock:
+            row = self._db.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return RunRow(*row) if row else None
+
+    def all_runs(self) -> list[RunRow]:
+        """
+        Every registered run, newest first (for batch jobs such as evidence verification).
+        """
+        self.sync()
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM runs ORDER BY generated_at_utc DESC, run_id DESC").fetchall()
+        return [RunRow(*r) for r in rows]
+
+    def facets(self, *, sync: bool = True) -> dict[str, list[str]]:
+        """
+        Distinct filter values (scenario, recommendation, confidence) for the runs UI.
+        """
+        if sync:
+            self.sync()
+        with self._lock:
+            return {
+                column: [
+                    r[0]
+                    for r in self._db.execute(
+                        f"SELECT DISTINCT {column} FROM runs WHERE {column} IS NOT NULL ORDER BY {column}"
+                    )
+                ]
+                for column in ("scenario", "recommendation", "confidence")
+            }
+
+
+_registries: dict[Path, RunRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_run_registry(paths: ProjectPaths) -> RunRegistry:
+    """
+    Process-wide registry per `gados_root` (persistence follows GADOS_ARTIFACT_INDEX_PERSIST).
+    """
+    key = paths.gados_root.resolve()
+    with _registries_lock:
+        reg = _registries.get(key)
+        if reg is None:
+            persist = persist_indexes()
+            reg = RunRegistry(paths, persist=persist)
+            _registries[key] = reg
+        return reg
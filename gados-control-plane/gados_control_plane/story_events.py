@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .artifact_index import get_index
+from .paths import ProjectPaths, persist_indexes, runtime_dir
+
+_log = logging.getLogger(__name__)
+
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when extraction changes so persisted events are re-derived from the logs.
+_EVENTS_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS story_events (
+  story_id TEXT NOT NULL,
+  seq INTEGER NOT NULL,
+  at TEXT,
+  at_epoch REAL,
+  type TEXT,
+  to_state TEXT,
+  decision TEXT,
+  actor_role TEXT,
+  actor TEXT,
+  PRIMARY KEY (story_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_story_events_type ON story_events(type, to_state, decision);
+CREATE INDEX IF NOT EXISTS idx_story_events_actor ON story_events(actor_role, actor);
+CREATE TABLE IF NOT EXISTS story_logs (
+  story_id TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL
+);
+"""
+
+_EventRow = tuple[str | None, float | None, str | None, str | None, str | None, str | None, str | None]
+
+
+def _parse_dt(value: str) -> datetime | None:
+    # Supports "2025-01-01T00:00:00+00:00" (isoformat) and "Z" suffix; naive timestamps are UTC.
+    try:
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        dt = datetime.fromisoformat(value)
+    except Exception:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
+
+
+def _str_or_none(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def event_row(ev: Mapping[str, Any]) -> _EventRow:
+    """
+    (at, at_epoch, type, to, decision, actor_role, actor) for one story log event.
+    """
+    at = ev.get("at")
+    dt = _parse_dt(at) if isinstance(at, str) else None
+    return (
+        at if isinstance(at, str) else None,
+        dt.timestamp() if dt is not None else None,
+        _str_or_none(ev.get("type")),
+        _str_or_none(ev.get("to")),
+        _str_or_none(ev.get("decision")),
+        _str_or_none(ev.get("actor_role")),
+        _str_or_none(ev.get("actor")),
+    )
+
+
+def _parse_log(raw: bytes) -> list[_EventRow]:
+    try:
+        data = yaml.load(raw.decode("utf-8"), Loader=_YamlLoader)
+    except Exception:
+        return []
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list):
+        return []
+    return [event_row(ev) for ev in events if isinstance(ev, dict)]
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    # Nearest-rank percentile.
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+class StoryEventIndex:
+    """
+    One row per story log event (at/type/to/decision/actor_role/actor) in SQLite, so cycle times
+    and throughput are SQL queries instead of YAML re-parsing.
+
+    Events appended through the control plane are inserted at append time (`record_append`). Logs
+    edited out of band are re-parsed on the next query: `sync()` compares each log's
+    (mtime_ns, size) from the artifact index against the signature the rows were derived from.
+    """
+
+    def __init__(self, paths: ProjectPaths, *, db_path: Path | str | None = None, persist: bool = True) -> None:
+        self.paths = paths
+        self._lock = threading.RLock()
+        if not persist:
+            target = ":memory:"
+        else:
+            root_key = hashlib.sha1(str(paths.gados_root.resolve()).encode("utf-8")).hexdigest()[:12]
+            target = str(db_path or runtime_dir(paths) / f"story-events-{root_key}.sqlite3")
+        self._db = self._open_db(target)
+        self._signatures: dict[str, tuple[int, int]] = {
+            story_id: (mtime_ns, size)
+            for story_id, mtime_ns, size in self._db.execute("SELECT story_id, mtime_ns, size FROM story_logs")
+        }
+
+    @staticmethod
+    def _open_db(target: str) -> sqlite3.Connection:
+        try:
+            if target != ":memory:":
+                Path(target).parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(target, check_same_thread=False)
+            if con.execute("PRAGMA user_version").fetchone()[0] != _EVENTS_VERSION:
+                con.executescript(
+                    "DROP TABLE IF EXISTS story_events; DROP TABLE IF EXISTS story_logs; "
+                    f"PRAGMA user_version = {_EVENTS_VERSION};"
+                )
+            con.executescript(_SCHEMA)
+            return con
+        except Exception:
+            _log.warning("story_events_persistence_disabled", extra={"db_path": target}, exc_info=True)
+            con = sqlite3.connect(":memory:", check_same_thread=False)
+            con.executescript(_SCHEMA)
+            return con
+
+    def _log_path(self, story_id: str) -> Path:
+        return self.paths.gados_root / "log" / f"{story_id}.log.yaml"
+
+    def _replace(self, story_id: str, rows: list[_EventRow], signature: tuple[int, int]) -> None:
+        self._db.execute("DELETE FROM story_events WHERE story_id = ?", (story_id,))
+        self._db.executemany(
+            "INSERT INTO story_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(story_id, seq, *row) for seq, row in enumerate(rows)],
+        )
+        self._db.execute("INSERT OR REPLACE INTO story_logs VALUES (?, ?, ?)", (story_id, *signature))
+        self._signatures[story_id] = signature
+
+    def sync(self) -> None:
+        """
+        Re-derive events for story logs that changed (or appeared/disappeared) since last indexed.
+        """
+        logs = {r.story_id: r for r in get_index(self.paths).records("story_log") if r.story_id}
+        with self._lock, self._db:
+            for story_id, rec in logs.items():
+                signature = (rec.mtime_ns, rec.size)
+                if self._signatures.get(story_id) == signature:
+                    continue
+                try:
+                    raw = self._log_path(story_id).read_bytes()
+                except OSError:
+                    continue
+                self._replace(story_id, _parse_log(raw), signature)
+            for story_id in [s for s in self._signatures if s not in logs]:
+                self._db.execute("DELETE FROM story_events WHERE story_id = ?", (story_id,))
+                self._db.execute("DELETE FROM story_logs WHERE story_id = ?", (story_id,))
+                del self._signatures[story_id]
+
+    def record_append(self, story_id: str, event: Mapping[str, Any], *, appended_bytes: int) -> None:
+        """
+        Index an event just appended to `log/<story_id>.log.yaml` without re-parsing the log.
+
+        Only applies when the rows were in sync with the file before the append (its size grew by
+        exactly `appended_bytes`); otherwise the next `sync()` re-parses the whole log.
+        """
+        try:
+            st = self._log_path(story_id).stat()
+        except OSError:
+            return
+        with self._lock, self._db:
+            previous = self._signatures.get(story_id)
+            if previous is None or previous[1] + appended_bytes != st.st_size:
+                return
+            (seq,) = self._db.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM story_events WHERE story_id = ?", (story_id,)
+            ).fetchone()
+            self._db.execute("INSERT INTO story_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (story_id, seq, *event_row(event)))
+            signature = (st.st_mtime_ns, st.st_size)
+            self._db.execute("INSERT OR REPLACE INTO story_logs VALUES (?, ?, ?)", (story_id, *signature))
+            self._signatures[story_id] = signature
+
+    # --- queries ---
+
+    def time_to_verified_hours(self, story_ids: Iterable[str] | None = None) -> dict[str, float]:
+        """
+        Per story: earliest STATUS_CHANGED(to: IN_PROGRESS) -> earliest VERIFICATION_DECISION(VERIFIED).
+        """
+        self.sync()
+        wanted = set(story_ids) if story_ids is not None else None
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT story_id,
+                       MIN(CASE WHEN type = 'STATUS_CHANGED' AND to_state = 'IN_PROGRESS' THEN at_epoch END),
+                       MIN(CASE WHEN type = 'VERIFICATION_DECISION' AND decision = 'VERIFIED' THEN at_epoch END)
+                FROM story_events
+                WHERE at_epoch IS NOT NULL
+                GROUP BY story_id
+                """
+            ).fetchall()
+        out: dict[str, float] = {}
+        for story_id, started, verified in rows:
+            if wanted is not None and story_id not in wanted:
+                continue
+            if started is not None and verified is not None and verified >= started:
+                out[story_id] = (verified - started) / 3600.0
+        return out
+
+    def status_durations(self) -> dict[str, dict[str, Any]]:
+        """
+        Time spent in each status: from a STATUS_CHANGED(to: X) event to the story's next status change.
+        """
+        self.sync()
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT to_state,
+                       LEAD(at_epoch) OVER (PARTITION BY story_id ORDER BY at_epoch, seq) - at_epoch
+                FROM story_events
+                WHERE type = 'STATUS_CHANGED' AND at_epoch IS NOT NULL AND to_state IS NOT NULL
+                """
+            ).fetchall()
+        by_state: dict[str, list[float]] = {}
+        for state, seconds in rows:
+            if seconds is not None:
+                by_state.setdefault(state, []).append(seconds / 3600.0)
+        return {
+            state: {
+                "count": len(hours),
+                "p50_hours": percentile(hours, 0.5),
+                "p90_hours": percentile(hours, 0.9),
+            }
+            for state, hours in sorted(by_state.items())
+        }
+
+    def actor_throughput(self, *, since: datetime | None = None) -> list[dict[str, Any]]:
+        """
+        Events and VERIFIED decisions per (actor_role, actor), busiest first.
+        """
+        self.sync()
+        since_epoch = since.timestamp() if since is not None else None
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT actor_role, actor, COUNT(*),
+                       SUM(CASE WHEN type = 'VERIFICATION_DECISION' AND decision = 'VERIFIED' THEN 1 ELSE 0 END),
+                       COUNT(DISTINCT story_id)
+                FROM story_events
+                WHERE ? IS NULL OR at_epoch >= ?
+                GROUP BY actor_role, actor
+                ORDER BY COUNT(*) DESC, actor_role, actor
+                """,
+                (since_epoch, since_epoch),
+            ).fetchall()
+        return [
+            {"actor_role": role, "actor": actor, "events": events, "verifications": verified, "stories": stories}
+            for role, actor, events, verified, stories in rows
+        ]
+
+
+_indexes: dict[Path, StoryEventIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_event_index(paths: ProjectPaths) -> StoryEventIndex:
+    """
+    Process-wide event index per `gados_root` (persistence follows GADOS_ARTIFACT_INDEX_PERSIST).
+    """
+    key = paths.gados_root.resolve()
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            persist = persist_indexes()
+            idx = StoryEventIndex(paths, persist=persist)
+            _indexes[key] = idx
+        return idx
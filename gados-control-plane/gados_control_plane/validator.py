@@ -1,13 +1,12 @@
 from __future__ import annotations
 
+import os
 import re
+import threading
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any
+from pathlib import Path
 
-import yaml
-
-from .artifacts import iter_story_specs, load_yaml, parse_story_status
+from .artifact_index import ArtifactRecord, get_index
 from .paths import ProjectPaths
 
 
@@ -37,61 +36,6 @@ def _status_rank(status: str | None) -> int | None:
     return None
 
 
-def _read_yaml_file(path) -> Any:
-    try:
-        return yaml.safe_load(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-
-
-def _has_verification_decision(*, log_path, story_id: str) -> tuple[bool, bool]:
-    """
-    Returns (has_verified_decision, actor_is_delivery_governor).
-    """
-    data = _read_yaml_file(log_path)
-    if not isinstance(data, dict):
-        return (False, False)
-    events = data.get("events")
-    if not isinstance(events, list):
-        return (False, False)
-    for ev in events:
-        if not isinstance(ev, dict):
-            continue
-        if ev.get("type") != "VERIFICATION_DECISION":
-            continue
-        if ev.get("decision") != "VERIFIED":
-            continue
-        actor_ok = ev.get("actor_role") == "DeliveryGovernor"
-        return (True, bool(actor_ok))
-    return (False, False)
-
-
-def _has_vda_approved_change_plan(paths: ProjectPaths, story_id: str) -> bool:
-    """
-    Any CHANGE plan that references story_id and has approvals.vda.approved == true.
-    """
-    changes_dir = paths.gados_root / "plan" / "changes"
-    if not changes_dir.exists():
-        return False
-    for p in changes_dir.iterdir():
-        if not (p.is_file() and p.suffix in {".yaml", ".yml"}):
-            continue
-        if p.name == "README.md":
-            continue
-        try:
-            rel = str(p.relative_to(paths.gados_root))
-            doc = load_yaml(paths, rel)
-        except Exception:
-            continue
-        if str(doc.get("story_id", "")).strip() != story_id:
-            continue
-        approvals = doc.get("approvals") or {}
-        vda = approvals.get("vda") if isinstance(approvals, dict) else {}
-        if isinstance(vda, dict) and bool(vda.get("approved")) is True:
-            return True
-    return False
-
-
 @dataclass(frozen=True)
 class ValidationMessage:
     level: str  # ERROR | WARN | INFO
@@ -100,6 +44,104 @@ class ValidationMessage:
     artifact: str | None = None
 
 
+_story_findings: dict[Path, dict[str, tuple[tuple, tuple[ValidationMessage, ...]]]] = {}
+_findings_lock = threading.Lock()
+
+
+def _sig(record: ArtifactRecord | None) -> tuple[int, int] | None:
+    return (record.mtime_ns, record.size) if record is not None else None
+
+
+def _validate_story(
+    story: ArtifactRecord,
+    *,
+    approved: bool,
+    evidence: ArtifactRecord | None,
+    review: ArtifactRecord | None,
+    log: ArtifactRecord | None,
+) -> list[ValidationMessage]:
+    msgs: list[ValidationMessage] = []
+    rel = story.rel_path
+    if not STORY_NAME_RE.match(story.name):
+        msgs.append(
+            ValidationMessage(
+                "WARN",
+                "BAD_STORY_NAME",
+                "Story filename should be STORY-###.md",
+                rel,
+            )
+        )
+
+    status = story.status
+    if status is None:
+        msgs.append(ValidationMessage("WARN", "MISSING_STATUS", "Story is missing a **Status** line.", rel))
+
+    story_id = story.stem  # STORY-###
+    rank = _status_rank(status)
+
+    # If story is IMPLEMENTED or beyond, require an approved change plan.
+    if rank is not None and rank >= _STATE_RANK["IMPLEMENTED"]:
+        if not approved:
+            msgs.append(
+                ValidationMessage(
+                    "ERROR",
+                    "MISSING_APPROVED_CHANGE_PLAN",
+                    "Story is IMPLEMENTED+ but no VDA-approved change plan exists (approvals.vda.approved: true).",
+                    f"plan/changes (story_id={story_id})",
+                )
+            )
+
+    # If story claims VERIFIED/RELEASED, ensure evidence + peer review exist
+    if status and ("VERIFIED" in status or "RELEASED" in status):
+        if evidence is None:
+            msgs.append(
+                ValidationMessage(
+                    "ERROR",
+                    "MISSING_EVIDENCE",
+                    "Story marked VERIFIED/RELEASED but QA evidence package is missing.",
+                    f"verification/{story_id}-evidence.md",
+                )
+            )
+        if review is None:
+            msgs.append(
+                ValidationMessage(
+                    "ERROR",
+                    "MISSING_PEER_REVIEW",
+                    "Story marked VERIFIED/RELEASED but peer review report is missing.",
+                    f"verification/{story_id}-review.md",
+                )
+            )
+        log_rel = f"log/{story_id}.log.yaml"
+        if log is None:
+            msgs.append(
+                ValidationMessage(
+                    "ERROR",
+                    "MISSING_LOG",
+                    "Story marked VERIFIED/RELEASED but story audit log is missing.",
+                    log_rel,
+                )
+            )
+        elif not log.facts.get("verified"):
+            msgs.append(
+                ValidationMessage(
+                    "ERROR",
+                    "MISSING_VERIFICATION_DECISION",
+                    "Story marked VERIFIED/RELEASED but log is missing VERIFICATION_DECISION(decision: VERIFIED).",
+                    log_rel,
+                )
+            )
+        elif not log.facts.get("verified_by_governor"):
+            msgs.append(
+                ValidationMessage(
+                    "ERROR",
+                    "INVALID_VERIFICATION_ACTOR",
+                    "Verification decision must be made by actor_role=DeliveryGovernor (VDA).",
+                    log_rel,
+                )
+            )
+    return msgs
+
+
 def validate(paths: ProjectPaths) -> list[ValidationMessage]:
     msgs: list[ValidationMessage] = []
 
@@ -127,107 +169,48 @@ def validate(paths: ProjectPaths) -> list[ValidationMessage]:
         if not p.exists():
             msgs.append(ValidationMessage("ERROR", "MISSING_ARTIFACT", f"Missing required artifact: {rel}", rel))
 
-    # Validate story file naming + basic fields
-    for story_path in iter_story_specs(paths):
-        if not STORY_NAME_RE.match(story_path.name):
-            msgs.append(
-                ValidationMessage(
-                    "WARN",
-                    "BAD_STORY_NAME",
-                    "Story filename should be STORY-###.md",
-                    str(story_path.relative_to(paths.gados_root)),
-                )
-            )
-
-        rel = str(story_path.relative_to(paths.gados_root))
-        md = story_path.read_text(encoding="utf-8")
-        status = parse_story_status(md)
-        if status is None:
-            msgs.append(ValidationMessage("WARN", "MISSING_STATUS", "Story is missing a **Status** line.", rel))
-
-        story_id = story_path.stem  # STORY-###
-        rank = _status_rank(status)
-
-        # If story is IMPLEMENTED or beyond, require an approved change plan.
-        if rank is not None and rank >= _STATE_RANK["IMPLEMENTED"]:
-            if not _has_vda_approved_change_plan(paths, story_id):
-                msgs.append(
-                    ValidationMessage(
-                        "ERROR",
-                        "MISSING_APPROVED_CHANGE_PLAN",
-                        "Story is IMPLEMENTED+ but no VDA-approved change plan exists (approvals.vda.approved: true).",
-                        f"plan/changes (story_id={story_id})",
-                    )
-                )
-
-        # If story claims VERIFIED/RELEASED, ensure evidence + peer review exist
-        if status and ("VERIFIED" in status or "RELEASED" in status):
-            evidence = paths.gados_root / "verification" / f"{story_id}-evidence.md"
-            review = paths.gados_root / "verification" / f"{story_id}-review.md"
-            log = paths.gados_root / "log" / f"{story_id}.log.yaml"
-            if not evidence.exists():
-                msgs.append(
-                    ValidationMessage(
-                        "ERROR",
-                        "MISSING_EVIDENCE",
-                        "Story marked VERIFIED/RELEASED but QA evidence package is missing.",
-                        str(evidence.relative_to(paths.gados_root)),
-                    )
-                )
-            if not review.exists():
-                msgs.append(
-                    ValidationMessage(
-                        "ERROR",
-                        "MISSING_PEER_REVIEW",
-                        "Story marked VERIFIED/RELEASED but peer review report is missing.",
-                        str(review.relative_to(paths.gados_root)),
-                    )
-                )
-            if not log.exists():
-                msgs.append(
-                    ValidationMessage(
-                        "ERROR",
-                        "MISSING_LOG",
-                        "Story marked VERIFIED/RELEASED but story audit log is missing.",
-                        str(log.relative_to(paths.gados_root)),
-                    )
-                )
-            else:
-                has_decision, actor_ok = _has_verification_decision(log_path=log, story_id=story_id)
-                if not has_decision:
-                    msgs.append(
-                        ValidationMessage(
-                            "ERROR",
-                            "MISSING_VERIFICATION_DECISION",
-                            "Story marked VERIFIED/RELEASED but log is missing VERIFICATION_DECISION(decision: VERIFIED).",
-                            str(log.relative_to(paths.gados_root)),
-                        )
-                    )
-                elif not actor_ok:
-                    msgs.append(
-                        ValidationMessage(
-                            "ERROR",
-                            "INVALID_VERIFICATION_ACTOR",
-                            "Verification decision must be made by actor_role=DeliveryGovernor (VDA).",
-                            str(log.relative_to(paths.gados_root)),
-                        )
-                    )
+    # Validate story file naming + basic fields. Everything a story check needs comes from the
+    # artifact index (parsed once per file change); the per-story findings are memoized on those inputs.
+    index = get_index(paths)
+    approved = {r.story_id for r in index.records("change") if r.story_id and r.facts.get("vda_approved")}
+    logs = {r.story_id: r for r in index.records("story_log")}
+    verification = {r.name: r for r in index.records("verification")}
+
+    key = paths.gados_root.resolve()
+    with _findings_lock:
+        previous = _story_findings.get(key, {})
+    current: dict[str, tuple[tuple, tuple[ValidationMessage, ...]]] = {}
+    for story in index.stories():
+        story_id = story.stem  # STORY-###
+        evidence = verification.get(f"{story_id}-evidence.md")
+        review = verification.get(f"{story_id}-review.md")
+        log = logs.get(story_id)
+        signature = (_sig(story), story_id in approved, _sig(evidence), _sig(review), _sig(log))
+        cached = previous.get(story.rel_path)
+        if cached is not None and cached[0] == signature:
+            found = cached[1]
+        else:
+            found = tuple(_validate_story(story, approved=story_id in approved, evidence=evidence, review=review, log=log))
+        current[story.rel_path] = (signature, found)
+        msgs.extend(found)
+    with _findings_lock:
+        _story_findings[key] = current
 
     # Basic naming checks for change plans (best-effort)
     changes_dir = paths.gados_root / "plan" / "changes"
     if changes_dir.exists():
-        for p in changes_dir.iterdir():
-            if not p.is_file():
-                continue
-            if p.name == "README.md":
+        with os.scandir(changes_dir) as it:
+            names = sorted(e.name for e in it if e.is_file())
+        for name in names:
+            if name == "README.md":
                 continue
-            if not CHANGE_NAME_RE.match(p.name):
+            if not CHANGE_NAME_RE.match(name):
                 msgs.append(
                     ValidationMessage(
                         "WARN",
                         "BAD_CHANGE_NAME",
                         "Change plan filename should be CHANGE-###-<suffix>.yaml",
-                        str(p.relative_to(paths.gados_root)),
+                        f"plan/changes/{name}",
                     )
                 )
 
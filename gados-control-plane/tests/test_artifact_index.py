@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import threading
+from pathlib import Path
+
+import pytest
+from gados_control_plane import artifact_index
+from gados_control_plane.artifact_index import ArtifactIndex
+from gados_control_plane.paths import ProjectPaths
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> ProjectPaths:
+    gados_root = tmp_path / "gados-project"
+    (gados_root / "plan" / "stories").mkdir(parents=True)
+    (gados_root / "plan" / "changes").mkdir(parents=True)
+    (gados_root / "strategy").mkdir(parents=True)
+    (gados_root / "plan" / "stories" / "STORY-001.md").write_text(
+        "# STORY-001: A\n\n**Epic**: `EPIC-000`\n**Status**: PLANNED\n", encoding="utf-8"
+    )
+    (gados_root / "plan" / "changes" / "CHANGE-001-A.yaml").write_text(
+        "story_id: STORY-001\napprovals:\n  vda:\n    approved: true\n", encoding="utf-8"
+    )
+    (gados_root / "strategy" / "EPIC-000-PLAN.md").write_text("# Epic\n", encoding="utf-8")
+    return ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _count_extracts(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    real = artifact_index._extract
+
+    def spy(kind, name, raw):
+        calls.append(name)
+        return real(kind, name, raw)
+
+    monkeypatch.setattr(artifact_index, "_extract", spy)
+    return calls
+
+
+def test_index_records_metadata_and_refreshes_incrementally(paths: ProjectPaths, monkeypatch):
+    calls = _count_extracts(monkeypatch)
+    idx = ArtifactIndex(paths, db_path=paths.repo_root / "idx.sqlite3")
+
+    (story,) = idx.stories()
+    assert (story.status, story.story_id, story.epic_id) == ("PLANNED", "STORY-001", "EPIC-000")
+    (change,) = idx.records("change")
+    assert change.story_id == "STORY-001" and change.facts["vda_approved"] is True
+    assert [e.epic_id for e in idx.epics()] == ["EPIC-000"]
+    assert len(calls) == 3
+
+    # Unchanged files are not re-read on a forced refresh.
+    idx.refresh(force=True)
+    assert len(calls) == 3
+
+    story_path = paths.gados_root / "plan" / "stories" / "STORY-001.md"
+    story_path.write_text("# STORY-001: A\n\n**Status**: IN_PROGRESS (started)\n", encoding="utf-8")
+    idx.invalidate()
+    assert idx.stories()[0].status == "IN_PROGRESS (started)"
+    assert calls[3:] == ["STORY-001.md"]
+
+    # New files show up without waiting for the TTL (directory mtime changed).
+    (paths.gados_root / "plan" / "stories" / "STORY-002.md").write_text("**Status**: PLANNED\n", encoding="utf-8")
+    assert [s.stem for s in idx.stories()] == ["STORY-001", "STORY-002"]
+
+
+def test_index_persists_across_restarts(paths: ProjectPaths, monkeypatch):
+    db = paths.repo_root / "idx.sqlite3"
+    first = ArtifactIndex(paths, db_path=db)
+    first.refresh(force=True)
+
+    calls = _count_extracts(monkeypatch)
+    second = ArtifactIndex(paths, db_path=db)
+    assert [s.status for s in second.stories()] == ["PLANNED"]
+    assert second.stories()[0].sha256 == first.stories()[0].sha256
+    assert calls == []
+
+
+def test_story_log_facts():
+    facts = artifact_index._story_log_facts(
+        b"events:\n"
+        b"  - {type: VERIFICATION_DECISION, decision: REJECTED, actor_role: DeliveryGovernor}\n"
+        b"  - {type: VERIFICATION_DECISION, decision: VERIFIED, actor_role: Developer}\n"
+    )
+    assert facts == {"verified": True, "verified_by_governor": False}
+    assert artifact_index._story_log_facts(b"events: [")["parse_error"] is True
+
+
+def test_parallel_parse_matches_inline(paths: ProjectPaths, monkeypatch):
+    changes = paths.gados_root / "plan" / "changes"
+    for i in range(2, 200):
+        approved = "true" if i % 3 else "false"
+        changes.joinpath(f"CHANGE-{i:03d}-A.yaml").write_text(
+            f"story_id: STORY-{i:03d}\napprovals:\n  vda:\n    approved: {approved}\n", encoding="utf-8"
+        )
+
+    monkeypatch.setenv("GADOS_PARSE_WORKERS", "1")
+    inline = ArtifactIndex(paths, persist=False).records("change")
+
+    # _extract_many falls back to inline parsing on pool errors, so check the pool really ran.
+    worker_pids: set[int] = set()
+
+    class SpyPool(concurrent.futures.ProcessPoolExecutor):
+        def map(self, *args, **kwargs):
+            results = list(super().map(*args, **kwargs))
+            worker_pids.update(self._processes or {})
+            return iter(results)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", SpyPool)
+    monkeypatch.setenv("GADOS_PARSE_WORKERS", "2")
+    monkeypatch.setattr(artifact_index, "_PARALLEL_MIN_FILES", 100)
+    pooled = ArtifactIndex(paths, persist=False).records("change")
+    assert pooled == inline
+    assert worker_pids and os.getpid() not in worker_pids
+    assert [r.facts["vda_approved"] for r in pooled[:4]] == [True, True, False, True]
+
+
+def test_queries_are_not_blocked_while_a_refresh_parses(paths: ProjectPaths, monkeypatch):
+    monkeypatch.setenv("GADOS_ARTIFACT_INDEX_TTL_MS", "600000")
+    idx = ArtifactIndex(paths, persist=False)
+    assert idx.stories()[0].status == "PLANNED"
+
+    parsing, release = threading.Event(), threading.Event()
+    real = artifact_index._extract_many
+
+    def slow_extract_many(items):
+        parsing.set()
+        assert release.wait(5)
+        return real(items)
+
+    monkeypatch.setattr(artifact_index, "_extract_many", slow_extract_many)
+    story_path = paths.gados_root / "plan" / "stories" / "STORY-001.md"
+    story_path.write_text("# STORY-001: A\n\n**Status**: DONE\n", encoding="utf-8")
+    idx.invalidate()
+    refresher = threading.Thread(target=idx.refresh)
+    refresher.start()
+    try:
+        assert parsing.wait(5)
+        # The previous snapshot is served while the refresh parses.
+        assert idx.stories()[0].status == "PLANNED"
+    finally:
+        release.set()
+        refresher.join(5)
+    assert idx.stories()[0].status == "DONE"
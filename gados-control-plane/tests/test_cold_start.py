@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CP_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = CP_ROOT.parent
+
+# Generous budgets (cumulative import µs from `-X importtime`); they catch a heavy eager import
+# sneaking back in, not machine-to-machine noise. Override via GADOS_IMPORT_BUDGET_MS.
+_BUDGET_MS = {
+    "gados_control_plane.main": 3000,
+    "gados_control_plane.validator": 750,
+    "gados_control_plane.beta_spend_guardrail": 1000,
+}
+
+# Modules that must only load on first use.
+_DEFERRED = ("langgraph", "opentelemetry.exporter", "opentelemetry.sdk", "jinja2")
+
+
+def _importtime(module: str, tmp_path: Path) -> tuple[int, set[str]]:
+    env = os.environ.copy()
+    env["OTEL_SDK_DISABLED"] = "true"
+    env["GADOS_RUNTIME_DIR"] = str(tmp_path / "runtime")
+    env["GADOS_AUDIT_DIR"] = str(tmp_path / "audit")
+    env["PYTHONPATH"] = os.pathsep.join([str(REPO_ROOT), str(CP_ROOT), env.get("PYTHONPATH", "")])
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    cumulative_us = 0
+    loaded: set[str] = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        name = parts[-1].strip()
+        loaded.add(name)
+        if name == module:
+            cumulative_us = int(parts[1].strip())
+    return cumulative_us, loaded
+
+
+@pytest.mark.parametrize("module", sorted(_BUDGET_MS))
+def test_import_stays_lazy_and_within_budget(module: str, tmp_path: Path):
+    cumulative_us, loaded = _importtime(module, tmp_path)
+
+    eager = sorted(m for m in loaded if m.startswith(_DEFERRED))
+    assert not eager, f"{module} eagerly imports {eager[:5]}"
+
+    budget_ms = int(os.getenv("GADOS_IMPORT_BUDGET_MS", "0")) or _BUDGET_MS[module]
+    assert cumulative_us / 1000 < budget_ms, f"{module} import took {cumulative_us / 1000:.0f}ms"
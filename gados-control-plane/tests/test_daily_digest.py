@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from gados_control_plane import agents_langgraph, reporting
+from gados_control_plane.paths import ProjectPaths
+
+
+@pytest.fixture
+def paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ProjectPaths:
+    monkeypatch.setenv("GADOS_ARTIFACT_INDEX_PERSIST", "0")
+    gados_root = tmp_path / "gados-project"
+    (gados_root / "plan" / "stories").mkdir(parents=True)
+    (gados_root / "plan" / "stories" / "STORY-001.md").write_text("**Status**: PLANNED\n", encoding="utf-8")
+    p = ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+    monkeypatch.setattr(agents_langgraph, "get_paths", lambda: p)
+    return p
+
+
+def test_digest_validates_once_and_reuses_compiled_graph(paths: ProjectPaths, monkeypatch):
+    calls: list[Path] = []
+    real = reporting.validate
+
+    def spy(p):
+        calls.append(p.gados_root)
+        return real(p)
+
+    monkeypatch.setattr(reporting, "validate", spy)
+    node_counts = agents_langgraph._node_seconds._values
+    before = {k: v[2] for k, v in node_counts.items()}
+
+    out = agents_langgraph.run_daily_digest()
+    assert calls == [paths.gados_root]
+    assert "snapshot" not in out
+    assert out["metrics"]["story_count"] == 1
+    assert out["metrics"]["validation_errors"] == sum(1 for v in out["validations"] if v["level"] == "ERROR")
+    assert (paths.gados_root / out["report_rel_path"]).exists()
+
+    graph = agents_langgraph._daily_digest_graph()
+    agents_langgraph.run_daily_digest()
+    assert agents_langgraph._daily_digest_graph() is graph
+    assert len(calls) == 2
+
+    ran = {dict(k)["node"]: v[2] - before.get(k, 0) for k, v in node_counts.items()}
+    assert ran == {
+        "StrategicBrain": 2,
+        "CoordinationAgentCollect": 2,
+        "QAAgent": 2,
+        "PeerReviewer": 2,
+        "DeliveryGovernor": 2,
+        "CoordinationAgentWrite": 2,
+    }
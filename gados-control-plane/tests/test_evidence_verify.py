@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from gados_control_plane import evidence_verify
+from gados_control_plane.evidence_verify import verify_all_runs, verify_run
+from gados_control_plane.paths import ProjectPaths
+
+from gados_common import hashing
+from gados_common.hashing import RUN_METADATA_FILES, hash_tree, merkle_root, write_sha256sums
+
+
+@pytest.fixture
+def paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ProjectPaths:
+    monkeypatch.setenv("GADOS_RUNTIME_DIR", str(tmp_path / "runtime"))
+    monkeypatch.setattr(evidence_verify, "_caches", {})
+    gados_root = tmp_path / "gados-project"
+    return ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _review_pack(paths: ProjectPaths, run_id: str) -> Path:
+    # Same write order as scripts/generate_review_pack.py: evidence, SHA256SUMS, run.json, marker.
+    out = paths.gados_root / "log" / "reports" / "review-runs" / run_id
+    (out / "Evidence").mkdir(parents=True)
+    (out / "Evidence" / "ruff.txt").write_text("All checks passed!\n", encoding="utf-8")
+    (out / "REVIEW_PACK.md").write_text(f"# {run_id}\n", encoding="utf-8")
+    digests = write_sha256sums(out, hash_tree(out, exclude=RUN_METADATA_FILES))
+    meta = {"run_id": run_id, "generated_at_utc": "2025-01-01T00:00:00+00:00", "evidence_merkle_root": merkle_root(digests)}
+    (out / "run.json").write_text(json.dumps(meta), encoding="utf-8")
+    (out / ".finalized").write_text("finalized\n", encoding="utf-8")
+    return out
+
+
+def test_detects_tampered_missing_and_unexpected_files(paths: ProjectPaths):
+    _review_pack(paths, "REVIEW-a-001")
+    bad = _review_pack(paths, "REVIEW-b-001")
+    assert verify_run(paths, "REVIEW-a-001").ok
+    assert verify_run(paths, "REVIEW-nope") is None
+
+    (bad / "REVIEW_PACK.md").write_text("# edited after the fact\n", encoding="utf-8")
+    (bad / "Evidence" / "ruff.txt").unlink()
+    (bad / "Evidence" / "extra.txt").write_text("?", encoding="utf-8")
+    results = {r.run_id: r for r in verify_all_runs(paths)}
+    assert results["REVIEW-a-001"].ok
+    b = results["REVIEW-b-001"]
+    assert (b.status, b.tampered, b.missing, b.unexpected, b.merkle_ok) == (
+        "TAMPERED",
+        ["REVIEW_PACK.md"],
+        ["Evidence/ruff.txt"],
+        ["Evidence/extra.txt"],
+        False,
+    )
+
+
+def test_unchanged_files_reuse_cached_digests(paths: ProjectPaths, monkeypatch: pytest.MonkeyPatch):
+    _review_pack(paths, "REVIEW-a-001")
+    assert verify_all_runs(paths)[0].files_checked == 2
+
+    reads: list[str] = []
+    real = hashing.sha256_file
+    monkeypatch.setattr(hashing, "sha256_file", lambda p: reads.append(Path(p).name) or real(p))
+    monkeypatch.setattr(evidence_verify, "_caches", {})  # a fresh process reloads the persisted digests
+    assert verify_all_runs(paths)[0].ok
+    assert reads == []
+    assert verify_all_runs(paths, full=True)[0].ok
+    assert sorted(reads) == ["REVIEW_PACK.md", "ruff.txt"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from gados_control_plane.metrics_history import compute_trends, load_history, record_metrics
+from gados_control_plane.paths import ProjectPaths
+from gados_control_plane.reporting import Metrics
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> ProjectPaths:
+    gados_root = tmp_path / "gados-project"
+    return ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _metrics(errors: int, verified: int, p50: float | None) -> Metrics:
+    return Metrics(
+        epic_count=1,
+        story_count=10,
+        stories_by_status={"PLANNED": 10 - verified, "VERIFIED": verified},
+        verified_story_count=verified,
+        avg_time_to_verified_hours=p50,
+        validation_errors=errors,
+        validation_warnings=0,
+        p50_time_to_verified_hours=p50,
+        p90_time_to_verified_hours=p50,
+    )
+
+
+def test_history_is_read_incrementally_and_trends_compare_week_over_week(paths: ProjectPaths):
+    assert load_history(paths) == []
+    record_metrics(paths, _metrics(5, 1, None), at="2025-01-01T00:00:00+00:00")
+    record_metrics(paths, _metrics(4, 2, 30.0), at="2025-01-03T00:00:00+00:00")
+    assert [r["validation_errors"] for r in load_history(paths)] == [5, 4]
+
+    # Appended rows (and partially written ones) are picked up on the next read.
+    history = paths.gados_root / "log" / "metrics" / "governance-metrics.jsonl"
+    record_metrics(paths, _metrics(1, 4, 12.0), at="2025-01-09T00:00:00Z", report_rel="log/reports/R.md")
+    with history.open("a", encoding="utf-8") as fh:
+        fh.write('{"at": "2025-01-10T00:00:00+00:00", "validation_err')
+    rows = load_history(paths)
+    assert [r["at"] for r in rows] == [
+        "2025-01-01T00:00:00+00:00",
+        "2025-01-03T00:00:00+00:00",
+        "2025-01-09T00:00:00Z",
+    ]
+    assert rows[-1]["report"] == "log/reports/R.md"
+
+    trends = compute_trends(rows, days=7)
+    assert trends["points"] == 3
+    assert trends["previous"]["at"] == "2025-01-01T00:00:00+00:00"
+    wow = trends["week_over_week"]
+    assert wow["validation_errors"] == {"current": 1, "previous": 5, "delta": -4}
+    assert wow["verified_story_count"]["delta"] == 3
+    assert wow["p50_time_to_verified_hours"] == {"current": 12.0, "previous": None, "delta": None}
+    assert [p["at"] for p in trends["series"]] == ["2025-01-03T00:00:00+00:00", "2025-01-09T00:00:00Z"]
+
+
+def test_trends_without_history():
+    assert compute_trends([]) == {"points": 0, "latest": None, "previous": None, "week_over_week": {}, "series": []}
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from gados_control_plane.profiler import SamplingProfiler
+
+
+def _busy_endpoint(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_samples_are_attributed_to_route_and_written_collapsed(tmp_path: Path):
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_endpoint, args=(stop,), daemon=True)
+    worker.start()
+    try:
+        profiler = SamplingProfiler(route_codes={_busy_endpoint.__code__: "/busy"})
+        for _ in range(20):
+            profiler.sample(skip_thread=threading.get_ident())
+        result = profiler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert result.samples == 20
+    assert result.route_totals().get("/busy", 0) == 20
+    busy = [s for s in result.stacks if s.startswith("/busy;")]
+    assert all("test_profiler:_busy_endpoint" in s for s in busy)
+
+    out = result.write_collapsed(tmp_path / "p.folded")
+    first = out.read_text(encoding="utf-8").splitlines()[0]
+    stack, count = first.rsplit(" ", 1)
+    assert stack.startswith("/busy;") and int(count) > 0
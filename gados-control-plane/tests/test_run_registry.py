@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from gados_control_plane import run_registry
+from gados_control_plane.paths import ProjectPaths
+from gados_control_plane.run_registry import RunRegistry
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> ProjectPaths:
+    gados_root = tmp_path / "gados-project"
+    return ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _write_run(paths: ProjectPaths, kind: str, run_id: str, **meta) -> Path:
+    run_dir = paths.gados_root / "log" / "reports" / f"{kind}-runs" / run_id
+    run_dir.mkdir(parents=True)
+    (run_dir / "run.json").write_text(json.dumps({"run_id": run_id, **meta}), encoding="utf-8")
+    return run_dir
+
+
+def test_register_filter_and_paginate(paths: ProjectPaths):
+    registry = RunRegistry(paths, persist=False)
+    for i in range(5):
+        run_dir = _write_run(
+            paths,
+            "beta",
+            f"BETA-{i:03d}",
+            scenario="daily-spend-guardrail",
+            recommendation="GO" if i % 2 else "NO_GO",
+            confidence="high" if i < 3 else "low",
+            generated_at_utc=f"2025-01-0{i + 1}T12:00:00+00:00",
+        )
+        registry.register(run_dir)
+    _write_run(paths, "review", "REVIEW-x-001", recommendation="GO", generated_at_utc="2025-01-10T00:00:00+00:00")
+
+    page = registry.query(limit=2)
+    assert page.total == 6
+    assert [r.run_id for r in page.runs] == ["REVIEW-x-001", "BETA-004"]
+    assert page.runs[0].scenario == "code-review-factory"
+    assert page.runs[0].detail_url == "/beta/runs/REVIEW-x-001"
+
+    assert [r.run_id for r in registry.query(limit=2, offset=4).runs] == ["BETA-001", "BETA-000"]
+    assert [r.run_id for r in registry.query(recommendation="GO", confidence="high").runs] == ["BETA-001"]
+    assert [r.run_id for r in registry.query(since="2025-01-02", until="2025-01-03").runs] == ["BETA-002", "BETA-001"]
+    assert registry.facets() == {
+        "scenario": ["code-review-factory", "daily-spend-guardrail"],
+        "recommendation": ["GO", "NO_GO"],
+        "confidence": ["high", "low"],
+    }
+
+
+def test_out_of_band_runs_and_rebuild(paths: ProjectPaths):
+    db = paths.repo_root / "runs.sqlite3"
+    registry = RunRegistry(paths, db_path=db)
+    assert registry.query().total == 0
+
+    # A run folder copied in by hand is picked up; an unfinished one (no run.json yet) on a later query.
+    _write_run(paths, "beta", "BETA-001", recommendation="GO", generated_at_utc="2025-01-01T00:00:00+00:00")
+    pending = paths.gados_root / "log" / "reports" / "beta-runs" / "BETA-002"
+    pending.mkdir()
+    assert [r.run_id for r in registry.query().runs] == ["BETA-001"]
+    (pending / "run.json").write_text(
+        json.dumps({"recommendation": "NO_GO", "generated_at_utc": "2025-01-02T00:00:00+00:00"}), encoding="utf-8"
+    )
+    assert [r.run_id for r in registry.query().runs] == ["BETA-002", "BETA-001"]
+
+    # Rows persist across restarts; deleted folders drop out.
+    (pending / "run.json").unlink()
+    pending.rmdir()
+    restarted = RunRegistry(paths, db_path=db)
+    assert [r.run_id for r in restarted.query().runs] == ["BETA-001"]
+
+    # run.json edits are only seen by a rebuild.
+    meta_path = paths.gados_root / "log" / "reports" / "beta-runs" / "BETA-001" / "run.json"
+    meta_path.write_text(json.dumps({"recommendation": "NO_GO", "generated_at_utc": "2025-01-01T00:00:00+00:00"}))
+    assert restarted.query().runs[0].recommendation == "GO"
+    assert restarted.rebuild() == 1
+    assert restarted.query().runs[0].recommendation == "NO_GO"
+
+
+def test_failed_rebuild_keeps_previous_rows(paths: ProjectPaths, monkeypatch: pytest.MonkeyPatch):
+    registry = RunRegistry(paths, persist=False)
+    _write_run(paths, "beta", "BETA-001", recommendation="GO", generated_at_utc="2025-01-01T00:00:00+00:00")
+    assert registry.query().total == 1
+
+    def unreadable(run_dir: Path):
+        raise PermissionError(run_dir)
+
+    monkeypatch.setattr(run_registry, "_read_run_json", unreadable)
+    with pytest.raises(PermissionError):
+        registry.rebuild()
+    assert [r.run_id for r in registry.query(sync=False).runs] == ["BETA-001"]
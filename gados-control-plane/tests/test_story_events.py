@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from gados_control_plane import artifact_index, story_events
+from gados_control_plane.artifacts import append_text
+from gados_control_plane.paths import ProjectPaths
+from gados_control_plane.story_events import StoryEventIndex
+
+_LOG_001 = """story_id: STORY-001
+events:
+  - {at: "2025-01-01T00:00:00Z", type: STATUS_CHANGED, to: IN_PROGRESS, actor_role: Developer, actor: dev-1}
+  - {at: "2025-01-01T06:00:00Z", type: STATUS_CHANGED, to: IMPLEMENTED, actor_role: Developer, actor: dev-1}
+  - {at: "2025-01-01T10:00:00Z", type: VERIFICATION_DECISION, decision: VERIFIED, actor_role: DeliveryGovernor, actor: vda}
+"""
+_LOG_002 = """story_id: STORY-002
+events:
+  - {at: "2025-01-02T00:00:00+00:00", type: STATUS_CHANGED, to: IN_PROGRESS, actor_role: Developer, actor: dev-2}
+"""
+
+
+@pytest.fixture
+def paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ProjectPaths:
+    monkeypatch.setenv("GADOS_ARTIFACT_INDEX_PERSIST", "0")
+    gados_root = tmp_path / "gados-project"
+    (gados_root / "log").mkdir(parents=True)
+    (gados_root / "log" / "STORY-001.log.yaml").write_text(_LOG_001, encoding="utf-8")
+    (gados_root / "log" / "STORY-002.log.yaml").write_text(_LOG_002, encoding="utf-8")
+    return ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _count_parses(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    real = story_events._parse_log
+
+    def spy(raw):
+        calls.append(len(raw))
+        return real(raw)
+
+    monkeypatch.setattr(story_events, "_parse_log", spy)
+    return calls
+
+
+def test_cycle_times_and_throughput(paths: ProjectPaths):
+    events = StoryEventIndex(paths, persist=False)
+    assert events.time_to_verified_hours() == {"STORY-001": 10.0}
+    assert events.time_to_verified_hours(["STORY-002"]) == {}
+    assert events.status_durations() == {"IN_PROGRESS": {"count": 1, "p50_hours": 6.0, "p90_hours": 6.0}}
+    assert events.actor_throughput() == [
+        {"actor_role": "Developer", "actor": "dev-1", "events": 2, "verifications": 0, "stories": 1},
+        {"actor_role": "DeliveryGovernor", "actor": "vda", "events": 1, "verifications": 1, "stories": 1},
+        {"actor_role": "Developer", "actor": "dev-2", "events": 1, "verifications": 0, "stories": 1},
+    ]
+
+
+def test_appended_events_are_indexed_without_reparsing(paths: ProjectPaths, monkeypatch):
+    db = paths.repo_root / "events.sqlite3"
+    events = StoryEventIndex(paths, db_path=db)
+    events.sync()
+    calls = _count_parses(monkeypatch)
+
+    entry = (
+        '\n  - at: "2025-01-03T00:00:00+00:00"\n    actor_role: "DeliveryGovernor"\n    actor: "vda"\n'
+        '    type: "VERIFICATION_DECISION"\n    decision: "VERIFIED"\n'
+    )
+    append_text(paths, "log/STORY-002.log.yaml", entry)
+    event = {
+        "at": "2025-01-03T00:00:00+00:00",
+        "actor_role": "DeliveryGovernor",
+        "actor": "vda",
+        "type": "VERIFICATION_DECISION",
+        "decision": "VERIFIED",
+    }
+    events.record_append("STORY-002", event, appended_bytes=len(entry.encode("utf-8")))
+    assert events.time_to_verified_hours() == {"STORY-001": 10.0, "STORY-002": 24.0}
+    assert calls == []
+
+    # A restart reuses persisted rows; an out-of-band edit re-parses only that log.
+    (paths.gados_root / "log" / "STORY-001.log.yaml").write_text(_LOG_001.replace("10:00", "12:00"), encoding="utf-8")
+    artifact_index.invalidate(paths)
+    restarted = StoryEventIndex(paths, db_path=db)
+    assert restarted.time_to_verified_hours() == {"STORY-001": 12.0, "STORY-002": 24.0}
+    assert len(calls) == 1
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from gados_control_plane import artifact_index, validator
+from gados_control_plane.paths import ProjectPaths
+
+
+@pytest.fixture
+def paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ProjectPaths:
+    monkeypatch.setenv("GADOS_ARTIFACT_INDEX_PERSIST", "0")
+    gados_root = tmp_path / "gados-project"
+    for rel in ("plan/stories", "plan/changes", "verification", "log"):
+        (gados_root / rel).mkdir(parents=True)
+    stories = gados_root / "plan" / "stories"
+    stories.joinpath("STORY-001.md").write_text("**Status**: IMPLEMENTED\n", encoding="utf-8")
+    stories.joinpath("STORY-002.md").write_text("**Status**: IMPLEMENTED\n", encoding="utf-8")
+    stories.joinpath("STORY-003.md").write_text("**Status**: VERIFIED\n", encoding="utf-8")
+    (gados_root / "plan" / "changes" / "CHANGE-001-A.yaml").write_text(
+        "story_id: STORY-001\napprovals:\n  vda:\n    approved: true\n", encoding="utf-8"
+    )
+    (gados_root / "plan" / "changes" / "CHANGE-003-A.yaml").write_text(
+        "story_id: STORY-003\napprovals:\n  vda:\n    approved: true\n", encoding="utf-8"
+    )
+    (gados_root / "plan" / "changes" / "notes.txt").write_text("x\n", encoding="utf-8")
+    (gados_root / "verification" / "STORY-003-evidence.md").write_text("ok\n", encoding="utf-8")
+    (gados_root / "log" / "STORY-003.log.yaml").write_text(
+        "events:\n  - type: VERIFICATION_DECISION\n    decision: VERIFIED\n    actor_role: Developer\n",
+        encoding="utf-8",
+    )
+    return ProjectPaths(repo_root=tmp_path, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _story_findings(paths: ProjectPaths) -> set[tuple[str, str | None]]:
+    return {(m.code, m.artifact) for m in validator.validate(paths) if m.code != "MISSING_ARTIFACT"}
+
+
+def test_validate_story_checks(paths: ProjectPaths):
+    assert _story_findings(paths) == {
+        ("MISSING_APPROVED_CHANGE_PLAN", "plan/changes (story_id=STORY-002)"),
+        ("MISSING_PEER_REVIEW", "verification/STORY-003-review.md"),
+        ("INVALID_VERIFICATION_ACTOR", "log/STORY-003.log.yaml"),
+        ("BAD_CHANGE_NAME", "plan/changes/notes.txt"),
+    }
+
+
+def test_validate_only_rechecks_stories_whose_inputs_changed(paths: ProjectPaths, monkeypatch):
+    checked: list[str] = []
+    real = validator._validate_story
+
+    def spy(story, **kwargs):
+        checked.append(story.stem)
+        return real(story, **kwargs)
+
+    monkeypatch.setattr(validator, "_validate_story", spy)
+    first = _story_findings(paths)
+    assert sorted(checked) == ["STORY-001", "STORY-002", "STORY-003"]
+
+    checked.clear()
+    assert _story_findings(paths) == first
+    assert checked == []
+
+    (paths.gados_root / "verification" / "STORY-003-review.md").write_text("ok\n", encoding="utf-8")
+    (paths.gados_root / "log" / "STORY-003.log.yaml").write_text(
+        "events:\n  - type: VERIFICATION_DECISION\n    decision: VERIFIED\n    actor_role: DeliveryGovernor\n",
+        encoding="utf-8",
+    )
+    (paths.gados_root / "plan" / "changes" / "CHANGE-002-A.yaml").write_text(
+        "story_id: STORY-002\napprovals:\n  vda:\n    approved: true\n", encoding="utf-8"
+    )
+    artifact_index.invalidate(paths)
+    assert _story_findings(paths) == {("BAD_CHANGE_NAME", "plan/changes/notes.txt")}
+    assert sorted(checked) == ["STORY-002", "STORY-003"]
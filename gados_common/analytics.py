@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import hashlib
+import hmac
 import logging
 import os
+import random
 import re
-from collections.abc import Mapping
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
 from opentelemetry import metrics, trace
 
+from .env import env_int
+from .observability import request_id_ctx
+
 _log = logging.getLogger(__name__)
 _meter = metrics.get_meter("analytics")
 _events_counter = _meter.create_counter(
@@ -21,6 +32,16 @@ _redactions_counter = _meter.create_counter(
     description="Count of redacted analytics fields/values",
     unit="1",
 )
+_dropped_counter = _meter.create_counter(
+    name="analytics_events_dropped_total",
+    description="Count of analytics events dropped by the pipeline (reason: buffer_full or shutdown)",
+    unit="1",
+)
+_sampled_out_counter = _meter.create_counter(
+    name="analytics_events_sampled_out_total",
+    description="Count of analytics events discarded by head-based sampling",
+    unit="1",
+)
 
 
 _DEFAULT_ALLOWLIST = {
@@ -43,8 +64,17 @@ _SUSPECT_KEY_RE = re.compile(
     r"(pass(word)?|secret|token|api[_-]?key|auth(orization)?|cookie|session|jwt|bearer|credit|card|pan|cvv|ssn|email|phone)",
     re.IGNORECASE,
 )
-_JWT_RE = re.compile(r"^[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}$")
-_STRIPE_SK_RE = re.compile(r"\bsk_(live|test)_[A-Za-z0-9]{10,}\b", re.IGNORECASE)
+
+# Single-pass value detector: JWT-shaped values OR Stripe secret keys.
+_SECRET_VALUE_RE = re.compile(
+    r"^[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}$|\bsk_(?:live|test)_[A-Za-z0-9]{10,}\b",
+    re.IGNORECASE,
+)
+
+# Per-key decisions made by a compiled scrub policy.
+_KEY_DROP = 0
+_KEY_REDACT = 1
+_KEY_KEEP = 2
 
 
 def _allowlist() -> set[str]:
@@ -57,9 +87,57 @@ def _allowlist() -> set[str]:
     return set(items)
 
 
+class UserIdHasher:
+    """
+    Stable, irreversible user identifier for correlation without PII leakage.
+
+    - Plain mode: sha256(user_id).
+    - Keyed mode (GADOS_ANALYTICS_USER_ID_HMAC_KEY set): HMAC-SHA256(key, user_id), so hashes
+      cannot be reversed by hashing a dictionary of candidate ids.
+    Results are memoized in a bounded LRU since the same users repeat across events.
+    """
+
+    def __init__(self, key: bytes | None = None, *, cache_size: int = 10000) -> None:
+        self.keyed = bool(key)
+        self._key = key or b""
+        self.hash = functools.lru_cache(maxsize=max(1, cache_size))(self._compute)
+
+    def _compute(self, user_id: str) -> str:
+        data = user_id.encode("utf-8")
+        if self.keyed:
+            return hmac.new(self._key, data, hashlib.sha256).hexdigest()[:16]
+        return hashlib.sha256(data).hexdigest()[:16]
+
+    def cache_info(self) -> Any:
+        return self.hash.cache_info()
+
+
+_hasher: UserIdHasher | None = None
+_hasher_raw: str | None = None
+_hasher_lock = threading.Lock()
+
+
+def get_user_id_hasher() -> UserIdHasher:
+    """
+    Return the hasher for the current GADOS_ANALYTICS_USER_ID_HMAC_KEY (rebuilt only when it changes).
+    """
+    global _hasher, _hasher_raw
+    raw = os.getenv("GADOS_ANALYTICS_USER_ID_HMAC_KEY", "")
+    hasher = _hasher
+    if hasher is not None and raw == _hasher_raw:
+        return hasher
+    with _hasher_lock:
+        if _hasher is None or raw != _hasher_raw:
+            _hasher = UserIdHasher(
+                raw.encode("utf-8") if raw else None,
+                cache_size=env_int("GADOS_ANALYTICS_USER_ID_CACHE_SIZE", 10000),
+            )
+            _hasher_raw = raw
+        return _hasher
+
+
 def _hash_user_id(user_id: str) -> str:
-    # Stable, irreversible identifier for correlation without PII leakage.
-    return hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
+    return get_user_id_hasher().hash(user_id)
 
 
 def _is_jsonish_primitive(v: Any) -> bool:
@@ -85,44 +163,375 @@ def _looks_like_secret_value(v: Any) -> bool:
     s = v.strip()
     if not s:
         return False
-    if _JWT_RE.match(s):
-        return True
-    if _STRIPE_SK_RE.search(s):
-        return True
     # Very long opaque blobs are likely tokens/keys.
-    return len(s) >= 80
+    if len(s) >= 80:
+        return True
+    return _SECRET_VALUE_RE.search(s) is not None
+
+
+class ScrubPolicy:
+    """
+    Compiled property scrubbing policy: the allowlist is parsed once and per-key decisions
+    (drop / redact / keep) are memoized in a bounded LRU, since property keys repeat across events.
+    """
+
+    def __init__(self, allowlist: Iterable[str], *, key_cache_size: int = 4096) -> None:
+        self.allowlist = frozenset(allowlist)
+        self._decide = functools.lru_cache(maxsize=max(1, key_cache_size))(self._classify_key)
+
+    def _classify_key(self, key: str) -> int:
+        if key not in self.allowlist:
+            return _KEY_DROP
+        if _SUSPECT_KEY_RE.search(key) is not None:
+            return _KEY_REDACT
+        return _KEY_KEEP
+
+    def scrub(self, props: Mapping[str, Any]) -> tuple[dict[str, Any], int]:
+        safe: dict[str, Any] = {}
+        redactions = 0
+        decide = self._decide
+        for k, v in (props or {}).items():
+            key = k if type(k) is str else str(k)
+            action = decide(key)
+            if action == _KEY_DROP:
+                redactions += 1
+                continue
+            if action == _KEY_REDACT:
+                safe[key] = "<redacted>"
+                redactions += 1
+                continue
+
+            # Value-based redaction
+            vv = _coerce_jsonish(v)
+            if _looks_like_secret_value(vv):
+                safe[key] = "<redacted>"
+                redactions += 1
+                continue
+
+            safe[key] = vv
+        return safe, redactions
+
+    def cache_info(self) -> Any:
+        return self._decide.cache_info()
+
+
+_policy: ScrubPolicy | None = None
+_policy_raw: str | None = None
+_policy_lock = threading.Lock()
+
+
+def get_scrub_policy() -> ScrubPolicy:
+    """
+    Return the compiled policy for the current GADOS_ANALYTICS_PROPERTIES_ALLOWLIST.
+
+    Hot-reloadable: the policy is rebuilt only when the env value changes (a string compare per call).
+    """
+    global _policy, _policy_raw
+    raw = os.getenv("GADOS_ANALYTICS_PROPERTIES_ALLOWLIST", "")
+    policy = _policy
+    if policy is not None and raw == _policy_raw:
+        return policy
+    with _policy_lock:
+        if _policy is None or raw != _policy_raw:
+            _policy = ScrubPolicy(_allowlist(), key_cache_size=env_int("GADOS_ANALYTICS_KEY_CACHE_SIZE", 4096))
+            _policy_raw = raw
+        return _policy
+
+
+def reload_scrub_policy() -> ScrubPolicy:
+    """
+    Force a rebuild of the compiled policy (e.g. after changing the allowlist defaults).
+    """
+    global _policy
+    with _policy_lock:
+        _policy = None
+    return get_scrub_policy()
 
 
 def _scrub_properties(props: Mapping[str, Any]) -> tuple[dict[str, Any], int]:
     """
     Allowlist keys and redact likely secrets/PII. Returns (safe_props, redactions_count).
     """
-    allow = _allowlist()
-    safe: dict[str, Any] = {}
-    redactions = 0
+    return get_scrub_policy().scrub(props)
 
-    for k, v in (props or {}).items():
-        key = str(k)
-        if key not in allow:
-            redactions += 1
-            continue
 
-        # Key-based redaction
-        if _SUSPECT_KEY_RE.search(key) is not None:
-            safe[key] = "<redacted>"
-            redactions += 1
-            continue
+@dataclass(frozen=True)
+class _PendingEvent:
+    event: str
+    user_id: str | None
+    properties: Mapping[str, Any]
+    # Span/request that were current when the event was tracked (the span may have ended by export time).
+    span: Any = None
+    request_id: str | None = None
+
+
+def _mark_span(span: Any, events: Iterable[_PendingEvent]) -> None:
+    """
+    Add an `analytics.event` span event (event name only) per accepted event while the originating
+    span is still recording; by export time the request span has usually ended. Cheap by design:
+    properties are scrubbed and user ids hashed on the export path, whose log lines carry the span's
+    trace correlation ids.
+    """
+    if span is None or not span.is_recording():
+        return
+    for evt in events:
+        span.add_event("analytics.event", attributes={"event_name": evt.event})
 
-        # Value-based redaction
-        vv = _coerce_jsonish(v)
-        if _looks_like_secret_value(vv):
-            safe[key] = "<redacted>"
-            redactions += 1
+
+def _export_batch(events: list[_PendingEvent]) -> None:
+    """
+    Scrub and emit a batch of events: counters (aggregated per event name) and one structured
+    log line per event, emitted under the originating span. Span events are added at track time
+    (`_mark_span`).
+    """
+    counts: Counter[str] = Counter()
+    redacted: Counter[str] = Counter()
+
+    for evt in events:
+        safe_props, redactions = _scrub_properties(evt.properties)
+        counts[evt.event] += 1
+        if redactions:
+            redacted[evt.event] += redactions
+
+        user_id_hash = _hash_user_id(evt.user_id) if evt.user_id else None
+        attrs_log: dict[str, Any] = {"event_name": evt.event}
+        if evt.request_id:
+            attrs_log["request_id"] = evt.request_id
+        if user_id_hash:
+            attrs_log["user_id_hash"] = user_id_hash
+        if safe_props:
+            attrs_log["properties"] = safe_props
+
+        span = evt.span
+        if span is not None:
+            # Re-enter the originating span so the log line keeps its trace correlation ids,
+            # even when exported from the pipeline worker thread.
+            with trace.use_span(span, end_on_exit=False):
+                _log.info("analytics_event", extra=attrs_log)
+        else:
+            _log.info("analytics_event", extra=attrs_log)
+
+    for name, n in counts.items():
+        _events_counter.add(n, attributes={"event_name": name})
+    for name, n in redacted.items():
+        _redactions_counter.add(n, attributes={"event_name": name})
+
+
+def _sample_rates() -> dict[str, float]:
+    """
+    Parse GADOS_ANALYTICS_SAMPLE_RATES, e.g. "page_view=0.1,search=0.5,*=1.0".
+    `*` sets the default rate for event names that are not listed.
+    """
+    raw = os.getenv("GADOS_ANALYTICS_SAMPLE_RATES", "").strip()
+    rates: dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            rate = float(value)
+        except ValueError:
             continue
+        rates[name.strip()] = 0.0 if rate < 0.0 else (1.0 if rate > 1.0 else rate)
+    return rates
+
+
+class AnalyticsPipeline:
+    """
+    Buffered analytics export:
+    - `submit` applies head-based sampling per event name and enqueues into a bounded ring buffer
+      (O(1), no scrubbing/hashing/logging on the caller's thread; `track_event` adds at most a
+      name-only span event for accepted events)
+    - a background worker drains the buffer in batches and exports them via `_export_batch`
+    - when the buffer is full, new events are dropped and counted (`analytics_events_dropped_total`,
+      reason="buffer_full"); events submitted after `shutdown` are dropped with reason="shutdown"
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int = 10000,
+        batch_size: int = 200,
+        flush_interval_s: float = 0.5,
+        sample_rates: Mapping[str, float] | None = None,
+    ) -> None:
+        self._capacity = max(1, int(capacity))
+        self._batch_size = max(1, int(batch_size))
+        self._flush_interval_s = max(0.01, float(flush_interval_s))
+        rates = dict(sample_rates or {})
+        self._default_rate = rates.pop("*", 1.0)
+        self._rates = rates
+        self._rng = random.Random()
+
+        self._buf: deque[_PendingEvent] = deque()
+        self._cond = threading.Condition()
+        self._pending = 0  # enqueued but not yet exported
+        self._flush_now = False
+        self._stopping = False
+        self._stats = {"enqueued": 0, "exported": 0, "dropped": 0, "sampled_out": 0, "failed": 0}
+
+        self._worker = threading.Thread(target=self._run, name="analytics-pipeline", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def from_env(cls) -> AnalyticsPipeline:
+        return cls(
+            capacity=env_int("GADOS_ANALYTICS_BUFFER_SIZE", 10000),
+            batch_size=env_int("GADOS_ANALYTICS_BATCH_SIZE", 200),
+            flush_interval_s=env_int("GADOS_ANALYTICS_FLUSH_INTERVAL_MS", 500) / 1000.0,
+            sample_rates=_sample_rates(),
+        )
+
+    def _sampled_in(self, event: str) -> bool:
+        rate = self._rates.get(event, self._default_rate)
+        if rate >= 1.0:
+            return True
+        return rate > 0.0 and self._rng.random() < rate
+
+    def submit(self, evt: _PendingEvent) -> bool:
+        """
+        Enqueue one event. Returns False if it was sampled out or dropped.
+        """
+        return self.submit_many([evt]) == 1
+
+    def submit_many(self, events: Iterable[_PendingEvent]) -> int:
+        """
+        Enqueue events under a single lock acquisition. Returns the number accepted into the buffer.
+        """
+        return len(self._enqueue(events))
+
+    def _enqueue(self, events: Iterable[_PendingEvent]) -> list[_PendingEvent]:
+        # Sample, then buffer; returns the accepted events.
+        accepted: list[_PendingEvent] = []
+        sampled_out: Counter[str] = Counter()
+        dropped: Counter[str] = Counter()
+        drop_reason = "buffer_full"
+        kept = []
+        for evt in events:
+            if self._sampled_in(evt.event):
+                kept.append(evt)
+            else:
+                sampled_out[evt.event] += 1
+
+        if kept:
+            with self._cond:
+                if self._stopping:
+                    drop_reason = "shutdown"
+                    for evt in kept:
+                        dropped[evt.event] += 1
+                else:
+                    for evt in kept:
+                        if len(self._buf) >= self._capacity:
+                            dropped[evt.event] += 1
+                            continue
+                        self._buf.append(evt)
+                        accepted.append(evt)
+                    self._pending += len(accepted)
+                    self._stats["enqueued"] += len(accepted)
+                    if len(self._buf) >= self._batch_size:
+                        self._cond.notify()
+                self._stats["dropped"] += sum(dropped.values())
+                self._stats["sampled_out"] += sum(sampled_out.values())
+        elif sampled_out:
+            with self._cond:
+                self._stats["sampled_out"] += sum(sampled_out.values())
+
+        for name, n in dropped.items():
+            _dropped_counter.add(n, attributes={"event_name": name, "reason": drop_reason})
+        for name, n in sampled_out.items():
+            _sampled_out_counter.add(n, attributes={"event_name": name})
+        return accepted
 
-        safe[key] = vv
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._buf) < self._batch_size and not (self._stopping or self._flush_now):
+                    self._cond.wait(self._flush_interval_s)
+                n = min(len(self._buf), self._batch_size)
+                batch = [self._buf.popleft() for _ in range(n)]
+                if not self._buf:
+                    self._flush_now = False
+                done = self._stopping and not self._buf
 
-    return safe, redactions
+            if batch:
+                failed = False
+                try:
+                    _export_batch(batch)
+                except Exception:
+                    failed = True
+                    _log.exception("analytics_export_failed", extra={"batch_size": len(batch)})
+                with self._cond:
+                    self._pending -= len(batch)
+                    self._stats["failed" if failed else "exported"] += len(batch)
+                    self._cond.notify_all()
+
+            if done:
+                return
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        Export everything buffered so far. Returns False if the timeout elapsed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_now = True
+            self._cond.notify_all()
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop accepting events, drain the buffer and stop the worker.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            out = dict(self._stats)
+            out["buffered"] = len(self._buf)
+        return out
+
+
+_pipeline: AnalyticsPipeline | None = None
+_pipeline_lock = threading.Lock()
+
+
+def start_pipeline(pipeline: AnalyticsPipeline | None = None) -> AnalyticsPipeline:
+    """
+    Route `track_event` through a buffered pipeline (configured from env unless one is given).
+    Idempotent: returns the running pipeline if one is already started.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = pipeline or AnalyticsPipeline.from_env()
+        return _pipeline
+
+
+def shutdown_pipeline(timeout: float | None = 5.0) -> None:
+    """
+    Flush and stop the running pipeline; `track_event` falls back to synchronous export.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        p, _pipeline = _pipeline, None
+    if p is not None:
+        p.shutdown(timeout)
+
+
+def get_pipeline() -> AnalyticsPipeline | None:
+    return _pipeline
+
+
+# Flush-on-exit for processes that never call shutdown_pipeline explicitly.
+atexit.register(shutdown_pipeline)
 
 
 def track_event(
@@ -134,33 +543,51 @@ def track_event(
     """
     Minimal analytics wrapper:
     - increments a counter (event_name label)
-    - adds a span event if a span is active
+    - adds a span event (event name only) if a span is recording
     - emits a structured log line
-    """
-    safe_props, redactions = _scrub_properties(properties or {})
-    attrs_log: dict[str, Any] = {"event_name": event}
-    if user_id:
-        attrs_log["user_id_hash"] = _hash_user_id(user_id)
-    if safe_props:
-        attrs_log["properties"] = safe_props
 
-    _events_counter.add(1, attributes={"event_name": event})
-    if redactions:
-        _redactions_counter.add(redactions, attributes={"event_name": event})
+    When a pipeline is started (`start_pipeline`), the event is only sampled and enqueued here (plus
+    the span event if it was accepted); scrubbing and export happen in batches on the pipeline worker.
+    """
+    evt = _PendingEvent(
+        event=event,
+        user_id=user_id,
+        properties=dict(properties or {}),
+        span=trace.get_current_span(),
+        request_id=request_id_ctx.get(),
+    )
+    pipeline = _pipeline
+    if pipeline is None:
+        _mark_span(evt.span, [evt])
+        _export_batch([evt])
+        return
+    _mark_span(evt.span, pipeline._enqueue([evt]))
 
-    span = trace.get_current_span()
-    if span is not None:
-        # OTel span attributes must be primitives (or lists of primitives).
-        attrs_otel: dict[str, Any] = {"event_name": event}
-        if user_id:
-            attrs_otel["user_id_hash"] = _hash_user_id(user_id)
-        for i, (k, v) in enumerate(safe_props.items()):
-            if i >= 25:
-                break
-            attrs_otel[f"prop.{k}"] = v if _is_jsonish_primitive(v) else str(v)
-        if redactions:
-            attrs_otel["redactions"] = int(redactions)
-        span.add_event("analytics.event", attributes=attrs_otel)
 
-    _log.info("analytics_event", extra=attrs_log)
+def track_events(events: Iterable[Mapping[str, Any]]) -> int:
+    """
+    Track a batch of events shaped like the /track payload: {"event", "user_id"?, "properties"?}.
 
+    With a running pipeline the whole batch is sampled and enqueued under one lock acquisition.
+    Returns the number of events accepted for export.
+    """
+    span = trace.get_current_span()
+    rid = request_id_ctx.get()
+    batch = [
+        _PendingEvent(
+            event=str(e["event"]),
+            user_id=e.get("user_id"),
+            properties=dict(e.get("properties") or {}),
+            span=span,
+            request_id=rid,
+        )
+        for e in events
+    ]
+    pipeline = _pipeline
+    if pipeline is None:
+        _mark_span(span, batch)
+        _export_batch(batch)
+        return len(batch)
+    accepted = pipeline._enqueue(batch)
+    _mark_span(span, accepted)
+    return len(accepted)
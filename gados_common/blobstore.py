@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import stat
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from .hashing import SUMS_FILENAME, hash_files, list_files, sha256_file
+
+# Relative to gados-project/: shared by every run folder in the project.
+BLOBS_REL = "log/blobs"
+
+
+def link_or_copy(src: str | Path, dest: str | Path) -> bool:
+    """
+    Hardlink `src` to `dest` (replacing `dest`), falling back to a copy across filesystems or where
+    links are unsupported. Returns True when a link was made.
+    """
+    dest = Path(dest)
+    if dest.exists() and os.path.samefile(src, dest):
+        # Already linked (rename() between two links to one file would be a no-op leaving `tmp` behind).
+        return True
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(src, tmp)
+        linked = True
+    except OSError as e:
+        if e.errno not in {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES}:
+            raise
+        shutil.copyfile(src, tmp)
+        linked = False
+    os.replace(tmp, dest)
+    return linked
+
+
+class BlobStore:
+    """
+    Content-addressed store: `<root>/sha256/<aa>/<digest>`, one read-only file per distinct content.
+
+    Run folders keep ordinary files (so SHA256SUMS.txt, the verifier and plain `sha256sum -c` are
+    unaffected) that are hardlinks to the blobs: identical evidence across runs occupies disk once and
+    is linked instead of copied. Blobs are made read-only; as run folders are immutable, nothing should
+    rewrite a linked file in place.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        return self.root / "sha256" / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def _add(self, src: Path, digest: str) -> Path:
+        blob = self.path(digest)
+        if blob.exists():
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            try:
+                os.link(src, tmp)
+            except OSError:
+                shutil.copyfile(src, tmp)
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            # Atomic publish; a concurrent writer of the same content produces identical bytes.
+            os.replace(tmp, blob)
+        finally:
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+        return blob
+
+    def put_file(self, src: str | Path, *, digest: str | None = None) -> str:
+        """
+        Add a file's content to the store (no-op when already present); returns its sha256.
+        """
+        src = Path(src)
+        digest = digest or sha256_file(src)
+        self._add(src, digest)
+        return digest
+
+    def materialize(self, digest: str, dest: str | Path) -> bool:
+        """
+        Place blob `digest` at `dest` (hardlink, or copy when linking is impossible).
+        """
+        return link_or_copy(self.path(digest), dest)
+
+    def store_file(self, src: str | Path, dest: str | Path) -> str:
+        """
+        Copy replacement: put `src` in the store and link it at `dest`; returns the sha256.
+        """
+        digest = self.put_file(src)
+        self.materialize(digest, dest)
+        return digest
+
+    def ingest_tree(
+        self, root: str | Path, *, exclude: Iterable[str] = (SUMS_FILENAME,), workers: int | None = None
+    ) -> dict[str, str]:
+        """
+        Move every file below `root` into the store and leave a hardlink in its place.
+
+        Returns {relative path: sha256} in path order (the input for SHA256SUMS.txt / the Merkle root),
+        so a pack is hashed exactly once.
+        """
+        root = Path(root)
+        rels = list_files(root, exclude=exclude)
+        digests = dict(zip(rels, hash_files((root / r for r in rels), workers=workers), strict=True))
+        for rel, digest in digests.items():
+            src = root / rel
+            if os.path.samefile(src, self._add(src, digest)):
+                continue
+            self.materialize(digest, src)
+        return digests
+
+
+def project_blob_store(repo_root: str | Path, out_dir: str | Path) -> BlobStore | None:
+    """
+    The project's store when `out_dir` lives under `<repo_root>/gados-project/` (run folders kept in the
+    repo); None for packs written elsewhere (CI staging dirs), which stay self-contained.
+    """
+    gados_root = Path(repo_root).resolve() / "gados-project"
+    if not Path(out_dir).resolve().is_relative_to(gados_root):
+        return None
+    return BlobStore(gados_root / BLOBS_REL)
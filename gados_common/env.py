@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "").strip().lower()
+    return default if not raw else raw in {"1", "true", "yes"}
+
+
+def env_workers(name: str) -> int:
+    """
+    Thread/process pool size from `name`; unset, invalid or non-positive values give min(8, CPUs).
+    """
+    n = env_int(name, 0)
+    return n if n > 0 else min(8, os.cpu_count() or 1)
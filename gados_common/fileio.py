@@ -3,6 +3,13 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from .metrics import registry
+
+_fsync_seconds = registry.histogram(
+    "gados_fsync_duration_seconds",
+    "Latency of fsync in append_text_locked",
+)
+
 
 def append_text_locked(path: str | Path, text: str, *, encoding: str = "utf-8") -> None:
     """
@@ -26,7 +33,8 @@ def append_text_locked(path: str | Path, text: str, *, encoding: str = "utf-8")
             pass
 
         os.write(fd, text.encode(encoding))
-        os.fsync(fd)
+        with _fsync_seconds.time():
+            os.fsync(fd)
     finally:
         try:
             os.close(fd)
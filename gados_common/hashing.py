@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .env import env_workers
+
+# Evidence packs list their files in this manifest (`<sha256>  <relative path>` per line).
+SUMS_FILENAME = "SHA256SUMS.txt"
+
+# Run metadata/markers written alongside the evidence; excluded from the run's Merkle root (run.json
+# records the root, so it cannot be part of it).
+RUN_METADATA_FILES = ("run.json", ".finalized", SUMS_FILENAME)
+
+_CHUNK_SIZE = 1 << 20
+
+
+def sha256_file(path: str | Path) -> str:
+    """
+    Stream a file through SHA-256 in fixed-size chunks (memory use does not grow with file size).
+    """
+    h = hashlib.sha256()
+    buf = bytearray(_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as fh:
+        while n := fh.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+class DigestCache:
+    """
+    SHA-256 digests keyed by path and validated against (mtime_ns, size): a file whose stat
+    signature is unchanged is not read again. Meant for repeated verification passes over
+    immutable evidence (`evidence_verify`); writers hash without a cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[int, int, str]] = {}
+
+    def get(self, path: str, mtime_ns: int, size: int) -> str | None:
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime_ns and entry[1] == size:
+            return entry[2]
+        return None
+
+    def put(self, path: str, mtime_ns: int, size: int, digest: str) -> None:
+        with self._lock:
+            self._entries[path] = (mtime_ns, size, digest)
+
+    def digest(self, path: str | Path) -> str:
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        cached = self.get(key, st.st_mtime_ns, st.st_size)
+        if cached is not None:
+            return cached
+        digest = sha256_file(key)
+        self.put(key, st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+
+def hash_files(
+    paths: Iterable[str | Path], *, cache: DigestCache | None = None, workers: int | None = None
+) -> list[str]:
+    """
+    Digests for `paths` (same order), hashed on a thread pool; hashlib releases the GIL while
+    hashing, so large files hash in parallel. Worker count: `GADOS_HASH_WORKERS` (default min(8, cpu)).
+
+    Without `cache` every file is read. Writers recording digests (SHA256SUMS, Merkle roots) should
+    not pass one: an (mtime_ns, size) match can hide a same-size rewrite within the mtime granularity.
+    """
+    digest = cache.digest if cache is not None else sha256_file
+    items = list(paths)
+    workers = min(workers or env_workers("GADOS_HASH_WORKERS"), len(items))
+    if workers <= 1:
+        return [digest(p) for p in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gados-hash") as pool:
+        return list(pool.map(digest, items))
+
+
+def list_files(root: str | Path, *, exclude: Iterable[str] = (SUMS_FILENAME,)) -> list[str]:
+    """
+    Sorted POSIX paths (relative to `root`) of all files below `root`, skipping names in `exclude`.
+    """
+    skip = set(exclude)
+    out: list[str] = []
+    top = os.fspath(root)
+    for dirpath, _dirnames, filenames in os.walk(top):
+        rel_dir = os.path.relpath(dirpath, top).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        out.extend(prefix + name for name in filenames if name not in skip)
+    return sorted(out)
+
+
+def hash_tree(
+    root: str | Path,
+    *,
+    exclude: Iterable[str] = (SUMS_FILENAME,),
+    cache: DigestCache | None = None,
+    workers: int | None = None,
+) -> dict[str, str]:
+    """
+    {relative path: sha256} for every file below `root`, in path order.
+    """
+    root = Path(root)
+    rels = list_files(root, exclude=exclude)
+    return dict(zip(rels, hash_files((root / r for r in rels), cache=cache, workers=workers), strict=True))
+
+
+def merkle_root(digests: Mapping[str, str]) -> str:
+    """
+    Merkle root over {relative path: sha256}, taken in path order.
+
+    Leaves are sha256(0x00 || path || 0x00 || digest), inner nodes sha256(0x01 || left || right); an odd
+    node at the end of a level is promoted unchanged. Binding the path into each leaf means renames
+    change the root as well as content edits. The root of an empty set is sha256(b"").
+    """
+    level = [
+        hashlib.sha256(b"\x00" + rel.encode("utf-8") + b"\x00" + bytes.fromhex(digests[rel])).digest()
+        for rel in sorted(digests)
+    ]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        nxt = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0].hex()
+
+
+def format_sums(digests: Mapping[str, str]) -> str:
+    return "\n".join(f"{digest}  {rel}" for rel, digest in digests.items()) + "\n"
+
+
+def parse_sums(text: str) -> dict[str, str]:
+    """
+    Inverse of `format_sums` (also accepts `sha256sum` binary-mode lines, `<digest> *<path>`).
+    """
+    out: dict[str, str] = {}
+    for line in text.splitlines():
+        digest, sep, rel = line.partition(" ")
+        if not sep or len(digest) != 64:
+            continue
+        out[rel[1:] if rel[:1] in {" ", "*"} else rel] = digest.lower()
+    return out
+
+
+def write_sha256sums(root: str | Path, digests: Mapping[str, str] | None = None) -> dict[str, str]:
+    """
+    Write `SHA256SUMS.txt` for `root` (hashing the tree unless `digests` is given); returns the digests.
+    """
+    root = Path(root)
+    if digests is None:
+        digests = hash_tree(root)
+    (root / SUMS_FILENAME).write_text(format_sums(digests), encoding="utf-8")
+    return dict(digests)
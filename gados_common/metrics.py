@@ -0,0 +1,223 @@
+"""
+In-process metrics registry with OTel mirroring.
+
+Every instrument records into a local, lock-protected store (rendered as Prometheus text for a
+`/metrics` endpoint that works even with OTEL_SDK_DISABLED=1) and into the matching OTel instrument
+(exported via OTLP when `setup_observability` configured a meter provider).
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from opentelemetry import metrics
+
+# Request/IO latency buckets (seconds). Also applied to OTel histograms via a View in setup_observability.
+LATENCY_BUCKETS_S: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_meter = metrics.get_meter("gados")
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(attributes: Mapping[str, Any] | None) -> _LabelKey:
+    if not attributes:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in attributes.items()))
+
+
+def _fmt_labels(key: _LabelKey, extra: tuple[str, str] | None = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    esc = (v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _k, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _v), v in zip(items, esc, strict=True)) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, unit: str = "1") -> None:
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: dict[_LabelKey, float] = {}
+        self._otel = _meter.create_counter(name=name, description=description, unit=unit)
+
+    def add(self, value: float = 1, attributes: Mapping[str, Any] | None = None) -> None:
+        key = _label_key(attributes)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+        self._otel.add(value, attributes=dict(attributes) if attributes else None)
+
+    def _render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Gauge:
+    """
+    Up/down gauge (e.g. in-flight requests). Mirrored to an OTel UpDownCounter.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, unit: str = "1") -> None:
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: dict[_LabelKey, float] = {}
+        self._otel = _meter.create_up_down_counter(name=name, description=description, unit=unit)
+
+    def add(self, delta: float, attributes: Mapping[str, Any] | None = None) -> None:
+        key = _label_key(attributes)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + delta
+        self._otel.add(delta, attributes=dict(attributes) if attributes else None)
+
+    def _render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        unit: str = "s",
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_S,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label key -> (per-bucket counts incl. +Inf, sum, count)
+        self._values: dict[_LabelKey, tuple[list[int], float, int]] = {}
+        self._otel = _meter.create_histogram(name=name, description=description, unit=unit)
+
+    def record(self, value: float, attributes: Mapping[str, Any] | None = None) -> None:
+        key = _label_key(attributes)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, n = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            counts[idx] += 1
+            self._values[key] = (counts, total + value, n + 1)
+        self._otel.record(value, attributes=dict(attributes) if attributes else None)
+
+    @contextmanager
+    def time(self, attributes: Mapping[str, Any] | None = None) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - t0, attributes)
+
+    def _render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._values.items())
+        lines: list[str] = []
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += c
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, ('le', _fmt_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {_fmt_value(total)}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = cls(name, *args, **kwargs)
+                self._metrics[name] = m
+            elif not isinstance(m, cls):
+                raise ValueError(f"Metric {name!r} already registered as {m.kind}")
+            return m
+
+    def counter(self, name: str, description: str, unit: str = "1") -> Counter:
+        return self._get_or_create(Counter, name, description, unit)
+
+    def gauge(self, name: str, description: str, unit: str = "1") -> Gauge:
+        return self._get_or_create(Gauge, name, description, unit)
+
+    def histogram(
+        self, name: str, description: str, unit: str = "s", buckets: tuple[float, ...] = LATENCY_BUCKETS_S
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, unit, buckets)
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus text exposition format (0.0.4).
+        """
+        with self._lock:
+            ms = sorted(self._metrics.items())
+        lines: list[str] = []
+        for name, m in ms:
+            lines.append(f"# HELP {name} {m.description}")
+            lines.append(f"# TYPE {name} {m.kind}")
+            lines.extend(m._render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def timed(histogram: Histogram, **attributes: Any) -> Callable[[_F], _F]:
+    """
+    Decorator: record the wall-clock duration of each call into `histogram`.
+    """
+
+    def deco(fn: _F) -> _F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with histogram.time(attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
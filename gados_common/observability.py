@@ -1,51 +1,197 @@
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
 from contextvars import ContextVar
+from datetime import date
+from datetime import time as dt_time
+from typing import Any
 
 from opentelemetry import metrics, trace
-from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON, ParentBased, TraceIdRatioBased
-from pythonjsonlogger import json
+
+from .metrics import LATENCY_BUCKETS_S, registry
+
+try:  # optional accelerator for JSON log encoding
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
 
 request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
 
+# Correlation ids of breached beta scenarios; the tail sampler always keeps their traces.
+_BREACHED_CORRELATIONS_MAX = 4096
+_breached_correlations: OrderedDict[str, None] = OrderedDict()
+_breached_lock = threading.Lock()
+
+
+def mark_breached_correlation(correlation_id: str) -> None:
+    """
+    Flag a scenario run as breached so the tail sampler keeps every trace carrying its
+    `gados.correlation_id`. Cheap no-op bookkeeping when tail sampling is off.
+    """
+    with _breached_lock:
+        _breached_correlations[correlation_id] = None
+        _breached_correlations.move_to_end(correlation_id)
+        while len(_breached_correlations) > _BREACHED_CORRELATIONS_MAX:
+            _breached_correlations.popitem(last=False)
+
+
+def is_breached_correlation(correlation_id: str) -> bool:
+    with _breached_lock:
+        return correlation_id in _breached_correlations
+
 
 class _RequestIdFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
-        record.request_id = request_id_ctx.get()  # type: ignore[attr-defined]
+        # Keep an explicitly passed request_id (e.g. records emitted off the request thread).
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_ctx.get()  # type: ignore[attr-defined]
         return True
 
 
+# Standard LogRecord attributes; everything else on a record is an `extra=` field.
+_RESERVED_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+_LEADING_FIELDS = ("request_id", "otelTraceID", "otelSpanID", "otelServiceName")
+
+_log_records_dropped = registry.counter(
+    "gados_log_records_dropped_total",
+    "Log records dropped because the async log queue was full, by level",
+)
+_log_listener: logging.handlers.QueueListener | None = None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date | dt_time):  # includes datetime
+        return value.isoformat()
+    return str(value)
+
+
+_stdlib_encoder = json.JSONEncoder(default=_json_default)
+
+
+def _encode_json(payload: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return _stdlib_encoder.encode(payload)
+
+
+class _FastJsonFormatter(logging.Formatter):
+    """
+    One-line JSON records: asctime, levelname, name, message, request id / trace fields, then any
+    `extra=` fields. Avoids per-record format-string parsing; timestamps are cached per second.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._ts_second = -1
+        self._ts_prefix = ""
+
+    def _asctime(self, created: float) -> str:
+        second = int(created)
+        if second != self._ts_second:
+            self._ts_prefix = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(created))
+            self._ts_second = second
+        return f"{self._ts_prefix},{int((created - second) * 1000):03d}"
+
+    def format(self, record: logging.LogRecord) -> str:  # noqa: A003
+        d = record.__dict__
+        payload: dict[str, Any] = {
+            "asctime": self._asctime(record.created),
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        for key in _LEADING_FIELDS:
+            payload[key] = d.get(key)
+        for key, value in d.items():
+            if key not in _RESERVED_ATTRS and key not in payload:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return _encode_json(payload)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking hand-off to the listener thread: when the bounded queue is full the record is
+    dropped (and counted) instead of stalling the request path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args/exc_info now (they may reference mutable or frame-bound objects); keep
+        # `extra=` attributes intact for the JSON formatter on the listener side.
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _log_records_dropped.add(1, {"level": record.levelname})
+
+
+def _stop_log_listener() -> None:
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()  # drains queued records
+        _log_listener = None
+
+
 def setup_logging(service_name: str) -> None:
+    """
+    JSON logs to stderr. With GADOS_LOG_ASYNC=1 (default) records are handed to a bounded queue
+    (GADOS_LOG_QUEUE_SIZE) and formatted/written by a listener thread.
+    """
+    global _log_listener
     root = logging.getLogger()
     root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
-    handler = logging.StreamHandler()
-    formatter = json.JsonFormatter(
-        "%(asctime)s %(levelname)s %(name)s %(message)s "
-        "%(request_id)s %(otelTraceID)s %(otelSpanID)s %(otelServiceName)s"
-    )
-    handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(_FastJsonFormatter())
+
+    _stop_log_listener()
+    if os.getenv("GADOS_LOG_ASYNC", "1").strip().lower() in {"1", "true", "yes"}:
+        try:
+            queue_size = int(os.getenv("GADOS_LOG_QUEUE_SIZE", "10000"))
+        except Exception:
+            queue_size = 10000
+        handler: logging.Handler = _DroppingQueueHandler(queue.Queue(maxsize=max(1, queue_size)))
+        _log_listener = logging.handlers.QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _log_listener.start()
+    else:
+        handler = stream_handler
+    # request_id_ctx must be read on the logging thread, before the queue hand-off.
     handler.addFilter(_RequestIdFilter())
 
     root.handlers = [handler]
 
+    from opentelemetry.instrumentation.logging import LoggingInstrumentor
+
     # Adds otelTraceID/otelSpanID fields to LogRecord when a span is active.
     LoggingInstrumentor().instrument(set_logging_format=False)
 
     logging.getLogger(__name__).info("logging_configured", extra={"service_name": service_name})
 
 
+atexit.register(_stop_log_listener)
+
+
 def setup_observability(service_name: str, otlp_endpoint: str | None = None) -> None:
     """
     Configure OTel traces + metrics exports to an OTLP/HTTP endpoint (default: env).
@@ -57,6 +203,23 @@ def setup_observability(service_name: str, otlp_endpoint: str | None = None) ->
         logging.getLogger(__name__).info("otel_sdk_disabled")
         return
 
+    # SDK + OTLP exporters are imported only when export is enabled (keeps import/cold start cheap).
+    from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.metrics import Histogram as SdkHistogram
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import (
+        ALWAYS_OFF,
+        ALWAYS_ON,
+        ParentBased,
+        TraceIdRatioBased,
+    )
+
     endpoint = otlp_endpoint or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
 
     resource = Resource.create(
@@ -103,18 +266,33 @@ def setup_observability(service_name: str, otlp_endpoint: str | None = None) ->
             sampler = ParentBased(TraceIdRatioBased(ratio))
 
     tracer_provider = TracerProvider(resource=resource, sampler=sampler)
-    tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces")))
+    span_processor = BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces"))
+    # Tail sampling (GADOS_TRACE_TAIL_SAMPLING=1): decide per trace after it finishes, keeping slow,
+    # failed and breached traces. Leave head sampling at 1.0 so the tail sampler sees everything.
+    if os.getenv("GADOS_TRACE_TAIL_SAMPLING", "0").strip().lower() in {"1", "true", "yes"}:
+        from .tail_sampling import TailSamplingSpanProcessor
+
+        span_processor = TailSamplingSpanProcessor.from_env(span_processor)
+    tracer_provider.add_span_processor(span_processor)
     trace.set_tracer_provider(tracer_provider)
 
     metric_reader = PeriodicExportingMetricReader(
         OTLPMetricExporter(endpoint=f"{endpoint}/v1/metrics"),
         export_interval_millis=int(os.getenv("OTEL_METRIC_EXPORT_INTERVAL_MS", "5000")),
     )
-    metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+    # Latency histograms (`*_duration_seconds`) use explicit buckets tuned for request/IO latency.
+    latency_view = View(
+        instrument_type=SdkHistogram,
+        instrument_name="*_duration_seconds",
+        aggregation=ExplicitBucketHistogramAggregation(boundaries=LATENCY_BUCKETS_S),
+    )
+    metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader], views=[latency_view]))
 
     setup_logging(service_name=service_name)
 
 
 def instrument_fastapi(app) -> None:
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
     FastAPIInstrumentor().instrument_app(app)
 
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import fnmatch
+import mmap
+import os
+import re
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .env import env_workers
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A deterministic IVA check: any match of `patterns` in a file in scope is a finding.
+
+    Patterns are Python regexes applied per file with re.MULTILINE (`^`/`$` match at line ends);
+    `ignore_case` adds re.IGNORECASE. `paths` are fnmatch globs on repo-relative paths (empty: all files).
+    """
+
+    id: str
+    title: str
+    severity: str  # Critical/High/Medium/Low
+    patterns: tuple[str, ...]
+    mapping: tuple[str, ...] = ()
+    impact: str = ""
+    recommendation: str = ""
+    paths: tuple[str, ...] = ()
+    ignore_case: bool = False
+    playbook: str = ""
+
+    def applies_to(self, rel: str) -> bool:
+        return not self.paths or any(fnmatch.fnmatch(rel, glob) for glob in self.paths)
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    rule: Rule
+    path: str  # repo-relative
+    lines: tuple[int, ...]  # 1-based, ascending
+    pattern: str  # first pattern that matched
+
+
+def _as_tuple(value: Any) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(str(v) for v in value)
+
+
+def load_rules(path: str | Path) -> list[Rule]:
+    """
+    Rules from a YAML policy (`rules:` list, see gados-project/playbooks/iva_rules.yaml). Returns []
+    when the file or PyYAML is missing; invalid patterns raise re.error naming the rule.
+    """
+    try:
+        import yaml
+    except Exception:
+        return []
+    p = Path(path)
+    if not p.exists():
+        return []
+    data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    rules: list[Rule] = []
+    for raw in (data.get("rules") if isinstance(data, dict) else None) or []:
+        if not isinstance(raw, dict) or not raw.get("id") or not raw.get("patterns"):
+            continue
+        rule = Rule(
+            id=str(raw["id"]),
+            title=str(raw.get("title") or raw["id"]),
+            severity=str(raw.get("severity") or "Medium"),
+            patterns=_as_tuple(raw["patterns"]),
+            mapping=_as_tuple(raw.get("mapping")),
+            impact=str(raw.get("impact") or ""),
+            recommendation=str(raw.get("recommendation") or ""),
+            paths=_as_tuple(raw.get("paths")),
+            ignore_case=bool(raw.get("ignore_case", False)),
+            playbook=str(raw.get("playbook") or ""),
+        )
+        for pat in rule.patterns:
+            try:
+                re.compile(pat)
+            except re.error as e:
+                raise re.error(f"rule {rule.id}: invalid pattern {pat!r}: {e}") from None
+        rules.append(rule)
+    return rules
+
+
+def _required_literal(pattern: str) -> bytes | None:
+    """
+    The longest literal run every match of `pattern` must contain (top-level literals only), or None
+    when there is none worth gating on. Uses the stdlib regex parser; unknown constructs give None,
+    as do global inline flags such as `(?i)` (the case-sensitive byte search would miss matches).
+    """
+    try:
+        from re import _parser  # Python 3.11+
+
+        parsed = _parser.parse(pattern)
+    except Exception:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    items = list(parsed)
+    best, run = "", ""
+    for op, av in items:
+        if op == _parser.LITERAL:
+            run += chr(av)
+            continue
+        best, run = max(best, run, key=len), ""
+    best = max(best, run, key=len)
+    return best.encode("utf-8") if len(best) >= 3 else None
+
+
+# Literals are first probed by this many leading bytes: rules sharing a prefix (e.g. `secret_`) cost
+# one substring search per file instead of one each.
+_GATE_PREFIX = 4
+
+
+class RuleEngine:
+    """
+    Evaluates every rule in one pass over each file: the file is mapped once, and a literal prefilter
+    (the required literal of each pattern, probed with C substring search and grouped by prefix) decides
+    which patterns can match at all; only those regexes run. Case-insensitive patterns and patterns
+    without a required literal always run.
+
+    (A single combined alternation was measured 2-3x slower than this with CPython's backtracking `re`,
+    which has no multi-pattern automaton; source files rarely contain most rules' literals.)
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = list(rules)
+        # (rule index, pattern source, compiled bytes regex, required literal or None) per pattern
+        self._patterns: list[tuple[int, str, re.Pattern[bytes], bytes | None]] = []
+        for i, rule in enumerate(self.rules):
+            flags = re.MULTILINE | (re.IGNORECASE if rule.ignore_case else 0)
+            for pat in rule.patterns:
+                literal = None if rule.ignore_case else _required_literal(pat)
+                self._patterns.append((i, pat, re.compile(pat.encode("utf-8"), flags), literal))
+        self._gates: dict[bytes, set[bytes]] = {}
+        for *_rest, literal in self._patterns:
+            if literal is not None:
+                self._gates.setdefault(literal[:_GATE_PREFIX], set()).add(literal)
+
+    def _present_literals(self, buf: Any) -> set[bytes]:
+        present: set[bytes] = set()
+        for prefix, literals in self._gates.items():
+            if buf.find(prefix) == -1:
+                continue
+            present.update(lit for lit in literals if lit == prefix or buf.find(lit) != -1)
+        return present
+
+    def scan_buffer(self, buf: Any, rel: str) -> list[RuleHit]:
+        """
+        Hits in one bytes-like buffer (bytes or mmap), in rule order.
+        """
+        active = {i for i, rule in enumerate(self.rules) if rule.applies_to(rel)}
+        if not active:
+            return []
+        present = self._present_literals(buf)
+        positions: dict[int, list[tuple[int, str]]] = {}
+        for i, pat, rx, literal in self._patterns:
+            if i not in active or (literal is not None and literal not in present):
+                continue
+            positions.setdefault(i, []).extend((m.start(), pat) for m in rx.finditer(buf))
+        hits: list[RuleHit] = []
+        for i in sorted(positions):
+            found = sorted(positions[i])
+            if not found:
+                continue
+            lines: list[int] = []
+            line, counted_to = 1, 0
+            for pos, _pat in found:
+                line += buf[counted_to:pos].count(b"\n")  # slicing an mmap copies only this span
+                counted_to = pos
+                if not lines or lines[-1] != line:
+                    lines.append(line)
+            hits.append(RuleHit(self.rules[i], rel, tuple(lines), found[0][1]))
+        return hits
+
+    def scan_file(self, root: str | Path, rel: str) -> list[RuleHit]:
+        """
+        Hits in `root/rel`, read through a read-only mmap (no copy into Python memory). Unreadable,
+        missing and empty files have no hits.
+        """
+        if not any(rule.applies_to(rel) for rule in self.rules):
+            return []
+        try:
+            with open(os.path.join(root, rel), "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return self.scan_buffer(buf, rel)
+        except (OSError, ValueError):
+            return []
+
+    def scan(self, root: str | Path, rels: Iterable[str], *, workers: int | None = None) -> list[RuleHit]:
+        """
+        Hits for `rels` (in that order) under `root`, scanned on a thread pool (GADOS_RULE_WORKERS,
+        default min(8, CPUs)); threads overlap file I/O and page faults.
+        """
+        items = list(dict.fromkeys(rels))
+        workers = min(workers or env_workers("GADOS_RULE_WORKERS"), len(items))
+        if workers <= 1:
+            per_file = [self.scan_file(root, rel) for rel in items]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gados-rules") as pool:
+                per_file = list(pool.map(lambda rel: self.scan_file(root, rel), items))
+        return [hit for hits in per_file for hit in hits]
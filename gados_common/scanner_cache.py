@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .hashing import hash_files
+
+_KEY_VERSION = 1
+
+# pip-audit results depend on the advisory database as well as on requirements.txt.
+_DEFAULT_ADVISORY_TTL_S = 24 * 3600.0
+
+
+@dataclass(frozen=True)
+class ScanInputs:
+    """
+    Files a scanner reads, relative to the repo root: `paths` are files or directories (walked
+    recursively); `suffixes` keeps only matching files; `exclude_re` is searched in repo-relative POSIX
+    paths (matching directories are not descended into), mirroring the scanner's own excludes.
+    """
+
+    paths: tuple[str, ...]
+    suffixes: tuple[str, ...] = ()
+    exclude_re: str | None = None
+
+    def files(self, repo_root: str | Path) -> list[str]:
+        top = os.fspath(repo_root)
+        exclude = re.compile(self.exclude_re) if self.exclude_re else None
+
+        def keep(rel: str) -> bool:
+            if self.suffixes and not rel.endswith(self.suffixes):
+                return False
+            return not (exclude and exclude.search(rel))
+
+        out: set[str] = set()
+        for entry in self.paths:
+            start = os.path.normpath(os.path.join(top, entry))
+            if os.path.isfile(start):
+                rel = os.path.relpath(start, top).replace(os.sep, "/")
+                if keep(rel):
+                    out.add(rel)
+                continue
+            for dirpath, dirnames, filenames in os.walk(start):
+                rel_dir = os.path.relpath(dirpath, top).replace(os.sep, "/")
+                prefix = "" if rel_dir == "." else rel_dir + "/"
+                if exclude:
+                    dirnames[:] = [d for d in dirnames if not exclude.search(prefix + d)]
+                for name in filenames:
+                    rel = prefix + name
+                    if keep(rel) and os.path.isfile(os.path.join(dirpath, name)):
+                        out.add(rel)
+        return sorted(out)
+
+    def digests(self, repo_root: str | Path) -> dict[str, str]:
+        """
+        {repo-relative path: sha256} of the input files (hashed on the shared thread pool).
+        """
+        rels = self.files(repo_root)
+        root = Path(repo_root)
+        return dict(zip(rels, hash_files(root / r for r in rels), strict=True))
+
+
+def _tool_prefix(cmd: Sequence[str]) -> list[str]:
+    # `python -m <module> ...` -> `python -m <module>`; `<binary> ...` -> `<binary>`.
+    return list(cmd[:3]) if list(cmd[:2]) == ["python", "-m"] else list(cmd[:1])
+
+
+@functools.cache
+def _version_of(prefix: tuple[str, ...]) -> str:
+    try:
+        p = subprocess.run([*prefix, "--version"], check=False, capture_output=True, text=True, timeout=60)  # noqa: S603
+    except Exception as e:
+        return f"unavailable: {type(e).__name__}"
+    return ((p.stdout or "") + (p.stderr or "")).strip() or f"exit {p.returncode}"
+
+
+def tool_version(cmd: Sequence[str]) -> str:
+    """
+    `<tool> --version` output for the tool a command runs (memoized per process).
+    """
+    return _version_of(tuple(_tool_prefix(cmd)))
+
+
+def advisory_ttl_s() -> float:
+    """
+    Max age of reusable pip-audit results: GADOS_SCANNER_CACHE_ADVISORY_TTL_S (default 86400; 0 = never
+    reuse), since new advisories change the outcome without any input changing.
+    """
+    try:
+        return float(os.getenv("GADOS_SCANNER_CACHE_ADVISORY_TTL_S", "").strip() or _DEFAULT_ADVISORY_TTL_S)
+    except ValueError:
+        return _DEFAULT_ADVISORY_TTL_S
+
+
+def _is_json_report(path: Path) -> bool:
+    with path.open("rb") as fh:
+        head = fh.read(4096).lstrip()
+    return head[:1] in {b"{", b"["}
+
+
+class ScannerCache:
+    """
+    Scanner results keyed by sha256(command, tool version, Python version, input file digests).
+
+    An entry is `<root>/<aa>/<key>.json` (exit code, creation time) plus `<key>.out` (the report).
+    Only JSON reports are stored: a scanner that failed before producing its report (missing module,
+    network error) writes plain-text errors, and those must not be replayed. Entries are written
+    atomically, so concurrent runs sharing a cache directory are safe; the directory can be deleted
+    at any time.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    @staticmethod
+    def key(cmd: Sequence[str], *, version: str, inputs: Mapping[str, str]) -> str:
+        payload = {
+            "v": _KEY_VERSION,
+            "cmd": list(cmd),
+            "version": version,
+            "python": platform.python_version(),
+            "inputs": dict(sorted(inputs.items())),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> tuple[Path, Path]:
+        base = self.root / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".out")
+
+    def _tmp(self, path: Path) -> Path:
+        return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _publish_meta(self, meta_path: Path, exit_code: int) -> None:
+        # Written last: the metadata file is what makes an entry visible.
+        tmp = self._tmp(meta_path)
+        tmp.write_text(json.dumps({"exit_code": int(exit_code), "created_at": time.time()}) + "\n", encoding="utf-8")
+        os.replace(tmp, meta_path)
+
+    def get(self, key: str, dest: str | Path, *, max_age_s: float | None = None) -> int | None:
+        """
+        On a hit, copy the cached report to `dest` and return the cached exit code; None on a miss
+        (absent, unreadable, or older than `max_age_s`).
+        """
+        meta_path, out_path = self._entry(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if max_age_s is not None and time.time() - float(meta["created_at"]) > max_age_s:
+                return None
+            exit_code = int(meta["exit_code"])
+            dest = Path(dest)
+            tmp = self._tmp(dest)
+            shutil.copyfile(out_path, tmp)
+            os.replace(tmp, dest)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return exit_code
+
+    def put(self, key: str, src: str | Path, exit_code: int) -> bool:
+        """
+        Store the report at `src` with its exit code; returns False when it is not a JSON report.
+        """
+        src = Path(src)
+        try:
+            if not _is_json_report(src):
+                return False
+            meta_path, out_path = self._entry(key)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._tmp(out_path)
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, out_path)
+            self._publish_meta(meta_path, exit_code)
+        except OSError:
+            return False
+        return True
+
+    def get_json(self, key: str) -> Any | None:
+        """
+        A JSON value stored with `put_json` (e.g. one file's slice of a scanner report); None on a miss.
+        """
+        meta_path, out_path = self._entry(key)
+        if not meta_path.exists():
+            return None
+        try:
+            return json.loads(out_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put_json(self, key: str, value: Any) -> None:
+        meta_path, out_path = self._entry(key)
+        try:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._tmp(out_path)
+            tmp.write_text(json.dumps(value, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, out_path)
+            self._publish_meta(meta_path, 0)
+        except OSError:
+            pass
+
+
+def default_scanner_cache(repo_root: str | Path) -> ScannerCache | None:
+    """
+    The shared cache: GADOS_SCANNER_CACHE_DIR, else `<GADOS_RUNTIME_DIR or repo/.gados-runtime>/scanner-cache`.
+    None when disabled with GADOS_SCANNER_CACHE=0.
+    """
+    if os.getenv("GADOS_SCANNER_CACHE", "1").strip().lower() in {"0", "false", "no"}:
+        return None
+    explicit = os.getenv("GADOS_SCANNER_CACHE_DIR", "").strip()
+    if explicit:
+        return ScannerCache(explicit)
+    runtime_dir = os.getenv("GADOS_RUNTIME_DIR", "").strip()
+    return ScannerCache(Path(runtime_dir or Path(repo_root) / ".gados-runtime") / "scanner-cache")
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+
+def _lock(fd: int) -> None:
+    try:
+        import fcntl  # POSIX-only
+
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    except Exception:
+        # Non-POSIX or locking failure: proceed without a lock (best-effort, as append_text_locked).
+        pass
+
+
+# Scopes remembered per counter file (most recently used kept). Older scopes fall back to
+# `seed`/`taken`/`claim`, which still yield unique numbers; only the O(1) fast path is lost.
+_MAX_SCOPES = 256
+
+
+def _parse(raw: bytes) -> dict[str, int]:
+    scopes: dict[str, int] = {}
+    for line in raw.decode("utf-8", errors="replace").splitlines():
+        scope, sep, value = line.rpartition("\t")
+        if sep and value.isdigit():
+            scopes.pop(scope, None)
+            scopes[scope] = int(value)
+    return scopes
+
+
+def next_in_sequence(
+    counter_path: str | Path,
+    *,
+    scope: str = "",
+    taken: Callable[[int], bool] | None = None,
+    seed: Callable[[], int] | None = None,
+    claim: Callable[[int], bool] | None = None,
+) -> int:
+    """
+    Allocate the next number of a named sequence, atomically across threads and processes.
+
+    The counter file holds one `<scope>\t<last>` line per scope and is rewritten under `fcntl.flock`,
+    so allocation is constant time regardless of how many ids were handed out, and interleaved scopes
+    (e.g. several run keys) each keep their own count. A new scope starts at 1.
+
+    - `seed()` returns the last number already in use when the counter has no value for `scope` yet
+      (bootstrap for directories populated before the counter existed).
+    - `taken(n)` is checked under the lock and skips numbers claimed by other means (legacy writers,
+      a lost counter file); it is called once per allocation in the common case.
+    - `claim(n)` also runs under the lock and should create the resource for `n` (e.g. `mkdir`),
+      returning False if it already exists; the next number is tried then. Claiming under the lock
+      means no other allocator can observe `n` as free in between.
+    """
+    p = Path(counter_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(p), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock(fd)
+        raw = b""
+        while chunk := os.read(fd, 4096):
+            raw += chunk
+        scopes = _parse(raw)
+        last = scopes.pop(scope, None)
+        n = (last if last is not None else (seed() if seed is not None else 0)) + 1
+        while (taken is not None and taken(n)) or (claim is not None and not claim(n)):
+            n += 1
+        scopes[scope] = n
+        kept = list(scopes.items())[-_MAX_SCOPES:]
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, "".join(f"{s}\t{v}\n" for s, v in kept).encode())
+        return n
+    finally:
+        os.close(fd)
@@ -0,0 +1,168 @@
+"""
+Tail-based trace sampling.
+
+`TailSamplingSpanProcessor` buffers finished spans per trace (bounded memory) and decides when the
+trace's local root span ends:
+- keep if any span failed (status ERROR), the root exceeded the latency threshold, or a span carries
+  a `gados.correlation_id` marked breached via `observability.mark_breached_correlation`;
+- otherwise keep a deterministic `sample_ratio` fraction (by trace id).
+
+Kept traces are forwarded to the wrapped processor (typically a BatchSpanProcessor + OTLP exporter).
+Kept in its own module so the OTel SDK is only imported when `setup_observability` enables it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+from .env import env_float, env_int
+from .metrics import registry
+from .observability import is_breached_correlation
+
+_TRACE_ID_LIMIT = (1 << 64) - 1
+
+_traces_total = registry.counter(
+    "gados_trace_tail_traces_total",
+    "Traces decided by the tail sampler, by decision and reason",
+)
+_spans_dropped_total = registry.counter(
+    "gados_trace_tail_spans_dropped_total",
+    "Spans dropped by the tail sampler before a decision (memory caps)",
+)
+
+
+@dataclass
+class _TraceBuffer:
+    spans: list[ReadableSpan] = field(default_factory=list)
+    error: bool = False
+    breached: bool = False
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    def __init__(
+        self,
+        delegate: SpanProcessor,
+        *,
+        latency_threshold_ms: float = 1000.0,
+        sample_ratio: float = 0.1,
+        max_traces: int = 2048,
+        max_spans_per_trace: int = 256,
+        decision_cache_size: int = 4096,
+    ) -> None:
+        self._delegate = delegate
+        self._latency_threshold_ns = int(max(0.0, latency_threshold_ms) * 1_000_000)
+        ratio = min(1.0, max(0.0, sample_ratio))
+        self._ratio_bound = round(ratio * (_TRACE_ID_LIMIT + 1))
+        self._max_traces = max(1, max_traces)
+        self._max_spans_per_trace = max(1, max_spans_per_trace)
+        self._decision_cache_size = max(0, decision_cache_size)
+
+        self._lock = threading.Lock()
+        self._buffers: OrderedDict[int, _TraceBuffer] = OrderedDict()
+        # trace_id -> keep? for spans that end after their local root (e.g. background tasks).
+        self._decided: OrderedDict[int, bool] = OrderedDict()
+
+    @classmethod
+    def from_env(cls, delegate: SpanProcessor) -> TailSamplingSpanProcessor:
+        return cls(
+            delegate,
+            latency_threshold_ms=env_float("GADOS_TRACE_TAIL_LATENCY_MS", 1000.0),
+            sample_ratio=env_float("GADOS_TRACE_TAIL_SAMPLE_RATIO", 0.1),
+            max_traces=env_int("GADOS_TRACE_TAIL_MAX_TRACES", 2048),
+            max_spans_per_trace=env_int("GADOS_TRACE_TAIL_MAX_SPANS_PER_TRACE", 256),
+        )
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        self._delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        ctx = span.context
+        if ctx is None:
+            return
+        trace_id = ctx.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+
+        forward: list[ReadableSpan] = []
+        with self._lock:
+            decided = self._decided.get(trace_id)
+            if decided is not None:
+                if decided:
+                    forward.append(span)
+            else:
+                buf = self._buffers.get(trace_id)
+                if buf is None:
+                    buf = self._new_buffer(trace_id)
+                self._observe(buf, span)
+                if is_local_root:
+                    del self._buffers[trace_id]
+                    keep, reason = self._decide(trace_id, buf, span)
+                    self._remember(trace_id, keep)
+                    _traces_total.add(1, {"decision": "kept" if keep else "dropped", "reason": reason})
+                    if keep:
+                        forward = buf.spans
+
+        for s in forward:
+            self._delegate.on_end(s)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "buffered_traces": len(self._buffers),
+                "buffered_spans": sum(len(b.spans) for b in self._buffers.values()),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._buffers.clear()
+            self._decided.clear()
+        self._delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+    # --- internals (caller holds self._lock) ---
+
+    def _new_buffer(self, trace_id: int) -> _TraceBuffer:
+        while len(self._buffers) >= self._max_traces:
+            _old_id, old = self._buffers.popitem(last=False)
+            _traces_total.add(1, {"decision": "dropped", "reason": "trace_cap"})
+            _spans_dropped_total.add(len(old.spans), {"reason": "trace_cap"})
+        buf = _TraceBuffer()
+        self._buffers[trace_id] = buf
+        return buf
+
+    def _observe(self, buf: _TraceBuffer, span: ReadableSpan) -> None:
+        if span.status is not None and span.status.status_code is StatusCode.ERROR:
+            buf.error = True
+        corr = (span.attributes or {}).get("gados.correlation_id")
+        if corr is not None and is_breached_correlation(str(corr)):
+            buf.breached = True
+        if len(buf.spans) < self._max_spans_per_trace:
+            buf.spans.append(span)
+        else:
+            _spans_dropped_total.add(1, {"reason": "span_cap"})
+
+    def _decide(self, trace_id: int, buf: _TraceBuffer, root: ReadableSpan) -> tuple[bool, str]:
+        if buf.error:
+            return True, "error"
+        if buf.breached:
+            return True, "breached"
+        if root.start_time is not None and root.end_time is not None:
+            if root.end_time - root.start_time >= self._latency_threshold_ns:
+                return True, "latency"
+        if (trace_id & _TRACE_ID_LIMIT) < self._ratio_bound:
+            return True, "sampled"
+        return False, "sampled_out"
+
+    def _remember(self, trace_id: int, keep: bool) -> None:
+        if not self._decision_cache_size:
+            return
+        self._decided[trace_id] = keep
+        while len(self._decided) > self._decision_cache_size:
+            self._decided.popitem(last=False)
@@ -1,25 +1,50 @@
+# ruff: noqa: E402
+
 from __future__ import annotations
 
 import csv
-import hashlib
 import json
+import operator
 import os
+import re
 import subprocess
+import sys
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, TypedDict
+from typing import Annotated, Any, Dict, List, TypedDict
 
 from langgraph.graph import END, StateGraph
 
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_REPO_ROOT))
+
+from gados_common.blobstore import link_or_copy, project_blob_store
+from gados_common.hashing import write_sha256sums
+from gados_common.rule_engine import RuleEngine, load_rules
+from gados_common.scanner_cache import (
+    ScanInputs,
+    advisory_ttl_s,
+    default_scanner_cache,
+    tool_version,
+)
+
+
+def _merge_dicts(left: dict[str, str], right: dict[str, str]) -> dict[str, str]:
+    return {**left, **right}
+
 
 class AuditState(TypedDict, total=False):
     pr_ref: str
     repo_path: str
     out_dir: str
     changed_files: List[str]
-    tool_outputs: Dict[str, str]  # name -> filepath
+    full_scan: bool  # AUDIT_FULL_SCAN=1: file-level scanners scan the whole tree instead of incrementally
+    # Scanner branches run in parallel; nodes return partial updates that these reducers merge.
+    tool_outputs: Annotated[Dict[str, str], _merge_dicts]  # name -> filepath
     findings: List[Dict[str, Any]]
-    notes: List[str]
+    notes: Annotated[List[str], operator.add]
 
 
 def run_cmd(cmd: List[str], cwd: str | None = None) -> tuple[int, str]:
@@ -33,11 +58,15 @@ def ensure_dir(p: Path) -> None:
 
 
 def write_text(path: Path, text: str) -> None:
-    path.write_text(text, encoding="utf-8")
+    # Replace instead of rewriting in place: a previous run's outputs may be hardlinked into its
+    # audit pack or the project blob store, which must not change.
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
 
 
 def write_json(path: Path, obj: Any) -> None:
-    path.write_text(json.dumps(obj, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    write_text(path, json.dumps(obj, indent=2, sort_keys=True) + "\n")
 
 
 def _read_json(path: Path) -> Any:
@@ -47,6 +76,159 @@ def _read_json(path: Path) -> Any:
         return None
 
 
+def _detect_secrets_exclude_regex() -> str:
+    # Same default as scripts/generate_review_pack.py: skip virtualenvs, caches and generated logs.
+    override = os.getenv("GADOS_DETECT_SECRETS_EXCLUDE_REGEX", "").strip()
+    if override:
+        return override
+    return r"(^|/)(\.venv|venv|\.pytest_cache|\.ruff_cache|__pycache__|\.git|\.mypy_cache|node_modules|\.gados-runtime|gados-project/log)(/|$)"
+
+
+def _scan(state: AuditState, cmd: list[str], report: Path, inputs: ScanInputs, *, max_age_s: float | None = None) -> tuple[int, str]:
+    """
+    Run a scanner into `report`, reusing the scanner cache when the tool version and input files are
+    unchanged. Returns (exit_code, note suffix recording the cache hit/miss).
+    """
+    repo = Path(state["repo_path"]).resolve()
+    cache = default_scanner_cache(repo)
+    key = cache.key(cmd, version=tool_version(cmd), inputs=inputs.digests(repo)) if cache is not None else ""
+    if cache is not None:
+        cached_rc = cache.get(key, report, max_age_s=max_age_s)
+        if cached_rc is not None:
+            return cached_rc, " (cache hit)"
+    rc, out_text = run_cmd(cmd, cwd=str(repo))
+    write_text(report, out_text)
+    if cache is None:
+        return rc, ""
+    cache.put(key, report, rc)
+    return rc, " (cache miss)"
+
+
+# Files passed per scanner invocation in incremental mode (keeps command lines well below ARG_MAX).
+_SCAN_BATCH = 200
+
+
+def _utc_stamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _parse_report(text: str) -> dict[str, Any] | None:
+    # run_cmd appends stderr after the JSON document; parse the leading document only.
+    try:
+        obj, _end = json.JSONDecoder().raw_decode(text.lstrip())
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _by_file(files: list[str]) -> dict[str, str]:
+    return {os.path.normpath(f): f for f in files}
+
+
+@dataclass(frozen=True)
+class _FileScanner:
+    """
+    A scanner whose report is a union of per-file results. Incrementally, only files without a cached
+    slice (new or changed content) are scanned; the report is merged from fresh and cached slices.
+    """
+
+    full_cmd: list[str]  # whole-tree scan (AUDIT_FULL_SCAN=1, or scanner cache disabled)
+    file_cmd: list[str]  # scan of the files appended to it
+    inputs: ScanInputs
+    split: Callable[[dict[str, Any], list[str]], dict[str, Any]]  # report, scanned files -> {file: slice}
+    merge: Callable[[dict[str, Any], dict[str, Any]], tuple[int, dict[str, Any]]]  # slices, header -> (rc, report)
+    header_fields: tuple[str, ...] = ()  # report fields that are not per-file (kept from the latest scan)
+
+
+def _bandit_split(report: dict[str, Any], files: list[str]) -> dict[str, Any]:
+    index = _by_file(files)
+    slices: dict[str, Any] = {f: {"results": [], "errors": [], "metrics": None} for f in files}
+    for field in ("results", "errors"):
+        for item in report.get(field) or []:
+            rel = index.get(os.path.normpath(str(item.get("filename", "")))) if isinstance(item, dict) else None
+            if rel:
+                slices[rel][field].append(item)
+    for name, metrics in (report.get("metrics") or {}).items():
+        rel = index.get(os.path.normpath(name))
+        if rel:
+            slices[rel]["metrics"] = metrics
+    return slices
+
+
+def _bandit_merge(slices: dict[str, Any], header: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    results: list[Any] = []
+    errors: list[Any] = []
+    metrics: dict[str, Any] = {}
+    totals: dict[str, float] = {}
+    for rel, sl in slices.items():
+        results.extend(sl.get("results") or [])
+        errors.extend(sl.get("errors") or [])
+        if sl.get("metrics"):
+            metrics[rel] = sl["metrics"]
+            for k, v in sl["metrics"].items():
+                if isinstance(v, int | float):
+                    totals[k] = totals.get(k, 0) + v
+    metrics["_totals"] = totals
+    # Bandit exits 1 when it reports issues.
+    return (1 if results else 0), {"errors": errors, "generated_at": _utc_stamp(), "metrics": metrics, "results": results}
+
+
+def _secrets_split(report: dict[str, Any], files: list[str]) -> dict[str, Any]:
+    index = _by_file(files)
+    slices: dict[str, Any] = {f: {"results": []} for f in files}
+    for name, items in (report.get("results") or {}).items():
+        rel = index.get(os.path.normpath(name))
+        if rel and isinstance(items, list):
+            slices[rel]["results"] = items
+    return slices
+
+
+def _secrets_merge(slices: dict[str, Any], header: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    results = {rel: sl["results"] for rel, sl in slices.items() if sl.get("results")}
+    return 0, {**header, "generated_at": _utc_stamp(), "results": results}
+
+
+def _scan_incremental(state: AuditState, scanner: _FileScanner, report: Path) -> tuple[int, str]:
+    """
+    Scan only files whose content has no cached per-file result and merge the rest from the cache, so a
+    PR audit costs O(changed files) scanner time. Falls back to the whole-tree scan when requested or
+    when the cache is disabled. Returns (exit_code, note suffix).
+    """
+    repo = Path(state["repo_path"]).resolve()
+    cache = default_scanner_cache(repo)
+    if cache is None or state.get("full_scan"):
+        return _scan(state, scanner.full_cmd, report, scanner.inputs)
+
+    version = tool_version(scanner.file_cmd)
+    keys = {
+        rel: cache.key([*scanner.file_cmd, rel], version=version, inputs={rel: digest})
+        for rel, digest in scanner.inputs.digests(repo).items()
+    }
+    header_key = cache.key(scanner.file_cmd, version=version, inputs={})
+    slices = {rel: sl for rel, key in keys.items() if (sl := cache.get_json(key)) is not None}
+    todo = [rel for rel in keys if rel not in slices]
+    header = cache.get_json(header_key) or {}
+    for i in range(0, len(todo), _SCAN_BATCH):
+        batch = todo[i : i + _SCAN_BATCH]
+        rc, out_text = run_cmd([*scanner.file_cmd, *batch], cwd=str(repo))
+        parsed = _parse_report(out_text)
+        if parsed is None:
+            # Scanner missing or failed: keep its raw output as the report, as a full scan would.
+            write_text(report, out_text)
+            return rc, " (incremental: scanner failed)"
+        header = {k: parsed[k] for k in scanner.header_fields if k in parsed}
+        for rel, sl in scanner.split(parsed, batch).items():
+            slices[rel] = sl
+            cache.put_json(keys[rel], sl)
+    if todo and header:
+        cache.put_json(header_key, header)
+
+    rc, merged = scanner.merge({rel: slices[rel] for rel in keys}, header)
+    write_json(report, merged)
+    in_diff = len(keys.keys() & set(state.get("changed_files", [])))
+    return rc, f" (incremental: scanned {len(todo)}/{len(keys)} files, {in_diff} changed in diff)"
+
+
 def _severity_rank(sev: str) -> int:
     sev = (sev or "").upper()
     return {"LOW": 10, "MEDIUM": 20, "HIGH": 30, "CRITICAL": 40}.get(sev, 10)
@@ -65,9 +247,7 @@ def ingest_node(state: AuditState) -> AuditState:
         rc2, diff2 = run_cmd(["git", "diff", "--name-only", "HEAD~1..HEAD"], cwd=str(repo))
         diff = diff2 if rc2 == 0 else diff
     changed = [f.strip() for f in diff.splitlines() if f.strip()]
-    state["changed_files"] = changed
-    state.setdefault("notes", []).append(f"Changed files: {len(changed)}")
-    return state
+    return {"changed_files": changed, "notes": [f"Changed files: {len(changed)}"]}
 
 
 def secrets_scan_node(state: AuditState) -> AuditState:
@@ -75,50 +255,68 @@ def secrets_scan_node(state: AuditState) -> AuditState:
     out = Path(state["out_dir"]).resolve() / "Tool_Outputs"
     report = out / "secrets_detect_secrets.json"
 
-    rc, out_text = run_cmd(["detect-secrets", "scan", "--all-files"], cwd=str(repo))
-    write_text(report, out_text)
-    state.setdefault("tool_outputs", {})["secrets"] = str(report)
-    state.setdefault("notes", []).append(f"Secrets scan exit_code={rc}")
-    return state
+    # Audit output written inside the repo is not source: keep it out of the scan (and the cache key).
+    exclude = _detect_secrets_exclude_regex()
+    out_root = Path(state["out_dir"]).resolve()
+    if out_root != repo and out_root.is_relative_to(repo):
+        exclude += f"|^{re.escape(out_root.relative_to(repo).as_posix())}(/|$)"
+    scanner = _FileScanner(
+        full_cmd=["detect-secrets", "scan", "--all-files", "--exclude-files", exclude],
+        # Explicit files (already filtered by `exclude`); --all-files also admits untracked ones.
+        file_cmd=["detect-secrets", "scan", "--all-files"],
+        inputs=ScanInputs((".",), exclude_re=exclude),
+        split=_secrets_split,
+        merge=_secrets_merge,
+        header_fields=("version", "plugins_used", "filters_used"),
+    )
+    rc, cache_note = _scan_incremental(state, scanner, report)
+    return {"tool_outputs": {"secrets": str(report)}, "notes": [f"Secrets scan exit_code={rc}{cache_note}"]}
 
 
 def sast_node(state: AuditState) -> AuditState:
-    repo = Path(state["repo_path"]).resolve()
     out = Path(state["out_dir"]).resolve() / "Tool_Outputs"
     report = out / "sast_bandit.json"
 
     # Bandit JSON output. Non-zero can mean issues or errors; keep artifact either way.
-    rc, out_text = run_cmd(
-        ["python", "-m", "bandit", "-q", "-r", "app", "gados-control-plane/gados_control_plane", "-f", "json"],
-        cwd=str(repo),
+    scanner = _FileScanner(
+        full_cmd=["python", "-m", "bandit", "-q", "-r", "app", "gados-control-plane/gados_control_plane", "-f", "json"],
+        file_cmd=["python", "-m", "bandit", "-q", "-f", "json"],
+        inputs=ScanInputs(("app", "gados-control-plane/gados_control_plane"), suffixes=(".py",)),
+        split=_bandit_split,
+        merge=_bandit_merge,
     )
-    write_text(report, out_text)
-    state.setdefault("tool_outputs", {})["sast"] = str(report)
-    state.setdefault("notes", []).append(f"SAST(Bandit) exit_code={rc}")
-    return state
+    rc, cache_note = _scan_incremental(state, scanner, report)
+    return {"tool_outputs": {"sast": str(report)}, "notes": [f"SAST(Bandit) exit_code={rc}{cache_note}"]}
 
 
-def sca_sbom_node(state: AuditState) -> AuditState:
-    repo = Path(state["repo_path"]).resolve()
-    out = Path(state["out_dir"]).resolve() / "Tool_Outputs"
-    sca = out / "sca_pip_audit.json"
-    sbom = out / "sbom_cyclonedx.json"
+def sca_node(state: AuditState) -> AuditState:
+    sca = Path(state["out_dir"]).resolve() / "Tool_Outputs" / "sca_pip_audit.json"
 
-    rc1, sca_text = run_cmd(["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "json"], cwd=str(repo))
-    write_text(sca, sca_text)
+    rc, cache_note = _scan(
+        state,
+        ["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "json"],
+        sca,
+        ScanInputs(("requirements.txt",)),
+        max_age_s=advisory_ttl_s(),
+    )
+    return {"tool_outputs": {"sca": str(sca)}, "notes": [f"SCA(pip-audit) exit_code={rc}{cache_note}"]}
 
-    rc2, sbom_text = run_cmd(["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "cyclonedx-json"], cwd=str(repo))
-    write_text(sbom, sbom_text)
 
-    state.setdefault("tool_outputs", {})["sca"] = str(sca)
-    state.setdefault("tool_outputs", {})["sbom"] = str(sbom)
-    state.setdefault("notes", []).append(f"SCA(pip-audit) exit_code={rc1}; SBOM exit_code={rc2}")
-    return state
+def sbom_node(state: AuditState) -> AuditState:
+    sbom = Path(state["out_dir"]).resolve() / "Tool_Outputs" / "sbom_cyclonedx.json"
+
+    rc, cache_note = _scan(
+        state,
+        ["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "cyclonedx-json"],
+        sbom,
+        ScanInputs(("requirements.txt",)),
+        max_age_s=advisory_ttl_s(),
+    )
+    return {"tool_outputs": {"sbom": str(sbom)}, "notes": [f"SBOM exit_code={rc}{cache_note}"]}
 
 
 def dast_lite_node(state: AuditState) -> AuditState:
-    state.setdefault("notes", []).append("DAST-lite skipped (configure and run separately).")
-    return state
+    return {"notes": ["DAST-lite skipped (configure and run separately)."]}
 
 
 @dataclass(frozen=True)
@@ -139,13 +337,19 @@ class _Finding:
         return d
 
 
+def _iva_rules_path(repo: Path) -> Path:
+    # The audited repo's rules when it has them, else the ones shipped with this script.
+    rel = Path("gados-project") / "playbooks" / "iva_rules.yaml"
+    return repo / rel if (repo / rel).exists() else _REPO_ROOT / rel
+
+
 def pci_checkout_iva_node(state: AuditState) -> AuditState:
     """
     Deterministic IVA (no LLM): interpret evidence outputs and apply a few strict rules.
     """
     repo = Path(state["repo_path"]).resolve()
     tool = state.get("tool_outputs", {})
-    findings: List[Dict[str, Any]] = state.get("findings", [])
+    findings: List[Dict[str, Any]] = list(state.get("findings", []))
 
     # Required artifacts check (beta minimal set we can actually generate here)
     required = [
@@ -218,43 +422,31 @@ def pci_checkout_iva_node(state: AuditState) -> AuditState:
             ).to_row()
         )
 
-    # Simple checkout trust heuristic (seeded demo): flag if changed files contain client-trusted totals
-    patterns = [
-        r'request\.json\[\s*["\']total["\']\s*\]',
-        r'order_total\s*=\s*request\.json',
-        r'total\s*=\s*request\.json',
-    ]
-    for rel in state.get("changed_files", []):
-        p = (repo / rel).resolve()
-        try:
-            if not p.is_file():
-                continue
-            txt = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
-        for pat in patterns:
-            if __import__("re").search(pat, txt):
-                findings.append(
-                    _Finding(
-                        Finding_ID="CHECKOUT-TOTAL-TRUST-001",
-                        Title="Potential checkout integrity bug: server trusts client-submitted totals",
-                        Severity="High",
-                        Mapping=["OWASP:A04:2021", "CWE-345", "PCI:6"],
-                        Evidence=f"{rel} (pattern={pat})",
-                        Impact="Money-loss risk via price/discount tampering.",
-                        Recommendation="Recompute totals server-side; validate discounts server-side; add tests.",
-                        Human_Review_Required="yes",
-                    ).to_row()
-                )
-                break
-
-    state["findings"] = findings
-    state.setdefault("notes", []).append("PCI/Checkout IVA completed (deterministic).")
+    # Rule-based checks (playbooks/iva_rules.yaml) over the changed files: one pass per file for all rules.
+    rules_path = _iva_rules_path(repo)
+    engine = RuleEngine(load_rules(rules_path))
+    changed = [rel for rel in state.get("changed_files", []) if (repo / rel).resolve().is_relative_to(repo)]
+    for hit in engine.scan(repo, changed):
+        findings.append(
+            _Finding(
+                Finding_ID=hit.rule.id,
+                Title=hit.rule.title,
+                Severity=hit.rule.severity,
+                Mapping=list(hit.rule.mapping),
+                Evidence=f"{hit.path}:{hit.lines[0]} (pattern={hit.pattern})",
+                Impact=hit.rule.impact,
+                Recommendation=hit.rule.recommendation,
+                Human_Review_Required="yes",
+                Notes=f"lines={','.join(map(str, hit.lines))}",
+            ).to_row()
+        )
+
+    notes = [f"PCI/Checkout IVA completed (deterministic; {len(engine.rules)} rules, {len(changed)} files)."]
     # Include playbook path for humans
     playbook = repo / "gados-project" / "playbooks" / "pci_checkout.md"
     if playbook.exists():
-        state.setdefault("notes", []).append(f"Playbook: {playbook}")
-    return state
+        notes.append(f"Playbook: {playbook}")
+    return {"findings": findings, "notes": notes}
 
 
 def coordinator_node(state: AuditState) -> AuditState:
@@ -264,13 +456,18 @@ def coordinator_node(state: AuditState) -> AuditState:
     ensure_dir(pack / "Tool_Outputs")
     ensure_dir(pack / "Evidence")
 
-    # Copy tool outputs into pack
+    # Place tool outputs into the pack: hardlinks (via the project blob store when the run lives in
+    # gados-project/, deduplicating identical outputs across runs) instead of full-text copies.
+    blob_store = project_blob_store(state["repo_path"], out)
     tool_outputs = state.get("tool_outputs", {})
     for _name, fp in tool_outputs.items():
         p = Path(fp)
         if p.exists():
             dest = pack / "Tool_Outputs" / p.name
-            write_text(dest, p.read_text(encoding="utf-8"))
+            if blob_store is not None:
+                blob_store.store_file(p, dest)
+            else:
+                link_or_copy(p, dest)
 
     # Findings register (CSV)
     findings = state.get("findings", [])
@@ -357,20 +554,9 @@ def coordinator_node(state: AuditState) -> AuditState:
     )
 
     # Optional immutability/traceability: write SHA256SUMS for the audit-pack.
-    sums: list[str] = []
-    sums_path = pack / "SHA256SUMS.txt"
-    for p in sorted(pack.rglob("*")):
-        if p.is_dir():
-            continue
-        if p.name == "SHA256SUMS.txt":
-            continue
-        h = hashlib.sha256(p.read_bytes()).hexdigest()
-        rel = p.relative_to(pack)
-        sums.append(f"{h}  {rel}")
-    write_text(sums_path, "\n".join(sums) + "\n")
-
-    state.setdefault("notes", []).append(f"Audit pack written to: {pack}")
-    return state
+    write_sha256sums(pack)
+
+    return {"notes": [f"Audit pack written to: {pack}"]}
 
 
 def build_graph():
@@ -378,17 +564,19 @@ def build_graph():
     g.add_node("ingest", ingest_node)
     g.add_node("secrets", secrets_scan_node)
     g.add_node("sast", sast_node)
-    g.add_node("sca_sbom", sca_sbom_node)
+    g.add_node("sca", sca_node)
+    g.add_node("sbom", sbom_node)
     g.add_node("dast_lite", dast_lite_node)
     g.add_node("pci_checkout_iva", pci_checkout_iva_node)
     g.add_node("coordinator", coordinator_node)
 
+    # Scanners are independent: fan out after ingest and join before the IVA, so an audit takes as
+    # long as the slowest scanner instead of the sum.
+    scanners = ["secrets", "sast", "sca", "sbom", "dast_lite"]
     g.set_entry_point("ingest")
-    g.add_edge("ingest", "secrets")
-    g.add_edge("secrets", "sast")
-    g.add_edge("sast", "sca_sbom")
-    g.add_edge("sca_sbom", "dast_lite")
-    g.add_edge("dast_lite", "pci_checkout_iva")
+    for name in scanners:
+        g.add_edge("ingest", name)
+    g.add_edge(scanners, "pci_checkout_iva")
     g.add_edge("pci_checkout_iva", "coordinator")
     g.add_edge("coordinator", END)
     return g.compile()
@@ -398,9 +586,10 @@ def main() -> int:
     repo_path = os.environ.get("REPO_PATH", ".")
     out_dir = os.environ.get("OUT_DIR", "./audit_run")
     pr_ref = os.environ.get("PR_REF", "local")
+    full_scan = os.environ.get("AUDIT_FULL_SCAN", "").strip().lower() in {"1", "true", "yes"}
 
     graph = build_graph()
-    graph.invoke({"repo_path": repo_path, "out_dir": out_dir, "pr_ref": pr_ref})
+    graph.invoke({"repo_path": repo_path, "out_dir": out_dir, "pr_ref": pr_ref, "full_scan": full_scan})
 
     pack = Path(out_dir).resolve() / "audit-pack"
     print("Done. Audit pack at:", pack)
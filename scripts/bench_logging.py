@@ -0,0 +1,63 @@
+"""Benchmark caller-side latency of JSON logging (`gados_common.observability.setup_logging`).
+
+Compares the synchronous StreamHandler path with the queue-based one (GADOS_LOG_ASYNC).
+Log output goes to /dev/null.
+
+Usage:
+  python scripts/bench_logging.py [--records 200000]
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_REPO_ROOT))
+
+from gados_common import observability
+
+
+def _run(n: int, async_mode: bool) -> list[float]:
+    os.environ["GADOS_LOG_ASYNC"] = "1" if async_mode else "0"
+    os.environ["GADOS_LOG_QUEUE_SIZE"] = str(n + 10)
+    devnull = open(os.devnull, "w")  # noqa: SIM115
+    stderr, sys.stderr = sys.stderr, devnull
+    try:
+        observability.setup_logging(service_name="bench")
+        log = logging.getLogger("bench")
+        lat: list[float] = []
+        for i in range(n):
+            t0 = time.perf_counter()
+            log.info("analytics_event", extra={"event": "page_view", "user_id_hash": "abc", "properties": {"i": i}})
+            lat.append(time.perf_counter() - t0)
+        observability._stop_log_listener()
+    finally:
+        sys.stderr = stderr
+        devnull.close()
+    return sorted(lat)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--records", type=int, default=200_000)
+    args = p.parse_args()
+
+    n = max(100, args.records)
+    for async_mode in (False, True):
+        lat = _run(n, async_mode)
+        pct = {q: lat[min(len(lat) - 1, int(len(lat) * q))] * 1e6 for q in (0.5, 0.99, 0.999)}
+        mode = "async" if async_mode else "sync"
+        print(
+            f"{mode:5s} records={n} mean_us={sum(lat) / n * 1e6:.2f} "
+            f"p50_us={pct[0.5]:.2f} p99_us={pct[0.99]:.2f} p999_us={pct[0.999]:.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Benchmark `gados_control_plane.validator.validate` on a synthetic project.
+
+Generates N stories (a third of them VERIFIED with evidence/review/log, a third IMPLEMENTED) and one
+CHANGE plan per story under a temp dir, then times a cold pass (empty index), a warm pass and a pass
+after touching one story.
+
+Usage:
+  python scripts/bench_validator.py [--stories 10000]
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_REPO_ROOT))
+sys.path.insert(0, str(_REPO_ROOT / "gados-control-plane"))
+
+from gados_control_plane import artifact_index
+from gados_control_plane.paths import ProjectPaths
+from gados_control_plane.validator import validate
+
+_STATES = ("PLANNED", "IMPLEMENTED", "VERIFIED")
+
+
+def _generate(root: Path, n: int) -> ProjectPaths:
+    gados_root = root / "gados-project"
+    for rel in ("plan/stories", "plan/changes", "verification", "log"):
+        (gados_root / rel).mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        sid = f"STORY-{i:05d}"
+        state = _STATES[i % len(_STATES)]
+        (gados_root / "plan" / "stories" / f"{sid}.md").write_text(
+            f"# {sid}: synthetic\n\n**Epic**: `EPIC-{i % 50:03d}`\n**Status**: {state}\n", encoding="utf-8"
+        )
+        (gados_root / "plan" / "changes" / f"CHANGE-{i:05d}-A.yaml").write_text(
+            f"story_id: {sid}\napprovals:\n  vda:\n    approved: {'true' if i % 7 else 'false'}\n", encoding="utf-8"
+        )
+        if state == "VERIFIED":
+            (gados_root / "verification" / f"{sid}-evidence.md").write_text("evidence\n", encoding="utf-8")
+            (gados_root / "verification" / f"{sid}-review.md").write_text("review\n", encoding="utf-8")
+            (gados_root / "log" / f"{sid}.log.yaml").write_text(
+                f"story_id: {sid}\nevents:\n  - type: VERIFICATION_DECISION\n    decision: VERIFIED\n"
+                "    actor_role: DeliveryGovernor\n",
+                encoding="utf-8",
+            )
+    return ProjectPaths(repo_root=root, gados_root=gados_root, templates_dir=gados_root / "templates")
+
+
+def _timed(paths: ProjectPaths) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    msgs = validate(paths)
+    return time.perf_counter() - t0, len(msgs)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--stories", type=int, default=10_000)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["GADOS_RUNTIME_DIR"] = str(Path(tmp) / "runtime")
+        paths = _generate(Path(tmp), max(1, args.stories))
+
+        cold, n_msgs = _timed(paths)
+        warm, _ = _timed(paths)
+        story = paths.gados_root / "plan" / "stories" / "STORY-00000.md"
+        story.write_text(story.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        artifact_index.invalidate(paths)
+        touched, _ = _timed(paths)
+
+    print(
+        f"stories={args.stories} findings={n_msgs} cold_ms={cold * 1e3:.1f} "
+        f"warm_ms={warm * 1e3:.1f} touch_one_ms={touched * 1e3:.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
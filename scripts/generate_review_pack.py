@@ -1,14 +1,36 @@
+# ruff: noqa: E402
+
 from __future__ import annotations
 
 import csv
-import hashlib
 import json
 import os
+import re
+import shutil
 import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_REPO_ROOT))
+
+from gados_common.blobstore import project_blob_store
+from gados_common.hashing import RUN_METADATA_FILES, hash_tree, merkle_root, write_sha256sums
+from gados_common.scanner_cache import (
+    ScanInputs,
+    ScannerCache,
+    advisory_ttl_s,
+    default_scanner_cache,
+    tool_version,
+)
+from gados_common.sequence import next_in_sequence
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
@@ -27,19 +49,128 @@ def _run(cmd: list[str]) -> tuple[int, str]:
         return 127, f"ERROR running {cmd!r}: {e}"
 
 
-def _run_to_file(cmd: list[str], out_file: Path) -> int:
+@dataclass(frozen=True)
+class _Tool:
+    name: str  # check name in summary.json / run.json
+    cmd: list[str]
+    out_file: Path
+    inputs: ScanInputs | None = None  # scanners only: the files whose content determines the report
+    max_age_s: float | None = None  # cached results older than this are re-run
+
+
+@dataclass(frozen=True)
+class _ToolResult:
+    exit_code: int
+    duration_s: float
+    timed_out: bool = False
+    cache: str | None = None  # hit | miss (tools with `inputs`, when the scanner cache is enabled)
+
+
+# Exit code recorded for a tool killed at its timeout (same convention as coreutils `timeout`).
+_TIMEOUT_EXIT_CODE = 124
+
+
+def _tool_timeout_s(name: str) -> float | None:
     """
-    Run a command and write combined stdout/stderr to out_file.
-    Returns exit code.
+    REVIEW_PACK_TIMEOUT_S_<NAME> (e.g. REVIEW_PACK_TIMEOUT_S_PYTEST_UNIT), else REVIEW_PACK_TIMEOUT_S,
+    else 900 seconds; 0 disables the timeout.
     """
+    raw = (
+        os.getenv(f"REVIEW_PACK_TIMEOUT_S_{name.upper()}", "").strip()
+        or os.getenv("REVIEW_PACK_TIMEOUT_S", "").strip()
+        or "900"
+    )
     try:
-        p = subprocess.run(cmd, check=False, capture_output=True, text=True)  # noqa: S603
-        out = (p.stdout or "") + (("\n" + p.stderr) if p.stderr else "")
-        out_file.write_text(out, encoding="utf-8")
-        return int(p.returncode)
+        value = float(raw)
+    except ValueError:
+        value = 900.0
+    return value if value > 0 else None
+
+
+def _tool_workers(n_tools: int) -> int:
+    try:
+        workers = int(os.getenv("REVIEW_PACK_WORKERS", "").strip() or 0)
+    except ValueError:
+        workers = 0
+    if workers <= 0:
+        # pip-audit mostly waits on the network, so overlap it even on small runners.
+        workers = max(4, os.cpu_count() or 1)
+    return max(1, min(workers, n_tools))
+
+
+def _run_to_file(cmd: list[str], out_file: Path, *, timeout_s: float | None = None) -> _ToolResult:
+    """
+    Run a command, streaming stdout straight into out_file; stderr (if any) is appended after it,
+    matching the previous combined-output layout. Never raises.
+    """
+    start = time.perf_counter()
+    try:
+        with out_file.open("wb") as out, tempfile.TemporaryFile() as err:
+            try:
+                p = subprocess.Popen(cmd, stdout=out, stderr=err)  # noqa: S603
+            except Exception as e:
+                out.write(f"ERROR running {cmd!r}: {e}\n".encode())
+                return _ToolResult(127, time.perf_counter() - start)
+            timed_out = False
+            try:
+                rc = p.wait(timeout=timeout_s)
+            except subprocess.TimeoutExpired:
+                p.kill()
+                p.wait()
+                timed_out, rc = True, _TIMEOUT_EXIT_CODE
+            if err.tell():
+                err.seek(0)
+                out.write(b"\n")
+                shutil.copyfileobj(err, out)
+            if timed_out:
+                out.write(f"\nTIMEOUT: killed after {timeout_s:g}s\n".encode())
+            return _ToolResult(int(rc), time.perf_counter() - start, timed_out)
     except Exception as e:
         out_file.write_text(f"ERROR running {cmd!r}: {e}\n", encoding="utf-8")
-        return 127
+        return _ToolResult(127, time.perf_counter() - start)
+
+
+def _run_tool(tool: _Tool, *, cache: ScannerCache | None, inputs: dict[str, str] | None) -> _ToolResult:
+    """
+    Run one tool; scanners with cached results for the same tool version and inputs are not re-run.
+    """
+    if cache is None or inputs is None:
+        return _run_to_file(tool.cmd, tool.out_file, timeout_s=_tool_timeout_s(tool.name))
+    start = time.perf_counter()
+    key = cache.key(tool.cmd, version=tool_version(tool.cmd), inputs=inputs)
+    cached_rc = cache.get(key, tool.out_file, max_age_s=tool.max_age_s)
+    if cached_rc is not None:
+        return _ToolResult(cached_rc, time.perf_counter() - start, cache="hit")
+    result = _run_to_file(tool.cmd, tool.out_file, timeout_s=_tool_timeout_s(tool.name))
+    if not result.timed_out and result.exit_code != 127:
+        cache.put(key, tool.out_file, result.exit_code)
+    return replace(result, duration_s=time.perf_counter() - start, cache="miss")
+
+
+def _run_tools(
+    tools: list[_Tool], *, cache: ScannerCache | None = None, repo_root: Path = _REPO_ROOT
+) -> dict[str, _ToolResult]:
+    """
+    Run independent tools concurrently (REVIEW_PACK_WORKERS, default: max(4, CPUs)), each with its own
+    timeout. Threads only wait on subprocesses, so the GIL is not a bottleneck.
+
+    Scanner inputs are hashed before any tool starts, so reports being written meanwhile cannot leak
+    into another tool's cache key.
+    """
+    inputs = {t.name: t.inputs.digests(repo_root) for t in tools if cache is not None and t.inputs is not None}
+    workers = _tool_workers(len(tools))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-tool") as pool:
+        futures = {t.name: pool.submit(_run_tool, t, cache=cache, inputs=inputs.get(t.name)) for t in tools}
+        return {name: f.result() for name, f in futures.items()}
+
+
+def _check_entry(result: _ToolResult) -> dict[str, Any]:
+    entry: dict[str, Any] = {"exit_code": result.exit_code, "duration_s": round(result.duration_s, 3)}
+    if result.timed_out:
+        entry["timed_out"] = True
+    if result.cache:
+        entry["cache"] = result.cache
+    return entry
 
 
 def _safe_json_load(path: Path) -> Any:
@@ -72,23 +203,22 @@ def _allocate_run_dir(*, base_dir: Path, run_key: str) -> tuple[str, Path]:
     """
     Create a new immutable run folder under base_dir.
     Uses monotonic numbering per run_key: REVIEW-<run_key>-001, -002, ...
+    (from a counter file in base_dir, so the folder is never enumerated; the folder is created while
+    the counter is locked, so concurrent runs get distinct ids).
     """
     base_dir.mkdir(parents=True, exist_ok=True)
     prefix = f"REVIEW-{run_key}-"
-    n = 1
-    for p in base_dir.iterdir():
-        if not p.is_dir():
-            continue
-        name = p.name
-        if not name.startswith(prefix):
-            continue
-        tail = name.removeprefix(prefix)
-        if tail.isdigit():
-            n = max(n, int(tail) + 1)
+
+    def claim(i: int) -> bool:
+        try:
+            (base_dir / f"{prefix}{i:03d}").mkdir()
+        except FileExistsError:
+            return False
+        return True
+
+    n = next_in_sequence(base_dir / ".REVIEW.seq", scope=run_key, claim=claim)
     run_id = f"{prefix}{n:03d}"
-    out_dir = base_dir / run_id
-    out_dir.mkdir(parents=True, exist_ok=False)
-    return run_id, out_dir
+    return run_id, base_dir / run_id
 
 
 def _override_path(repo_root: Path, run_key: str) -> Path:
@@ -173,6 +303,21 @@ def _compute_confidence(checks: dict[str, dict[str, Any]]) -> tuple[str, list[st
     return "LOW", not_run
 
 
+def _register_run(repo_root: Path, out_dir: Path, run_meta: dict[str, Any]) -> None:
+    """
+    Best-effort: add the run to the control-plane run registry (only for runs under gados-project/).
+    CI staging dirs are skipped; `scripts/rebuild_run_registry.py` can always re-derive it from disk.
+    """
+    try:
+        sys.path.insert(0, str(repo_root / "gados-control-plane"))
+        from gados_control_plane.paths import get_paths
+        from gados_control_plane.run_registry import get_run_registry
+
+        get_run_registry(get_paths()).register(out_dir, run_meta)
+    except Exception as e:
+        print(f"run registry not updated: {e}", file=sys.stderr)
+
+
 def main() -> int:
     repo_root = Path(__file__).resolve().parents[1]
     pr = os.getenv("GITHUB_PR_NUMBER", "").strip()
@@ -207,36 +352,57 @@ def main() -> int:
 
     policy = _load_policy(repo_root)
 
-    # Build & Test Verifier Agent
-    ruff_rc = _run_to_file(["python", "-m", "ruff", "check", "."], evidence_dir / "ruff.txt")
-    pytest_rc = _run_to_file(["python", "-m", "pytest", "-q", "-m", "not integration"], evidence_dir / "pytest_unit.txt")
-    validator_rc = _run_to_file(
-        ["python", "gados-control-plane/scripts/validate_artifacts.py"], evidence_dir / "governance_validator.txt"
-    )
-
-    # SAST Agent (Bandit)
     bandit_json_path = out_dir / "SAST_Report.json"
-    bandit_rc = _run_to_file(
-        ["python", "-m", "bandit", "-q", "-r", "app", "gados-control-plane/gados_control_plane", "-f", "json"],
-        bandit_json_path,
-    )
-
-    # SCA Agent (pip-audit) + SBOM
     sca_json_path = out_dir / "SCA_Report.json"
-    pip_audit_rc = _run_to_file(["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "json"], sca_json_path)
-
     sbom_path = out_dir / "SBOM.cyclonedx.json"
-    sbom_rc = _run_to_file(
-        ["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "cyclonedx-json"], sbom_path
-    )
-
-    # Secrets & Config Hygiene Agent (detect-secrets)
     secrets_json_path = out_dir / "Secrets_Report.json"
     secrets_exclude = _detect_secrets_exclude_regex()
-    secrets_rc = _run_to_file(
-        ["detect-secrets", "scan", "--all-files", "--exclude-files", secrets_exclude],
-        secrets_json_path,
-    )
+    # Review packs written inside the repo (REVIEW_PACK_DIR staging) are not source: keep them out of
+    # the scan, which runs while this pack is being written, and out of its cache key.
+    if base_dir != repo_root and base_dir.is_relative_to(repo_root):
+        secrets_exclude += f"|^{re.escape(base_dir.relative_to(repo_root).as_posix())}(/|$)"
+    requirements = ScanInputs(("requirements.txt",))
+    tools = [
+        # Build & Test Verifier Agent
+        _Tool("ruff", ["python", "-m", "ruff", "check", "."], evidence_dir / "ruff.txt"),
+        _Tool("pytest_unit", ["python", "-m", "pytest", "-q", "-m", "not integration"], evidence_dir / "pytest_unit.txt"),
+        _Tool(
+            "validator", ["python", "gados-control-plane/scripts/validate_artifacts.py"], evidence_dir / "governance_validator.txt"
+        ),
+        # SAST Agent (Bandit)
+        _Tool(
+            "sast_bandit",
+            ["python", "-m", "bandit", "-q", "-r", "app", "gados-control-plane/gados_control_plane", "-f", "json"],
+            bandit_json_path,
+            inputs=ScanInputs(("app", "gados-control-plane/gados_control_plane"), suffixes=(".py",)),
+        ),
+        # SCA Agent (pip-audit) + SBOM
+        _Tool(
+            "sca_pip_audit",
+            ["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "json"],
+            sca_json_path,
+            inputs=requirements,
+            max_age_s=advisory_ttl_s(),
+        ),
+        _Tool(
+            "sbom_cyclonedx",
+            ["python", "-m", "pip_audit", "-r", "requirements.txt", "-f", "cyclonedx-json"],
+            sbom_path,
+            inputs=requirements,
+            max_age_s=advisory_ttl_s(),
+        ),
+        # Secrets & Config Hygiene Agent (detect-secrets)
+        _Tool(
+            "secrets_detect_secrets",
+            ["detect-secrets", "scan", "--all-files", "--exclude-files", secrets_exclude],
+            secrets_json_path,
+            inputs=ScanInputs((".",), exclude_re=secrets_exclude),
+        ),
+    ]
+    tools_start = time.perf_counter()
+    results = _run_tools(tools, cache=default_scanner_cache(repo_root), repo_root=repo_root)
+    tools_wall_s = time.perf_counter() - tools_start
+    validator_rc = results["validator"].exit_code
 
     summary = {
         "generated_at_utc": _utc_now_iso(),
@@ -244,15 +410,8 @@ def main() -> int:
         "ref": ref,
         "sha": sha,
         "pr": pr,
-        "checks": {
-            "ruff": {"exit_code": ruff_rc},
-            "pytest_unit": {"exit_code": pytest_rc},
-            "validator": {"exit_code": validator_rc},
-            "sast_bandit": {"exit_code": bandit_rc},
-            "sca_pip_audit": {"exit_code": pip_audit_rc},
-            "sbom_cyclonedx": {"exit_code": sbom_rc},
-            "secrets_detect_secrets": {"exit_code": secrets_rc},
-        },
+        "checks": {t.name: _check_entry(results[t.name]) for t in tools},
+        "tools_wall_clock_s": round(tools_wall_s, 3),
     }
     (out_dir / "summary.json").write_text(json.dumps(summary, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
@@ -528,18 +687,15 @@ def main() -> int:
         encoding="utf-8",
     )
 
-    # Optional immutability/traceability: write SHA256SUMS for the pack.
-    sums_path = out_dir / "SHA256SUMS.txt"
-    sums: list[str] = []
-    for p in sorted(out_dir.rglob("*")):
-        if p.is_dir():
-            continue
-        if p.name == "SHA256SUMS.txt":
-            continue
-        h = hashlib.sha256(p.read_bytes()).hexdigest()
-        rel = p.relative_to(out_dir)
-        sums.append(f"{h}  {rel}")
-    sums_path.write_text("\n".join(sums) + "\n", encoding="utf-8")
+    # Optional immutability/traceability: write SHA256SUMS for the pack (streamed, hashed in parallel).
+    # Its Merkle root is recorded in run.json as `evidence_merkle_root`. Packs kept in the repo are
+    # deduplicated against earlier runs: files become hardlinks into gados-project/log/blobs.
+    blob_store = project_blob_store(repo_root, out_dir)
+    if blob_store is not None:
+        evidence_digests = blob_store.ingest_tree(out_dir, exclude=RUN_METADATA_FILES)
+    else:
+        evidence_digests = hash_tree(out_dir, exclude=RUN_METADATA_FILES)
+    write_sha256sums(out_dir, evidence_digests)
 
     # Write run metadata for UI + audit traceability.
     checks = summary.get("checks") if isinstance(summary, dict) else {}
@@ -583,9 +739,11 @@ def main() -> int:
         "top_findings": top_findings,
         "override_required": bool(blocked_reasons and not override_ok),
         "override_artifact": str(_override_path(repo_root, run_key).relative_to(repo_root)),
+        "evidence_merkle_root": merkle_root(evidence_digests),
     }
     (out_dir / "run.json").write_text(json.dumps(run_meta, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     finalized_marker.write_text("finalized\n", encoding="utf-8")
+    _register_run(repo_root, out_dir, run_meta)
 
     # Decision artifact in repo (PM-readable).
     decision_dir = repo_root / "gados-project" / "decision"
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import argparse
+
+from gados_control_plane.paths import get_paths
+from gados_control_plane.run_registry import get_run_registry
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(
+        description="Rebuild the beta/review run registry from the run folders under gados-project/log/reports/."
+    )
+    p.parse_args()
+
+    paths = get_paths()
+    count = get_run_registry(paths).rebuild()
+    print("run_registry_rebuilt:")
+    print(f"- gados_root: {paths.gados_root}")
+    print(f"- runs: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+
+from gados_control_plane.evidence_verify import verify_all_runs, verify_runs
+from gados_control_plane.paths import get_paths
+from gados_control_plane.run_registry import get_run_registry
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Verify beta/review run folders against their SHA256SUMS.txt.")
+    p.add_argument("run_ids", nargs="*", help="Runs to verify (default: every registered run)")
+    p.add_argument("--full", action="store_true", help="Re-hash every file instead of reusing cached digests")
+    p.add_argument("--workers", type=int, default=None, help="Hashing threads (default: GADOS_HASH_WORKERS)")
+    p.add_argument("--json", action="store_true", help="Print one JSON object per run")
+    args = p.parse_args()
+
+    paths = get_paths()
+    if args.run_ids:
+        registry = get_run_registry(paths)
+        runs = []
+        for run_id in args.run_ids:
+            run = registry.get(run_id)
+            if run is None:
+                p.error(f"unknown run: {run_id}")
+            runs.append(run)
+        results = verify_runs(paths, runs, full=args.full, workers=args.workers)
+    else:
+        results = verify_all_runs(paths, full=args.full, workers=args.workers)
+
+    failed = [r for r in results if not r.ok]
+    if args.json:
+        for r in results:
+            print(json.dumps({"ok": r.ok, **asdict(r)}, sort_keys=True))
+    else:
+        print("evidence_verification:")
+        print(f"- runs: {len(results)}")
+        print(f"- ok: {len(results) - len(failed)}")
+        print(f"- failed: {len(failed)}")
+        for r in failed:
+            print(f"  - {r.run_id}: {r.status}")
+            for label, rels in (("tampered", r.tampered), ("missing", r.missing), ("unexpected", r.unexpected)):
+                for rel in rels:
+                    print(f"    - {label}: {r.rel_dir}/{rel}")
+            if r.merkle_ok is False:
+                print("    - merkle root mismatch")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+_SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+def _load_script(name: str) -> Iterator[ModuleType]:
+    """
+    Import `scripts/<name>.py` as module `name` for the duration of a fixture.
+    """
+    spec = importlib.util.spec_from_file_location(name, _SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve their module while the script loads
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+@pytest.fixture(scope="module")
+def audit_graph() -> Iterator[ModuleType]:
+    yield from _load_script("audit_graph")
+
+
+@pytest.fixture(scope="module")
+def pack() -> Iterator[ModuleType]:
+    yield from _load_script("generate_review_pack")
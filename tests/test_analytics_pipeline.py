@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+
+from gados_common import analytics
+from gados_common.analytics import AnalyticsPipeline, _PendingEvent
+
+
+@pytest.fixture
+def exported(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    out: list[str] = []
+    monkeypatch.setattr(analytics, "_export_batch", lambda batch: out.extend(e.event for e in batch))
+    return out
+
+
+def _evt(name: str) -> _PendingEvent:
+    return _PendingEvent(event=name, user_id=None, properties={})
+
+
+def test_overflow_drops_and_counts(exported: list[str]):
+    p = AnalyticsPipeline(capacity=3, batch_size=100, flush_interval_s=60)
+    try:
+        accepted = p.submit_many(_evt("e") for _ in range(5))
+        assert accepted == 3
+        assert p.stats()["dropped"] == 2
+        assert p.flush(timeout=5)
+        assert exported == ["e", "e", "e"]
+    finally:
+        p.shutdown()
+
+
+def test_head_sampling_per_event_name(exported: list[str]):
+    p = AnalyticsPipeline(batch_size=10, flush_interval_s=60, sample_rates={"noisy": 0.0, "*": 1.0})
+    try:
+        for _ in range(10):
+            p.submit(_evt("noisy"))
+            p.submit(_evt("signup"))
+        assert p.flush(timeout=5)
+        assert exported == ["signup"] * 10
+        assert p.stats()["sampled_out"] == 10
+    finally:
+        p.shutdown()
+
+
+def test_shutdown_drains_buffer(exported: list[str]):
+    p = AnalyticsPipeline(batch_size=1000, flush_interval_s=60)
+    p.submit_many(_evt("e") for _ in range(25))
+    p.shutdown(timeout=5)
+    assert len(exported) == 25
+    assert p.submit(_evt("late")) is False
+
+
+def test_shutdown_drops_are_labelled(monkeypatch: pytest.MonkeyPatch, exported: list[str]):
+    reasons: list[str] = []
+    monkeypatch.setattr(analytics._dropped_counter, "add", lambda n, attributes: reasons.append(attributes["reason"]))
+    p = AnalyticsPipeline(capacity=1, batch_size=100, flush_interval_s=60)
+    p.submit_many(_evt("e") for _ in range(2))
+    p.shutdown(timeout=5)
+    p.submit(_evt("late"))
+    assert reasons == ["buffer_full", "shutdown"]
+
+
+def test_span_events_are_cheap_and_follow_sampling(monkeypatch: pytest.MonkeyPatch, exported: list[str]):
+    # test_app disables the SDK process-wide; a disabled TracerProvider hands out no-op spans.
+    monkeypatch.delenv("OTEL_SDK_DISABLED", raising=False)
+    scrubbed: list[str] = []
+    monkeypatch.setattr(analytics, "_scrub_properties", lambda props: scrubbed.append("x") or ({}, 0))
+    tracer = TracerProvider().get_tracer("test")
+    p = AnalyticsPipeline(batch_size=100, flush_interval_s=60, sample_rates={"noisy": 0.0})
+    monkeypatch.setattr(analytics, "_pipeline", p)
+    try:
+        with tracer.start_as_current_span("request") as span:
+            analytics.track_event("signup", user_id="u1", properties={"scenario": "beta"})
+            analytics.track_event("noisy", user_id="u1")
+            assert analytics.track_events([{"event": "noisy"}, {"event": "search"}]) == 1
+            assert scrubbed == []  # nothing scrubbed or hashed on the caller's thread
+        assert p.flush(timeout=5)
+        assert exported == ["signup", "search"]
+    finally:
+        p.shutdown()
+    assert [(e.name, dict(e.attributes)) for e in span.events] == [
+        ("analytics.event", {"event_name": "signup"}),
+        ("analytics.event", {"event_name": "search"}),
+    ]
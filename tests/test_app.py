@@ -20,3 +20,66 @@ def test_track_event():
     assert res.status_code == 200
     assert res.json() == {"accepted": True}
 
+
+def test_track_batch_json_array_reports_rejected():
+    client = TestClient(app)
+    res = client.post(
+        "/track/batch",
+        json=[{"event": "a"}, {"event": ""}, {"event": "b", "properties": {"status": "ok"}}, {"user_id": "u"}],
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["accepted"] == 2
+    assert body["rejected"] == 2
+    assert [e["index"] for e in body["errors"]] == [1, 3]
+
+
+def test_track_batch_ndjson_and_size_cap(monkeypatch):
+    client = TestClient(app)
+    ndjson = '{"event": "a"}\nnot-json\n{"event": "b", "user_id": "u_1"}\n'
+    res = client.post("/track/batch", content=ndjson, headers={"content-type": "application/x-ndjson"})
+    assert res.status_code == 200
+    assert res.json()["accepted"] == 2
+    assert res.json()["rejected"] == 1
+
+    monkeypatch.setenv("GADOS_TRACK_BATCH_MAX_EVENTS", "2")
+    res = client.post("/track/batch", json=[{"event": "a"}] * 3)
+    assert res.status_code == 413
+
+
+def test_track_batch_byte_cap_applies_to_streamed_bodies(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setenv("GADOS_TRACK_BATCH_MAX_BYTES", "64")
+    big = '{"event": "a"}\n' * 10
+    res = client.post("/track/batch", content=big, headers={"content-type": "application/x-ndjson"})
+    assert res.status_code == 413
+
+    # Chunked upload without Content-Length: rejected while reading.
+    chunks = iter([b'{"event": "a"}\n'] * 10)
+    res = client.post("/track/batch", content=chunks, headers={"content-type": "application/x-ndjson"})
+    assert res.status_code == 413
+
+    res = client.post("/track/batch", content=iter([b'{"event": "a"}\n'] * 2))
+    assert res.status_code == 200
+    assert res.json()["accepted"] == 2
+
+
+def test_track_batch_work_runs_in_threadpool_with_request_context(monkeypatch):
+    import app.main as main_mod
+    from gados_common.observability import request_id_ctx
+
+    dispatched: list[str] = []
+    real_run_in_threadpool = main_mod.run_in_threadpool
+
+    async def spy(func, *args):
+        dispatched.append(func.__name__)
+        return await real_run_in_threadpool(func, *args)
+
+    seen: list[str | None] = []
+    monkeypatch.setattr(main_mod, "run_in_threadpool", spy)
+    monkeypatch.setattr(main_mod, "track_events", lambda events: seen.append(request_id_ctx.get()) or len(list(events)))
+
+    res = TestClient(app).post("/track/batch", json=[{"event": "a"}], headers={"x-request-id": "req-42"})
+    assert res.status_code == 200 and res.json()["accepted"] == 1
+    assert dispatched == ["_track_batch"]
+    assert seen == ["req-42"]  # contextvars (request id, current span) follow the work to the thread
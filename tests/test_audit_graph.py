@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+
+def test_scanners_fan_out_and_merge_state(audit_graph, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_run_cmd(cmd, cwd=None):
+        nonlocal running, peak
+        if cmd[0] == "git":
+            return 0, ""
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.2)
+        with lock:
+            running -= 1
+        return 0, "{}"
+
+    monkeypatch.setattr(audit_graph, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(audit_graph, "tool_version", lambda cmd: "test")
+    monkeypatch.setenv("GADOS_SCANNER_CACHE_DIR", str(tmp_path / "cache"))
+    state = audit_graph.build_graph().invoke({"repo_path": str(tmp_path), "out_dir": str(tmp_path / "out"), "full_scan": True})
+
+    assert peak > 1
+    assert sorted(state["tool_outputs"]) == ["sast", "sbom", "sca", "secrets"]
+    # Branch notes are merged in completion order.
+    assert sorted(n for n in state["notes"] if "exit_code" in n) == [
+        "SAST(Bandit) exit_code=0 (cache miss)",
+        "SBOM exit_code=0 (cache miss)",
+        "SCA(pip-audit) exit_code=0 (cache miss)",
+        "Secrets scan exit_code=0 (cache miss)",
+    ]
+    assert state["notes"][-1].startswith("Audit pack written to:")
+    pack = tmp_path / "out" / "audit-pack"
+    assert sorted(p.name for p in (pack / "Tool_Outputs").iterdir()) == [
+        "sast_bandit.json",
+        "sbom_cyclonedx.json",
+        "sca_pip_audit.json",
+        "secrets_detect_secrets.json",
+    ]
+    assert (pack / "SHA256SUMS.txt").exists()
+
+
+def test_unchanged_inputs_reuse_cached_scans(audit_graph, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    scans: list[list[str]] = []
+
+    def fake_run_cmd(cmd, cwd=None):
+        if cmd[0] != "git":
+            scans.append(cmd)
+        return 0, "{}"
+
+    monkeypatch.setattr(audit_graph, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(audit_graph, "tool_version", lambda cmd: "test")
+    monkeypatch.setenv("GADOS_SCANNER_CACHE_DIR", str(tmp_path / "cache"))
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "requirements.txt").write_text("fastapi\n", encoding="utf-8")
+    graph = audit_graph.build_graph()
+    graph.invoke({"repo_path": str(repo), "out_dir": str(repo / "out"), "full_scan": True})
+    assert len(scans) == 4
+
+    state = graph.invoke({"repo_path": str(repo), "out_dir": str(repo / "out"), "full_scan": True})
+    assert len(scans) == 4
+    assert all(n.endswith("(cache hit)") for n in state["notes"] if "exit_code" in n)
+    assert (repo / "out" / "audit-pack" / "Tool_Outputs" / "sca_pip_audit.json").read_text(encoding="utf-8") == "{}"
+
+    (repo / "requirements.txt").write_text("fastapi\nrequests\n", encoding="utf-8")
+    graph.invoke({"repo_path": str(repo), "out_dir": str(repo / "out"), "full_scan": True})
+    # requirements.txt feeds pip-audit (SCA + SBOM) and the secrets scan; Bandit's .py inputs are unchanged.
+    assert sorted(c[0] for c in scans[4:]) == ["detect-secrets", "python", "python"]
+
+
+def _fake_file_scanner(scanned: list[str]):
+    """
+    Stand-in for bandit / detect-secrets on explicit files: one finding per file containing "SECRET".
+    """
+
+    def run_cmd(cmd, cwd=None):
+        if cmd[0] == "git":
+            return 0, "app/a.py\n"
+        files = [c for c in cmd if c.endswith(".py")]
+        scanned.extend(files)
+        hits = [f for f in files if "SECRET" in (Path(cwd) / f).read_text(encoding="utf-8")]
+        if cmd[0] == "detect-secrets":
+            report = {"version": "1.5", "plugins_used": [], "results": {f: [{"type": "Secret Keyword", "line_number": 1}] for f in hits}}
+        elif "bandit" in cmd:
+            report = {
+                "results": [{"filename": f, "test_id": "B105", "issue_severity": "LOW"} for f in hits],
+                "errors": [],
+                "metrics": {f: {"loc": 1} for f in files},
+            }
+        else:
+            return 0, "{}"
+        return 0, json.dumps(report) + "\n[main] INFO profile include tests: None"
+
+    return run_cmd
+
+
+def test_incremental_scans_only_changed_files(audit_graph, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    repo = tmp_path / "repo"
+    for name, text in {"a.py": "x = 1\n", "b.py": "token = 'SECRET'\n", "c.py": "y = 2\n"}.items():
+        (repo / "app").mkdir(parents=True, exist_ok=True)
+        (repo / "app" / name).write_text(text, encoding="utf-8")
+    scanned: list[str] = []
+    monkeypatch.setattr(audit_graph, "run_cmd", _fake_file_scanner(scanned))
+    monkeypatch.setattr(audit_graph, "tool_version", lambda cmd: "test")
+    monkeypatch.setenv("GADOS_SCANNER_CACHE_DIR", str(tmp_path / "cache"))
+    graph = audit_graph.build_graph()
+    state = {"repo_path": str(repo), "out_dir": str(repo / "out")}
+
+    graph.invoke(state)
+    assert sorted(scanned) == ["app/a.py", "app/a.py", "app/b.py", "app/b.py", "app/c.py", "app/c.py"]
+
+    scanned.clear()
+    (repo / "app" / "a.py").write_text("x = 'SECRET'\n", encoding="utf-8")
+    result = graph.invoke(state)
+    assert scanned == ["app/a.py", "app/a.py"]  # once per scanner; b.py and c.py come from the cache
+    assert "Secrets scan exit_code=0 (incremental: scanned 1/3 files, 1 changed in diff)" in result["notes"]
+
+    tool_outputs = repo / "out" / "Tool_Outputs"
+    secrets = json.loads((tool_outputs / "secrets_detect_secrets.json").read_text(encoding="utf-8"))
+    assert sorted(secrets["results"]) == ["app/a.py", "app/b.py"]
+    assert secrets["version"] == "1.5"
+    bandit = json.loads((tool_outputs / "sast_bandit.json").read_text(encoding="utf-8"))
+    assert sorted(r["filename"] for r in bandit["results"]) == ["app/a.py", "app/b.py"]
+    assert bandit["metrics"]["_totals"] == {"loc": 3}
+    assert any(f["Finding_ID"] == "SEC-SECRET-001" for f in result["findings"])
+
+
+def test_iva_rules_report_line_numbers(audit_graph, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    repo = tmp_path / "repo"
+    (repo / "app").mkdir(parents=True)
+    (repo / "app" / "checkout.py").write_text("import flask\n\n\norder_total = request.json['amount']\n", encoding="utf-8")
+
+    def fake_run_cmd(cmd, cwd=None):
+        return (0, "app/checkout.py\n") if cmd[0] == "git" else (0, "{}")
+
+    monkeypatch.setattr(audit_graph, "run_cmd", fake_run_cmd)
+    monkeypatch.setenv("GADOS_SCANNER_CACHE", "0")
+    state = audit_graph.build_graph().invoke({"repo_path": str(repo), "out_dir": str(tmp_path / "out")})
+
+    [finding] = [f for f in state["findings"] if f["Finding_ID"] == "CHECKOUT-TOTAL-TRUST-001"]
+    assert finding["Evidence"].startswith("app/checkout.py:4 (pattern=")
+    assert finding["Severity"] == "High" and finding["Mapping"] == "OWASP:A04:2021;CWE-345;PCI:6"
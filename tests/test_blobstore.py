@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+
+from gados_common.blobstore import BlobStore, link_or_copy, project_blob_store
+from gados_common.hashing import RUN_METADATA_FILES, hash_tree, write_sha256sums
+
+
+def _pack(root: Path, sbom: bytes, summary: str) -> Path:
+    (root / "Evidence").mkdir(parents=True)
+    (root / "Evidence" / "sbom.json").write_bytes(sbom)
+    (root / "Executive_Summary.md").write_text(summary, encoding="utf-8")
+    (root / "run.json").write_text("{}", encoding="utf-8")
+    return root
+
+
+def test_identical_evidence_is_stored_once(tmp_path: Path):
+    store = BlobStore(tmp_path / "blobs")
+    first = _pack(tmp_path / "RUN-001", b'{"components": []}', "GO\n")
+    second = _pack(tmp_path / "RUN-002", b'{"components": []}', "NO-GO\n")
+
+    d1 = store.ingest_tree(first, exclude=RUN_METADATA_FILES)
+    d2 = store.ingest_tree(second, exclude=RUN_METADATA_FILES)
+    assert d1["Evidence/sbom.json"] == d2["Evidence/sbom.json"]
+    assert d1 == hash_tree(first, exclude=RUN_METADATA_FILES)
+
+    sbom_blob = store.path(d1["Evidence/sbom.json"])
+    assert os.path.samefile(first / "Evidence" / "sbom.json", second / "Evidence" / "sbom.json")
+    assert os.stat(sbom_blob).st_nlink == 3
+    assert len(list((tmp_path / "blobs").rglob("*/*/*"))) == 3  # one sbom + two summaries
+    assert stat.S_IMODE(os.stat(sbom_blob).st_mode) == 0o444
+
+    # Run folders still hold ordinary files; the SHA256SUMS manifest is unchanged.
+    write_sha256sums(second, d2)
+    assert (second / "SHA256SUMS.txt").read_text(encoding="utf-8").splitlines()[0].endswith("  Evidence/sbom.json")
+    assert (second / "run.json").stat().st_nlink == 1
+
+
+def test_store_file_links_instead_of_copying(tmp_path: Path):
+    store = BlobStore(tmp_path / "blobs")
+    src = tmp_path / "Tool_Outputs" / "sast_bandit.json"
+    src.parent.mkdir()
+    src.write_text('{"results": []}', encoding="utf-8")
+    dest = tmp_path / "audit-pack" / "Tool_Outputs" / "sast_bandit.json"
+    digest = store.store_file(src, dest)
+    assert os.path.samefile(dest, store.path(digest))
+    assert dest.read_text(encoding="utf-8") == '{"results": []}'
+
+
+def test_project_store_only_for_runs_inside_gados_project(tmp_path: Path):
+    run = tmp_path / "gados-project" / "log" / "reports" / "review-runs" / "REVIEW-x-001"
+    store = project_blob_store(tmp_path, run)
+    assert store is not None and store.root == tmp_path.resolve() / "gados-project" / "log" / "blobs"
+    assert project_blob_store(tmp_path, tmp_path / "review-pack" / "REVIEW-x-001") is None
+
+
+def test_relinking_the_same_file_is_a_no_op(tmp_path: Path):
+    src = tmp_path / "report.json"
+    src.write_text("{}\n", encoding="utf-8")
+    dest = tmp_path / "pack" / "report.json"
+    for _ in range(3):
+        assert link_or_copy(src, dest)
+    assert os.path.samefile(src, dest)
+    assert sorted(p.name for p in dest.parent.iterdir()) == ["report.json"]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from gados_common.env import env_flag, env_float, env_int, env_workers
+
+
+def test_env_helpers_fall_back_on_invalid_values(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("GADOS_TEST_N", "12")
+    monkeypatch.setenv("GADOS_TEST_BAD", "twelve")
+    assert env_int("GADOS_TEST_N", 1) == 12
+    assert env_int("GADOS_TEST_BAD", 1) == 1
+    assert env_float("GADOS_TEST_N", 0.5) == 12.0
+    assert env_float("GADOS_TEST_BAD", 0.5) == 0.5
+    assert env_flag("GADOS_TEST_UNSET", True) is True
+    monkeypatch.setenv("GADOS_TEST_FLAG", "0")
+    assert env_flag("GADOS_TEST_FLAG", True) is False
+
+    default = min(8, os.cpu_count() or 1)
+    assert env_workers("GADOS_TEST_N") == 12
+    for value in ("0", "-2", "twelve"):
+        monkeypatch.setenv("GADOS_TEST_WORKERS", value)
+        assert env_workers("GADOS_TEST_WORKERS") == default
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from gados_common import hashing
+from gados_common.hashing import DigestCache, hash_tree, merkle_root, sha256_file, write_sha256sums
+
+
+@pytest.fixture
+def pack(tmp_path: Path) -> Path:
+    (tmp_path / "Evidence").mkdir()
+    (tmp_path / "Evidence" / "sbom.json").write_bytes(b"x" * (3 * (1 << 20) + 17))
+    (tmp_path / "REVIEW_PACK.md").write_text("# pack\n", encoding="utf-8")
+    (tmp_path / "run.json").write_text("{}\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_streamed_digests_match_and_sums_file(pack: Path):
+    big = pack / "Evidence" / "sbom.json"
+    assert sha256_file(big) == hashlib.sha256(big.read_bytes()).hexdigest()
+
+    digests = write_sha256sums(pack, hash_tree(pack, exclude=hashing.RUN_METADATA_FILES, workers=4))
+    assert list(digests) == ["Evidence/sbom.json", "REVIEW_PACK.md"]
+    lines = (pack / "SHA256SUMS.txt").read_text(encoding="utf-8").splitlines()
+    assert lines[1] == f"{hashlib.sha256(b'# pack' + bytes([10])).hexdigest()}  REVIEW_PACK.md"
+
+
+def test_cache_skips_unchanged_files(pack: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = DigestCache()
+    first = hash_tree(pack, cache=cache)
+    reads: list[str] = []
+    real = hashing.sha256_file
+    monkeypatch.setattr(hashing, "sha256_file", lambda p: reads.append(Path(p).name) or real(p))
+
+    assert hash_tree(pack, cache=cache) == first
+    assert reads == []
+    (pack / "REVIEW_PACK.md").write_text("# pack v2\n", encoding="utf-8")
+    assert hash_tree(pack, cache=cache)["REVIEW_PACK.md"] != first["REVIEW_PACK.md"]
+    assert reads == ["REVIEW_PACK.md"]
+
+
+def test_uncached_hashing_sees_same_size_rewrites(pack: Path):
+    report = pack / "REVIEW_PACK.md"
+    before = hash_tree(pack)["REVIEW_PACK.md"]
+    st = report.stat()
+    report.write_text("# PACK\n", encoding="utf-8")
+    os.utime(report, ns=(st.st_atime_ns, st.st_mtime_ns))  # same size and mtime as before
+    assert hash_tree(pack)["REVIEW_PACK.md"] != before
+
+
+def test_merkle_root_binds_content_and_paths():
+    a, b, c = (hashlib.sha256(x).hexdigest() for x in (b"a", b"b", b"c"))
+    root = merkle_root({"a": a, "b": b, "c": c})
+    assert root == merkle_root({"c": c, "a": a, "b": b})
+    assert root != merkle_root({"a": a, "b": b, "c": a})
+    assert root != merkle_root({"a": a, "b": b, "d": c})
+    assert merkle_root({}) == hashlib.sha256(b"").hexdigest()
+
+    def leaf(rel: str, digest: str) -> bytes:
+        return hashlib.sha256(b"\x00" + rel.encode() + b"\x00" + bytes.fromhex(digest)).digest()
+
+    node = hashlib.sha256(b"\x01" + leaf("a", a) + leaf("b", b)).digest()
+    assert root == hashlib.sha256(b"\x01" + node + leaf("c", c)).hexdigest()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from gados_common.metrics import MetricsRegistry, timed
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = MetricsRegistry()
+    h = reg.histogram("demo_duration_seconds", "demo", buckets=(0.01, 0.1))
+    h.record(0.005, {"route": "/a"})
+    h.record(0.01, {"route": "/a"})
+    h.record(0.5, {"route": "/a"})
+
+    text = reg.render_prometheus()
+    assert "# TYPE demo_duration_seconds histogram" in text
+    assert 'demo_duration_seconds_bucket{route="/a",le="0.01"} 2' in text
+    assert 'demo_duration_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'demo_duration_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'demo_duration_seconds_count{route="/a"} 3' in text
+
+
+def test_registry_get_or_create_and_timed():
+    reg = MetricsRegistry()
+    c = reg.counter("demo_total", "demo")
+    assert reg.counter("demo_total", "demo") is c
+    with pytest.raises(ValueError):
+        reg.histogram("demo_total", "clash")
+
+    h = reg.histogram("op_duration_seconds", "op")
+
+    @timed(h, operation="noop")
+    def noop() -> int:
+        return 7
+
+    assert noop() == 7
+    assert 'op_duration_seconds_count{operation="noop"} 1' in reg.render_prometheus()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+
+from gados_common.metrics import registry
+from gados_common.observability import (
+    _DroppingQueueHandler,
+    _FastJsonFormatter,
+    _RequestIdFilter,
+    request_id_ctx,
+)
+
+
+def _record(msg: str, *args: object, **extra: object) -> logging.LogRecord:
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_fast_formatter_fields_and_extras():
+    token = request_id_ctx.set("rid-1")
+    try:
+        record = _record("hello %s", "world", event="signup", properties={"plan": "pro"})
+        _RequestIdFilter().filter(record)
+    finally:
+        request_id_ctx.reset(token)
+
+    out = json.loads(_FastJsonFormatter().format(record))
+    assert list(out)[:5] == ["asctime", "levelname", "name", "message", "request_id"]
+    assert out["message"] == "hello world"
+    assert out["request_id"] == "rid-1"
+    assert out["event"] == "signup"
+    assert out["properties"] == {"plan": "pro"}
+
+
+def test_queue_handler_drops_when_full_and_counts():
+    dropped = registry.counter("gados_log_records_dropped_total", "")
+    before = dropped._values.get((("level", "INFO"),), 0)
+
+    q: queue.Queue = queue.Queue(maxsize=2)
+    handler = _DroppingQueueHandler(q)
+    for i in range(5):
+        handler.handle(_record("m %d", i))
+
+    assert q.qsize() == 2
+    assert dropped._values.get((("level", "INFO"),), 0) - before == 3
+    first = q.get_nowait()
+    assert first.getMessage() == "m 0" and first.args is None
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def test_tools_run_concurrently_with_timeouts(pack, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("REVIEW_PACK_WORKERS", "3")
+    monkeypatch.setenv("REVIEW_PACK_TIMEOUT_S_SLOW", "0.5")
+    py = sys.executable
+    # Each barrier tool marks itself running and exits 0 only if it sees the other one running too,
+    # which cannot happen if tools run one at a time.
+    barrier = (
+        "import pathlib, sys, time; d = pathlib.Path(sys.argv[1]); (d / sys.argv[2]).touch(); "
+        "deadline = time.monotonic() + 5\n"
+        "while not (d / sys.argv[3]).exists():\n"
+        "    time.sleep(0.01)\n"
+        "    if time.monotonic() > deadline: sys.exit(1)"
+    )
+    tools = [
+        pack._Tool("barrier_a", [py, "-c", barrier, str(tmp_path), "a", "b"], tmp_path / "a.txt"),
+        pack._Tool("barrier_b", [py, "-c", barrier, str(tmp_path), "b", "a"], tmp_path / "b.txt"),
+        pack._Tool("slow", [py, "-c", "import time; time.sleep(30)"], tmp_path / "slow.txt"),
+        pack._Tool("ok", [py, "-c", "import sys; print('out'); print('err', file=sys.stderr)"], tmp_path / "ok.txt"),
+        pack._Tool("missing", ["gados-no-such-tool"], tmp_path / "missing.txt"),
+    ]
+    results = pack._run_tools(tools)
+
+    assert (results["barrier_a"].exit_code, results["barrier_b"].exit_code) == (0, 0)
+    assert results["ok"].exit_code == 0
+    assert (tmp_path / "ok.txt").read_text(encoding="utf-8") == "out\n\nerr\n"
+    assert (results["slow"].exit_code, results["slow"].timed_out) == (124, True)
+    assert results["slow"].duration_s < 10
+    assert "TIMEOUT" in (tmp_path / "slow.txt").read_text(encoding="utf-8")
+    assert results["missing"].exit_code == 127
+
+    entry = pack._check_entry(results["slow"])
+    assert entry["timed_out"] is True and entry["duration_s"] >= 0.5
+    assert "timed_out" not in pack._check_entry(results["ok"])
+
+
+def test_scanners_reuse_cached_results(pack, tmp_path: Path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    runs = tmp_path / "runs.log"
+    scan = (
+        "import json, pathlib; "
+        f"open({str(runs)!r}, 'a').write('run\\n'); "
+        f"print(json.dumps({{'text': pathlib.Path({str(src / 'mod.py')!r}).read_text()}}))"
+    )
+    cache = pack.ScannerCache(tmp_path / "cache")
+
+    def run_scanner(out_name: str) -> tuple[pack._ToolResult, str]:
+        tool = pack._Tool("scan", [sys.executable, "-c", scan], tmp_path / out_name, inputs=pack.ScanInputs(("src",)))
+        result = pack._run_tools([tool], cache=cache, repo_root=tmp_path)["scan"]
+        return result, tool.out_file.read_text(encoding="utf-8")
+
+    first, first_out = run_scanner("a.json")
+    second, second_out = run_scanner("b.json")
+    assert (first.cache, second.cache) == ("miss", "hit")
+    assert second_out == first_out
+    assert runs.read_text(encoding="utf-8").count("run") == 1
+    assert pack._check_entry(second)["cache"] == "hit"
+
+    (src / "mod.py").write_text("x = 2\n", encoding="utf-8")
+    third, third_out = run_scanner("c.json")
+    assert third.cache == "miss" and "x = 2" in third_out
+    assert runs.read_text(encoding="utf-8").count("run") == 2
+    assert "cache" not in pack._check_entry(pack._ToolResult(0, 0.1))
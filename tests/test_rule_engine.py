@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from gados_common.rule_engine import Rule, RuleEngine, _required_literal, load_rules
+
+_RULES = Path(__file__).resolve().parents[1] / "gados-project" / "playbooks" / "iva_rules.yaml"
+
+
+def test_shipped_rules_flag_client_trusted_totals(tmp_path: Path):
+    rules = load_rules(_RULES)
+    assert [r.id for r in rules] == ["CHECKOUT-TOTAL-TRUST-001"]
+    (tmp_path / "checkout.py").write_text(
+        "def pay(request):\n    amount = request.json['total']\n    return amount\n", encoding="utf-8"
+    )
+    (tmp_path / "safe.py").write_text("total = compute_total(cart)\n", encoding="utf-8")
+
+    hits = RuleEngine(rules).scan(tmp_path, ["checkout.py", "safe.py", "missing.py"], workers=2)
+    assert [(h.rule.id, h.path, h.lines) for h in hits] == [("CHECKOUT-TOTAL-TRUST-001", "checkout.py", (2,))]
+
+
+def test_overlapping_matches_of_different_rules_are_all_reported():
+    engine = RuleEngine(
+        [
+            Rule("A", "order total from request", "High", (r"order_total\s*=\s*request\.json",)),
+            Rule("B", "any total from request", "High", (r"total\s*=\s*request",)),
+            Rule("C", "debug logging", "Low", (r"^[ \t]*print\(",), paths=("*.py",), ignore_case=True),
+        ]
+    )
+    buf = b"x = 1\norder_total = request.json\n\n  PRINT(order_total)\ntotal = request.args\n"
+    hits = {h.rule.id: h.lines for h in engine.scan_buffer(buf, "app/checkout.py")}
+    assert hits == {"A": (2,), "B": (2, 5), "C": (4,)}
+    assert {h.rule.id for h in engine.scan_buffer(buf, "README.md")} == {"A", "B"}
+
+
+def test_invalid_pattern_names_the_rule(tmp_path: Path):
+    policy = tmp_path / "rules.yaml"
+    policy.write_text("rules:\n  - id: BAD-001\n    patterns: ['(unclosed']\n", encoding="utf-8")
+    with pytest.raises(re.error, match="BAD-001"):
+        load_rules(policy)
+    assert load_rules(tmp_path / "absent.yaml") == []
+
+
+def test_literal_prefilter_never_hides_matches():
+    assert _required_literal(r'request\.json\[\s*["\']total') == b"request.json["
+    assert _required_literal(r"(?:total|amount)\s*=") is None
+    assert _required_literal(r"ab\d") is None
+    # The literal gate is only a filter: the match may start well before the literal.
+    engine = RuleEngine([Rule("X", "x", "Low", (r"\w+_total\s*=\s*request\.json",))])
+    assert [h.lines for h in engine.scan_buffer(b"\n\ncart_total = request.json\n", "a.py")] == [(3,)]
+    assert engine.scan_buffer(b"cart_total = request.args\n", "a.py") == []
+
+
+def test_inline_ignorecase_disables_the_literal_gate():
+    assert _required_literal(r"(?i)request\.json") is None
+    assert _required_literal(r"(?i:request)\.json\[") == b".json["
+    engine = RuleEngine([Rule("X", "x", "Low", (r"(?i)order_total\s*=\s*request\.json",))])
+    assert [h.lines for h in engine.scan_buffer(b"ORDER_TOTAL = Request.JSON\n", "a.py")] == [(1,)]
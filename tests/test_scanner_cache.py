@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from gados_common.scanner_cache import ScanInputs, ScannerCache, default_scanner_cache
+
+
+def _tree(root: Path) -> None:
+    for rel, text in {
+        "app/main.py": "print('hi')\n",
+        "app/README.md": "docs\n",
+        "app/.venv/lib/site.py": "vendored\n",
+        "requirements.txt": "fastapi\n",
+    }.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(text, encoding="utf-8")
+
+
+def test_scan_inputs_follow_suffixes_and_excludes(tmp_path: Path):
+    _tree(tmp_path)
+    assert ScanInputs(("app", "missing"), suffixes=(".py",)).files(tmp_path) == ["app/.venv/lib/site.py", "app/main.py"]
+    assert ScanInputs((".",), exclude_re=r"(^|/)\.venv(/|$)").files(tmp_path) == [
+        "app/README.md",
+        "app/main.py",
+        "requirements.txt",
+    ]
+    assert list(ScanInputs(("requirements.txt",)).digests(tmp_path)) == ["requirements.txt"]
+
+
+def test_cache_key_tracks_inputs_and_version(tmp_path: Path):
+    _tree(tmp_path)
+    inputs = ScanInputs(("app",), suffixes=(".py",))
+    cmd = ["python", "-m", "bandit", "-r", "app"]
+    key = ScannerCache.key(cmd, version="1.7", inputs=inputs.digests(tmp_path))
+    assert key == ScannerCache.key(cmd, version="1.7", inputs=inputs.digests(tmp_path))
+    assert key != ScannerCache.key(cmd, version="1.8", inputs=inputs.digests(tmp_path))
+
+    (tmp_path / "app" / "README.md").write_text("not an input\n", encoding="utf-8")
+    assert key == ScannerCache.key(cmd, version="1.7", inputs=inputs.digests(tmp_path))
+    (tmp_path / "app" / "main.py").write_text("print('changed')\n", encoding="utf-8")
+    assert key != ScannerCache.key(cmd, version="1.7", inputs=inputs.digests(tmp_path))
+
+
+def test_get_put_roundtrip_and_expiry(tmp_path: Path):
+    cache = ScannerCache(tmp_path / "cache")
+    report = tmp_path / "report.json"
+    report.write_text('{"results": []}\n', encoding="utf-8")
+    dest = tmp_path / "restored.json"
+
+    assert cache.get("ab" * 32, dest) is None
+    assert cache.put("ab" * 32, report, 1)
+    assert cache.get("ab" * 32, dest) == 1
+    assert json.loads(dest.read_text(encoding="utf-8")) == {"results": []}
+
+    meta = tmp_path / "cache" / "ab" / ("ab" * 32 + ".json")
+    stale = time.time() - 7200
+    meta.write_text(json.dumps({"exit_code": 1, "created_at": stale}), encoding="utf-8")
+    assert cache.get("ab" * 32, dest, max_age_s=3600) is None
+    assert cache.get("ab" * 32, dest, max_age_s=None) == 1
+
+
+def test_plain_text_errors_are_not_cached(tmp_path: Path):
+    cache = ScannerCache(tmp_path / "cache")
+    report = tmp_path / "report.json"
+    report.write_text("\nERROR: could not reach advisory service\n", encoding="utf-8")
+    assert not cache.put("cd" * 32, report, 1)
+    assert cache.get("cd" * 32, tmp_path / "out.json") is None
+
+
+def test_default_cache_location(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("GADOS_SCANNER_CACHE_DIR", raising=False)
+    monkeypatch.setenv("GADOS_RUNTIME_DIR", str(tmp_path / "rt"))
+    assert default_scanner_cache(tmp_path).root == tmp_path / "rt" / "scanner-cache"
+    monkeypatch.setenv("GADOS_SCANNER_CACHE_DIR", os.fspath(tmp_path / "sc"))
+    assert default_scanner_cache(tmp_path).root == tmp_path / "sc"
+    monkeypatch.setenv("GADOS_SCANNER_CACHE", "0")
+    assert default_scanner_cache(tmp_path) is None
+
+
+def test_json_slices(tmp_path: Path):
+    cache = ScannerCache(tmp_path / "cache")
+    assert cache.get_json("ef" * 32) is None
+    cache.put_json("ef" * 32, {"results": [{"line_number": 3}]})
+    assert cache.get_json("ef" * 32) == {"results": [{"line_number": 3}]}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import multiprocessing
+from pathlib import Path
+
+from gados_common.sequence import next_in_sequence
+
+
+def _allocate_many(counter: str, n: int, out) -> None:
+    out.put([next_in_sequence(counter, scope="run") for _ in range(n)])
+
+
+def test_unique_and_monotonic_across_processes(tmp_path: Path):
+    counter = str(tmp_path / ".seq")
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=_allocate_many, args=(counter, 50, out)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    results = [out.get(timeout=60) for _ in procs]
+    for p in procs:
+        p.join()
+
+    for ids in results:
+        assert ids == sorted(ids)
+    assert sorted(i for ids in results for i in ids) == list(range(1, 201))
+
+
+def test_new_scope_seed_and_taken(tmp_path: Path):
+    counter = tmp_path / "runs" / ".seq"
+    assert [next_in_sequence(counter, scope="a") for _ in range(2)] == [1, 2]
+    assert next_in_sequence(counter, scope="b") == 1
+
+    # Numbers claimed outside the counter (e.g. runs created before it existed) are skipped.
+    existing = {1, 2, 4}
+    assert next_in_sequence(counter, scope="c", taken=existing.__contains__) == 3
+    assert next_in_sequence(counter, scope="c", taken=existing.__contains__) == 5
+
+    # A missing counter is bootstrapped from `seed` (the last number in use).
+    fresh = tmp_path / "fresh.seq"
+    assert next_in_sequence(fresh, seed=lambda: 41) == 42
+    assert next_in_sequence(fresh, seed=lambda: 0) == 43
+
+
+def test_interleaved_scopes_keep_their_own_counts(tmp_path: Path):
+    counter = tmp_path / ".seq"
+    got = [(scope, next_in_sequence(counter, scope=scope)) for scope in ["k1", "k2", "k1", "k2", "k1"]]
+    assert got == [("k1", 1), ("k2", 1), ("k1", 2), ("k2", 2), ("k1", 3)]
+
+
+def test_claim_runs_under_the_lock_and_skips_existing(tmp_path: Path):
+    root = tmp_path / "runs"
+    root.mkdir()
+    (root / "RUN-001").mkdir()  # created by a writer that bypassed the counter
+
+    def claim(i: int) -> bool:
+        try:
+            (root / f"RUN-{i:03d}").mkdir()
+        except FileExistsError:
+            return False
+        return True
+
+    assert [next_in_sequence(root / ".seq", scope="k", claim=claim) for _ in range(2)] == [2, 3]
+    assert sorted(p.name for p in root.iterdir() if p.is_dir()) == ["RUN-001", "RUN-002", "RUN-003"]
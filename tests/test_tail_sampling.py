@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+from gados_common.observability import mark_breached_correlation
+from gados_common.tail_sampling import TailSamplingSpanProcessor
+
+
+@pytest.fixture(autouse=True)
+def _sdk_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    # test_app disables the SDK process-wide; a disabled TracerProvider hands out no-op spans.
+    monkeypatch.delenv("OTEL_SDK_DISABLED", raising=False)
+
+
+def _setup(**kwargs) -> tuple[TracerProvider, InMemorySpanExporter, TailSamplingSpanProcessor]:
+    exporter = InMemorySpanExporter()
+    proc = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), **kwargs)
+    provider = TracerProvider()
+    provider.add_span_processor(proc)
+    return provider, exporter, proc
+
+
+def test_keeps_error_slow_and_breached_traces_drops_rest():
+    provider, exporter, proc = _setup(latency_threshold_ms=20, sample_ratio=0.0)
+    tracer = provider.get_tracer("test")
+
+    with tracer.start_as_current_span("fast-ok"):
+        with tracer.start_as_current_span("child"):
+            pass
+    with tracer.start_as_current_span("failed"):
+        with tracer.start_as_current_span("child") as child:
+            child.set_status(Status(StatusCode.ERROR))
+    with tracer.start_as_current_span("slow"):
+        time.sleep(0.03)
+    with tracer.start_as_current_span("breach") as span:
+        span.set_attribute("gados.correlation_id", "corr-breached")
+        mark_breached_correlation("corr-breached")
+
+    roots = [s.name for s in exporter.get_finished_spans() if s.parent is None]
+    assert roots == ["failed", "slow", "breach"]
+    assert len(exporter.get_finished_spans()) == 4  # failed trace is exported whole
+    assert proc.stats() == {"buffered_traces": 0, "buffered_spans": 0}
+
+
+def test_memory_caps_bound_buffers():
+    provider, exporter, proc = _setup(sample_ratio=1.0, max_traces=2, max_spans_per_trace=3)
+    tracer = provider.get_tracer("test")
+
+    # Root stays open: children accumulate in the buffer up to the per-trace cap.
+    with tracer.start_as_current_span("root"):
+        for _ in range(10):
+            with tracer.start_as_current_span("child"):
+                pass
+        assert proc.stats()["buffered_spans"] == 3
+    assert len(exporter.get_finished_spans()) == 3
+
+    # Orphaned traces beyond max_traces are evicted oldest-first.
+    spans = [tracer.start_span(f"root-{i}") for i in range(4)]
+    for s in spans:
+        with tracer.start_as_current_span("child", context=trace.set_span_in_context(s)):
+            pass
+    assert proc.stats()["buffered_traces"] == 2